@@ -5,7 +5,10 @@
 #******************************************************************************
 import os
 import sys
-from dotenv import load_dotenv, find_dotenv, set_key
+import functools
+import threading
+from typing import Any, Callable, Dict, List, Optional
+from dotenv import load_dotenv, find_dotenv, set_key, dotenv_values
 
 API = ""
 HOST = ""
@@ -34,7 +37,53 @@ tigerGraph_Keys:dict = {
     'secret':"TG_SECRET",
     'token':"TG_TOKEN",
     'outputPath':"TG_OUTPUT_DIR",
+    'tokenExpiration':"TG_TOKEN_EXPIRATION",
 }
+#
+# Define .env keys (and defaults) for TigerGraph MCP tuning parameters
+#
+tigerGraph_Tuning_Keys:dict = {
+    'backupWorkers':("TG_BACKUP_WORKERS", 4),
+    'backupPageSize':("TG_BACKUP_PAGE_SIZE", 10000),
+    'backupShardRows':("TG_BACKUP_SHARD_ROWS", 100000),
+    'restoreWorkers':("TG_RESTORE_WORKERS", 4),
+    'restoreBatchSize':("TG_RESTORE_BATCH_SIZE", 1000),
+    'vectorBatchSize':("TG_VECTOR_BATCH_SIZE", 500),
+    'vectorWorkers':("TG_VECTOR_WORKERS", 2),
+    'queryWorkers':("TG_QUERY_WORKERS", 8),
+    'metadataTTL':("TG_METADATA_TTL", 300),
+    'metadataCheckInterval':("TG_METADATA_CHECK_INTERVAL", 60),
+    'latencyWindow':("TG_LATENCY_WINDOW", 500),
+    'latencyMinSamples':("TG_LATENCY_MIN_SAMPLES", 20),
+    'timeoutFactor':("TG_TIMEOUT_FACTOR", 3.0),
+    'timeoutMin':("TG_TIMEOUT_MIN", 5),
+    'timeoutMax':("TG_TIMEOUT_MAX", 1800),
+    'metricsPort':("TG_METRICS_PORT", 0),
+    'traceSampleRate':("TG_TRACE_SAMPLE_RATE", 0.0),
+    'traceFile':("TG_TRACE_FILE", ""),
+    'profileTools':("TG_PROFILE_TOOLS", ""),
+    'profileTop':("TG_PROFILE_TOP", 25),
+    'lazyConnect':("TG_LAZY_CONNECT", False),
+    'startupCacheTTL':("TG_STARTUP_CACHE_TTL", 3600),
+    'settingsReloadInterval':("TG_SETTINGS_RELOAD_INTERVAL", 5),
+    'tokenLifetime':("TG_TOKEN_LIFETIME", 2592000),
+    'tokenRefreshBefore':("TG_TOKEN_REFRESH_BEFORE", 86400),
+    'retryAttempts':("TG_RETRY_ATTEMPTS", 3),
+    'retryBaseDelay':("TG_RETRY_BASE_DELAY", 0.5),
+    'retryMaxDelay':("TG_RETRY_MAX_DELAY", 8.0),
+    'breakerFailures':("TG_BREAKER_FAILURES", 5),
+    'breakerResetSeconds':("TG_BREAKER_RESET_SECONDS", 30),
+    'hosts':("TG_HOSTS", ""),
+    'hostCheckInterval':("TG_HOST_CHECK_INTERVAL", 10),
+    'graphIdleSeconds':("TG_GRAPH_IDLE_SECONDS", 900),
+    'maxGraphs':("TG_MAX_GRAPHS", 8),
+    'metricsSampleInterval':("TG_METRICS_SAMPLE_INTERVAL", 60),
+    'metricsHistory':("TG_METRICS_HISTORY", 1440),
+    'diskFullAlertHours':("TG_DISK_FULL_ALERT_HOURS", 72),
+    'diskGrowthAlertPercent':("TG_DISK_GROWTH_ALERT_PERCENT", 10),
+    'roleCheckSeconds':("TG_ROLE_CHECK_SECONDS", 60),
+}
+
 anthropic_Keys:dict = {
     'api_key':'ANTHROPIC_API_KEY',
     'llm':'ANTHROPIC_LLM_MODEL',
@@ -61,44 +110,199 @@ MASTER_KEYS:dict = {
     GOOGLE:gemini_Keys
 }
 
-def tigerGraphConstants(output=False):
+@functools.lru_cache(maxsize=None)
+def dotenvPath() -> str:
+    """Location of the .env file, found once (find_dotenv walks up the directory tree)"""
+    return find_dotenv()
+
+_environmentLoaded = False
+
+def loadEnvironment(reload:bool=False):
+    """Load the .env file into the process environment once per process (or again when reload is set)"""
+    global _environmentLoaded
+    if reload or not _environmentLoaded:
+        load_dotenv(dotenvPath())
+        _environmentLoaded = True
+
+#
+# Defaults of the TigerGraph connection settings (keys of tigerGraph_Keys)
+#
+tigerGraph_Defaults:dict = {
+    'host':"http://localhost",
+    'graph':"My_Graph",
+    'user':"itMeAgain",
+    'password':"tryToGuess",
+    'secret':'',
+    'token':'',
+    'outputPath':'',
+    'tokenExpiration':'',
+}
+
+def convertSetting(envKey:str, value:Optional[str], default):
+    """Convert a raw .env value to the type of its default (empty / missing values give the default)"""
+    if value is None or value == '':
+        return default
     try:
-        #
-        # Load configuration attributes from .env file
-        #
-        load_dotenv(find_dotenv())
-        if (TG_SYSTEM in MASTER_KEYS.keys()):
-            system_keys = MASTER_KEYS[TG_SYSTEM]
-        else:
-            print(f"Error in initializeConstants: system parameter {TG_SYSTEM} not found", file=sys.stderr)
-            raise LookupError("Error in initializeConstants: system parameter {system} not found")
-        
+        if isinstance(default, bool):
+            return value.strip().lower() in ("1", "true", "yes", "on")
+        return type(default)(value)
+    except ValueError:
+        print(f"Error in settings: invalid value {value} for {envKey}, using {default}", file=sys.stderr)
+        return default
+
+class Settings():
+    """
+    TigerGraph MCP settings, loaded once: the connection settings (tigerGraph_Keys) and the tuning
+    parameters (tigerGraph_Tuning_Keys), typed after their defaults and read as attributes, e.g.
+    settings.queryWorkers. Variables set in the process environment take precedence over the .env file.
+    reload() re-reads the .env file and passes the changed settings, {name: (old, new)}, to the
+    callbacks registered with onChange(); startWatcher() reloads whenever the .env file is modified.
+    """
+    def __init__(self, envFile:Optional[str]=None):
+        self._lock = threading.RLock()
+        self._environment = dict(os.environ)
+        self.envFile = envFile
+        self._values:Dict[str, Any] = {}
+        self._fileValues:Dict[str, Optional[str]] = {}
+        self._callbacks:List[Callable[[dict], None]] = []
+        self._modified:Optional[float] = None
+        self._watcher:Optional[threading.Thread] = None
+        self._stopWatcher = threading.Event()
+        self._loaded = False
+
+    def _path(self) -> str:
+        return self.envFile if self.envFile is not None else dotenvPath()
 
-        HOST = os.getenv(system_keys['host'],"http://localhost")
-        GRAPH = os.getenv(system_keys['graph'],"My_Graph")
-        USER = os.getenv(system_keys['user'],"itMeAgain")
-        PASSWORD = os.getenv(system_keys['password'],"tryToGuess")
-        SECRET = os.getenv(system_keys['secret'],'')
-        TOKEN = os.getenv(system_keys['token'],'')
-        OUTPUT_PATH = os.getenv(system_keys['outputPath'],'')
+    def _modifiedTime(self) -> Optional[float]:
+        try:
+            return os.stat(self._path()).st_mtime
+        except (OSError, TypeError):
+            return None
+
+    def _read(self) -> Dict[str, Any]:
+        path = self._path()
+        self._modified = self._modifiedTime()
+        self._fileValues = dict(dotenv_values(path)) if path and os.path.exists(path) else {}
+        values = {}
+        for name, envKey in tigerGraph_Keys.items():
+            values[name] = convertSetting(envKey, self.env(envKey), tigerGraph_Defaults[name])
+        for name, (envKey, default) in tigerGraph_Tuning_Keys.items():
+            values[name] = convertSetting(envKey, self.env(envKey), default)
+        return values
+
+    def load(self):
+        with self._lock:
+            if not self._loaded:
+                self._values = self._read()
+                self._loaded = True
+
+    def env(self, envKey:str, default:Optional[str]=None) -> Optional[str]:
+        """Raw value of an environment / .env variable"""
+        value = self._environment.get(envKey)
+        if value is None or value == '':
+            value = self._fileValues.get(envKey)
+        return default if value is None else value
+
+    def get(self, name:str):
+        if not self._loaded:
+            self.load()
+        try:
+            return self._values[name]
+        except KeyError:
+            raise LookupError(f"Error in settings: parameter {name} not found")
+
+    def __getattr__(self, name:str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self.get(name)
+        except LookupError as error:
+            raise AttributeError(str(error))
+
+    def asDict(self, hideSecrets:bool=True) -> dict:
+        if not self._loaded:
+            self.load()
+        with self._lock:
+            values = dict(self._values)
+        if hideSecrets:
+            for name in ('password', 'secret', 'token'):
+                values[name] = "****" if values.get(name) else ""
+        return values
+
+    def onChange(self, callback:Callable[[dict], None]):
+        """Call callback({name: (old, new)}) after a reload that changed settings"""
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def reload(self) -> dict:
+        """Re-read the .env file; returns the changed settings and notifies the onChange() callbacks"""
+        with self._lock:
+            previous = self._values
+            self._values = self._read()
+            self._loaded = True
+            changes = {name: (previous.get(name), value) for name, value in self._values.items()
+                       if previous.get(name) != value}
+            callbacks = list(self._callbacks)
+        if changes:
+            for callback in callbacks:
+                try:
+                    callback(changes)
+                except Exception as error:
+                    print(f"Error applying settings change {sorted(changes)}: {error}", file=sys.stderr)
+        return changes
+
+    def startWatcher(self, interval:float=-1):
+        """Reload when the .env file is modified, checked every interval seconds (0 = disabled)"""
+        interval = interval if interval >= 0 else self.get('settingsReloadInterval')
+        if interval <= 0 or self._watcher is not None:
+            return
+        self.load()
+
+        def watch(stopped:threading.Event):
+            while not stopped.wait(interval):
+                if self._modifiedTime() != self._modified:
+                    self.reload()
+
+        self._stopWatcher = threading.Event()
+        self._watcher = threading.Thread(target=watch, args=(self._stopWatcher,), name="settings-watcher", daemon=True)
+        self._watcher.start()
+
+    def stopWatcher(self):
+        self._stopWatcher.set()
+        self._watcher = None
+
+#
+# Settings shared by the MCP server, loaded on first use
+#
+settings = Settings()
+
+def tigerGraphConstants(output=False):
+    try:
         if output:
-            return OUTPUT_PATH
+            return settings.outputPath
         else:
-            return (HOST, GRAPH, USER, PASSWORD, SECRET, TOKEN)
+            return (settings.host, settings.graph, settings.user, settings.password, settings.secret, settings.token)
         
     except Exception as error:
         print(f"Error in initializeConstants {error}", file=sys.stderr)
         raise LookupError(f"Error in tigerGraphConstants {error}")
     
+def tigerGraphTuning(key:str):
+    """
+    Return a TigerGraph MCP tuning parameter, converted to the type of its default
+    value (see tigerGraph_Tuning_Keys and Settings)
+    """
+    if key not in tigerGraph_Tuning_Keys.keys():
+        raise LookupError(f"Error in tigerGraphTuning: tuning parameter {key} not found")
+    return settings.get(key)
+
 def getMCPServerConfig():
-        load_dotenv(find_dotenv())
-        MCP_PATH = os.getenv('MCP_SERVER_PATH','')
+        MCP_PATH = settings.env('MCP_SERVER_PATH','')
         return MCP_PATH
         
 
 def getDefaultSystem():
-        load_dotenv(find_dotenv())
-        LLM_MODEL_FAMILY = os.getenv('LLM_MODEL_FAMILY', ANTHROPIC)
+        LLM_MODEL_FAMILY = settings.env('LLM_MODEL_FAMILY', ANTHROPIC)
         #print(f"Initilizing LLM to {LLM_MODEL_FAMILY}")
         return LLM_MODEL_FAMILY
 
@@ -107,7 +311,7 @@ def initialLLMConstants():
         #
         # Load configuration attributes from .env file
         #
-        load_dotenv(find_dotenv())
+        loadEnvironment()
         LLM_MODEL_FAMILY = getDefaultSystem()
          
         return (LLM_MODEL_FAMILY)
@@ -121,7 +325,7 @@ def getALLFamilyLLMConstants():
         #
         # Load configuration attributes from .env file
         #
-        load_dotenv(find_dotenv())
+        loadEnvironment()
     
         if (LLM_MODEL_FAMILY in MASTER_KEYS.keys()):
             system_keys = MASTER_KEYS[LLM_MODEL_FAMILY]
@@ -159,5 +363,5 @@ def set_Constents(key:str, value, system):
     # Check key is in system list
     #
     if (key in system_keys.keys()):
-        set_key(find_dotenv(),system_keys[key], value, export=False)
+        set_key(dotenvPath(),system_keys[key], value, export=False)
 
@@ -0,0 +1,280 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+# mcp_metrics.py: Sets up the global metrics registry (latency histograms,
+# payload sizes, counters) for MCP tools and TigerGraph backend calls, with
+# Prometheus text-format exposition
+#******************************************************************************
+import time
+import asyncio
+import inspect
+import functools
+import itertools
+import threading
+
+from typing import Dict, List, Tuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from mcp_server.mcp_logger import logger
+
+SUB_BUCKETS = 16
+MAX_EXPONENT = 48
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram():
+    """
+    HDR-style log-linear histogram of non negative integer values: every power of two is split
+    in SUB_BUCKETS linear buckets, so recorded values keep ~6% relative precision at any scale.
+    """
+    def __init__(self):
+        self.counts:List[int] = [0] * (SUB_BUCKETS * (MAX_EXPONENT - 2))
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    @staticmethod
+    def bucketIndex(value:int) -> int:
+        if value < SUB_BUCKETS:
+            return value
+        exponent = value.bit_length() - 1
+        shift = exponent - 4
+        return SUB_BUCKETS + shift * SUB_BUCKETS + ((value >> shift) - SUB_BUCKETS)
+
+    @staticmethod
+    def bucketValue(index:int) -> int:
+        """Highest value that falls into bucket index"""
+        if index < SUB_BUCKETS:
+            return index
+        shift = (index - SUB_BUCKETS) // SUB_BUCKETS
+        sub = (index - SUB_BUCKETS) % SUB_BUCKETS + SUB_BUCKETS
+        return ((sub + 1) << shift) - 1
+
+    def record(self, value:int):
+        value = max(int(value), 0)
+        index = min(self.bucketIndex(value), len(self.counts) - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, quantile:float) -> int:
+        if self.count == 0:
+            return 0
+        rank = max(1, int(quantile * self.count + 0.5))
+        seen = 0
+        for index, bucketCount in enumerate(self.counts):
+            seen += bucketCount
+            if seen >= rank:
+                return min(self.bucketValue(index), self.max)
+        return self.max
+
+
+class MetricsRegistry():
+    """
+    Thread safe registry of counters and histograms keyed by metric name and labels.
+    Latencies are recorded in microseconds and exported in seconds.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters:Dict[str, Dict[Labels, float]] = {}
+        self._histograms:Dict[str, Dict[Labels, Histogram]] = {}
+        self._help:Dict[str, str] = {}
+        self._scale:Dict[str, float] = {}
+
+    @staticmethod
+    def labelKey(labels:dict) -> Labels:
+        return tuple(sorted((str(key), str(value)) for key, value in (labels or {}).items()))
+
+    def inc(self, name:str, labels:dict=None, amount:float=1, help:str=""):
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            key = self.labelKey(labels)
+            series[key] = series.get(key, 0) + amount
+            if help:
+                self._help.setdefault(name, help)
+
+    def observe(self, name:str, value:int, labels:dict=None, help:str="", scale:float=1.0):
+        """Record value (an integer, exported as value * scale) in the histogram name{labels}"""
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            key = self.labelKey(labels)
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.record(value)
+            self._scale.setdefault(name, scale)
+            if help:
+                self._help.setdefault(name, help)
+
+    def observeSeconds(self, name:str, seconds:float, labels:dict=None, help:str=""):
+        self.observe(name, int(seconds * 1_000_000), labels, help, scale=1e-6)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> dict:
+        """Counters and histogram summaries as a JSON friendly dictionary"""
+        with self._lock:
+            counters = {name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                        for name, series in sorted(self._counters.items())}
+            histograms = {}
+            for name, series in sorted(self._histograms.items()):
+                scale = self._scale.get(name, 1.0)
+                histograms[name] = [{"labels": dict(key), "count": h.count, "sum": round(h.total * scale, 6),
+                                     "min": round((h.min or 0) * scale, 6), "max": round(h.max * scale, 6),
+                                     **{f"p{str(q * 100).rstrip('0').rstrip('.')}": round(h.percentile(q) * scale, 6)
+                                        for q in QUANTILES}}
+                                    for key, h in series.items()]
+        return {"counters": counters, "histograms": histograms}
+
+    def prometheusText(self) -> str:
+        """Prometheus text exposition format (histograms are exported as summaries)"""
+        lines:List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_formatLabels(key)} {_formatValue(value)}")
+            for name, series in sorted(self._histograms.items()):
+                scale = self._scale.get(name, 1.0)
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} summary")
+                for key, histogram in sorted(series.items(), key=lambda item: item[0]):
+                    for quantile in QUANTILES:
+                        labels = _formatLabels(key + (("quantile", str(quantile)),))
+                        lines.append(f"{name}{labels} {_formatValue(histogram.percentile(quantile) * scale)}")
+                    lines.append(f"{name}_sum{_formatLabels(key)} {_formatValue(histogram.total * scale)}")
+                    lines.append(f"{name}_count{_formatLabels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _formatLabels(key:Labels) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in key) + "}"
+
+
+def _escape(value:str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _formatValue(value:float) -> str:
+    return format(float(value), '.9g') if not float(value).is_integer() else str(int(value))
+
+
+def payloadSize(value) -> int:
+    """
+    Size in bytes of a tool / backend result: exact for text, and the approximate JSON size of
+    structured results, where large lists and dictionaries are estimated from an evenly spaced
+    sample so the cost does not grow with the result.
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value)
+    return _jsonSize(value)
+
+
+def _jsonSize(value, sample:int=32) -> int:
+    if value is None or isinstance(value, bool):
+        return 4
+    if isinstance(value, str):
+        return len(value) + 2
+    if isinstance(value, (int, float)):
+        return len(str(value))
+    if isinstance(value, (list, tuple, set)):
+        items = value if isinstance(value, (list, tuple)) else list(value)
+        if len(items) <= sample:
+            return 2 + sum(_jsonSize(item, sample) + 1 for item in items)
+        step = len(items) / sample
+        sampled = sum(_jsonSize(items[int(i * step)], sample) + 1 for i in range(sample))
+        return 2 + int(sampled * len(items) / sample)
+    if isinstance(value, dict):
+        entries = list(itertools.islice(value.items(), sample))
+        sampled = sum(len(str(key)) + 4 + _jsonSize(item, sample) for key, item in entries)
+        return 2 + int(sampled * len(value) / max(len(entries), 1))
+    return len(str(value))
+
+
+#
+# Global metrics registry shared by the MCP server, its tools and the TigerGraph connection
+#
+metrics = MetricsRegistry()
+
+
+def instrumentTool(func):
+    """Wrap an MCP tool (sync or async) to record its latency, response size and errors"""
+    toolName = func.__name__
+
+    def record(start:float, status:str, result=None):
+        labels = {"tool": toolName}
+        metrics.observeSeconds("mcp_tool_latency_seconds", time.perf_counter() - start, labels,
+                               help="MCP tool call latency")
+        metrics.inc("mcp_tool_calls_total", {"tool": toolName, "status": status}, help="MCP tool calls by status")
+        if status == "ok":
+            metrics.observe("mcp_tool_response_bytes", payloadSize(result), labels, help="MCP tool response size")
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def asyncWrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+            except BaseException as error:
+                record(start, "cancelled" if isinstance(error, asyncio.CancelledError) else "error")
+                raise
+            record(start, "ok", result)
+            return result
+        return asyncWrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            record(start, "error")
+            raise
+        record(start, "ok", result)
+        return result
+    return wrapper
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = metrics.prometheusText().encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def startMetricsServer(port:int, host:str="127.0.0.1"):
+    """Serve /metrics in Prometheus text format on a daemon thread (port 0 = disabled, None when the port is in use)"""
+    if port <= 0:
+        return None
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as error:
+        # the endpoint is optional, the MCP server keeps running without it
+        logger.error(f"Error starting the metrics endpoint on {host}:{port}, /metrics is disabled: {error}")
+        return None
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
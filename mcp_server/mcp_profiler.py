@@ -0,0 +1,168 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+# mcp_profiler.py: Opt-in profiling of MCP tool calls, runs a call under
+# cProfile and tracemalloc and writes the report to the output directory
+#******************************************************************************
+import io
+import os
+import sys
+import time
+import pstats
+import cProfile
+import inspect
+import itertools
+import functools
+import threading
+import tracemalloc
+import contextvars
+
+from typing import Callable, Optional
+from mcp_server.config import tigerGraphConstants, tigerGraphTuning
+from mcp_server.mcp_logger import logger
+
+_lock = threading.Lock()
+_tracers = 0
+_started = False
+_reportNumbers = itertools.count(1)
+
+# From Python 3.12 on cProfile uses sys.monitoring and records the calls of every thread; before
+# that it only sees the thread that enabled it, so worker threads are profiled and merged separately
+PROFILES_ALL_THREADS = sys.version_info >= (3, 12)
+_workerProfiles: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar("workerProfiles", default=None)
+
+
+def profilingEnabled(toolName:str, requested:bool=False) -> bool:
+    """True when the call asked for profiling or toolName is listed in TG_PROFILE_TOOLS (* = every tool)"""
+    if requested:
+        return True
+    tools = {name.strip() for name in tigerGraphTuning('profileTools').split(',') if name.strip()}
+    return "*" in tools or toolName in tools
+
+
+def _startTracemalloc():
+    global _tracers, _started
+    with _lock:
+        if _tracers == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+            _started = True
+        _tracers += 1
+
+
+def _stopTracemalloc():
+    global _tracers, _started
+    with _lock:
+        _tracers -= 1
+        # leave tracemalloc running when it was started outside the profiler (PYTHONTRACEMALLOC, ...)
+        if _tracers == 0 and _started:
+            tracemalloc.stop()
+            _started = False
+
+
+def runProfiled(toolName:str, func:Callable, *args, outputDir:Optional[str]=None, **kwargs):
+    """
+    Run func under cProfile and tracemalloc and write the top functions (by cumulative time) and
+    the top allocation sites of the call to <output dir>/profile_<tool>_<timestamp>_<n>.txt.
+    Calls made by worker threads wrapped with profiledWorker() are part of the report.
+    Returns (result, report path).
+    """
+    top = tigerGraphTuning('profileTop')
+    _startTracemalloc()
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # only one cProfile profiler can be active at a time (concurrent profiled calls)
+        profiler = None
+    workers = []
+    token = _workerProfiles.set(workers if profiler is not None else None)
+    start = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        elapsed = time.perf_counter() - start
+        _workerProfiles.reset(token)
+        if profiler is not None:
+            profiler.disable()
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        _stopTracemalloc()
+        with _lock:
+            workers = list(workers)
+        reportFile = _writeReport(toolName, outputDir, elapsed, profiler, workers, before, after, peak, top)
+    return result, reportFile
+
+
+def profiledWorker(func:Callable) -> Callable:
+    """
+    Wrap a worker function that a profiled call submits to a thread pool (in a contextvars copy of
+    its context), so the worker's calls are merged into the call's profile report. A no-op when the
+    call is not profiled or cProfile already records every thread.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        workers = _workerProfiles.get()
+        if workers is None or PROFILES_ALL_THREADS:
+            return func(*args, **kwargs)
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            with _lock:
+                workers.append(profiler)
+    return wrapper
+
+
+def _writeReport(toolName:str, outputDir:Optional[str], elapsed:float, profiler:Optional[cProfile.Profile],
+                 workers:list, before:tracemalloc.Snapshot, after:tracemalloc.Snapshot, peak:int, top:int) -> str:
+    outputDir = outputDir or tigerGraphConstants(output=True)
+    # the counter keeps reports of calls made within the same second apart
+    reportFile = os.path.join(outputDir, f"profile_{toolName}_{time.strftime('%Y%m%d-%H%M%S')}_{next(_reportNumbers)}.txt")
+    report = io.StringIO()
+    report.write(f"Profile of {toolName}: {elapsed:.3f} seconds, peak traced memory {peak / 1024 / 1024:.2f} MB\n\n")
+    report.write(f"Top {top} functions by cumulative time")
+    report.write(" (all threads)\n" if PROFILES_ALL_THREADS else f" (calling thread and {len(workers)} worker tasks)\n")
+    if profiler is not None:
+        pstats.Stats(profiler, *workers, stream=report).strip_dirs().sort_stats("cumulative").print_stats(top)
+    else:
+        report.write("  not available, another profiled call was running\n\n")
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, pstats.__file__)]
+    allocations = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+    report.write(f"Top {top} allocation sites (net new memory during the call)\n")
+    for statistic in allocations[:top]:
+        report.write(f"  {statistic}\n")
+    with open(reportFile, 'w', encoding='utf-8') as file:
+        file.write(report.getvalue())
+    logger.info(f"Profile of {toolName} written to {reportFile}")
+    return reportFile
+
+
+def profileTool(func):
+    """
+    Wrap a sync MCP tool so it is profiled when its name is in TG_PROFILE_TOOLS or it is called with
+    profile=True; the report file is appended to text results of calls that asked for it. Async tools
+    are returned unchanged, they profile the work they hand to a worker thread themselves.
+    """
+    if inspect.iscoroutinefunction(func):
+        return func
+    toolName = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        requested = bool(kwargs.get("profile", False))
+        if not profilingEnabled(toolName, requested):
+            return func(*args, **kwargs)
+        result, reportFile = runProfiled(toolName, func, *args, **kwargs)
+        return withReport(result, reportFile, requested)
+    return wrapper
+
+
+def withReport(result, reportFile:str, requested:bool):
+    """Point the caller to the profile report when it asked for one and the result is text"""
+    if requested and isinstance(result, str):
+        return f"{result}\n# Profile written to {os.path.basename(reportFile)} (listdir://{os.path.basename(reportFile)})"
+    return result
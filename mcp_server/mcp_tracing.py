@@ -0,0 +1,131 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+# mcp_tracing.py: Sets up the global tracer, which writes sampled trace spans
+# (tool calls, backend requests, serialization / export stages) as JSONL
+#******************************************************************************
+import os
+import json
+import time
+import random
+import inspect
+import secrets
+import functools
+import threading
+import contextvars
+
+from contextlib import contextmanager
+from typing import Optional
+from mcp_server.config import tigerGraphConstants, tigerGraphTuning
+
+
+class Span():
+
+    __slots__ = ("traceId", "spanId", "parentId", "name", "attributes", "start", "startNs", "sampled", "error")
+
+    def __init__(self, name:str, parent:Optional['Span'], sampled:bool, attributes:dict):
+        self.traceId = parent.traceId if parent is not None else secrets.token_hex(8)
+        self.spanId = secrets.token_hex(4)
+        self.parentId = parent.spanId if parent is not None else None
+        self.name = name
+        self.attributes = attributes
+        self.start = time.time()
+        self.startNs = time.perf_counter_ns()
+        self.sampled = sampled
+        self.error = None
+
+    def set(self, key:str, value):
+        self.attributes[key] = value
+
+    def asDict(self, durationNs:int) -> dict:
+        record = {"traceId": self.traceId, "spanId": self.spanId, "parentId": self.parentId, "name": self.name,
+                  "start": round(self.start, 6), "durationMs": round(durationNs / 1e6, 3)}
+        if self.attributes:
+            record["attributes"] = self.attributes
+        if self.error:
+            record["error"] = self.error
+        return record
+
+
+class _NoopSpan():
+    """Returned by Tracer.span() when tracing is off"""
+    sampled = False
+
+    def set(self, key:str, value):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+_currentSpan:contextvars.ContextVar = contextvars.ContextVar("mcp_trace_span", default=None)
+
+
+class Tracer():
+    """
+    The sampling decision is taken once per trace, at its root span (TG_TRACE_SAMPLE_RATE, 0 = off),
+    and inherited by every child span. Finished spans of sampled traces are appended to the trace
+    file (TG_TRACE_FILE, default <TG_OUTPUT_DIR>/traces.jsonl), one JSON object per line.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.sampleRate:Optional[float] = None
+        self.traceFile = ""
+
+    def configure(self, sampleRate:Optional[float]=None, traceFile:Optional[str]=None):
+        self.sampleRate = tigerGraphTuning('traceSampleRate') if sampleRate is None else sampleRate
+        if traceFile is None:
+            traceFile = tigerGraphTuning('traceFile') or os.path.join(tigerGraphConstants(output=True), "traces.jsonl")
+        self.traceFile = traceFile
+
+    def currentSpan(self) -> Optional[Span]:
+        return _currentSpan.get()
+
+    @contextmanager
+    def span(self, name:str, **attributes):
+        if self.sampleRate is None:
+            self.configure()
+        parent = _currentSpan.get()
+        if parent is None and self.sampleRate <= 0:
+            yield NOOP_SPAN
+            return
+        sampled = parent.sampled if parent is not None else random.random() < self.sampleRate
+        span = Span(name, parent, sampled, attributes)
+        token = _currentSpan.set(span)
+        try:
+            yield span
+        except BaseException as error:
+            span.error = f"{type(error).__name__}: {error}"
+            raise
+        finally:
+            _currentSpan.reset(token)
+            if span.sampled:
+                self._write(span.asDict(time.perf_counter_ns() - span.startNs))
+
+    def _write(self, record:dict):
+        line = json.dumps(record, default=str, separators=(',', ':')) + "\n"
+        with self._lock:
+            with open(self.traceFile, 'a', encoding='utf-8') as file:
+                file.write(line)
+
+
+#
+# Global tracer shared by the MCP server, its tools and the TigerGraph connection
+#
+tracer = Tracer()
+
+
+def traceTool(func):
+    """Wrap an MCP tool (sync or async) in a root 'tool.<name>' span"""
+    spanName = f"tool.{func.__name__}"
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def asyncWrapper(*args, **kwargs):
+            with tracer.span(spanName, arguments=sorted(kwargs.keys())):
+                return await func(*args, **kwargs)
+        return asyncWrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with tracer.span(spanName, arguments=sorted(kwargs.keys())):
+            return func(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,505 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+#
+# backup_services.py: This modelue defines the BackupServices class for
+# exporting TigerGraph graph data into compressed NDJSON shards and restoring
+# a graph from them
+#******************************************************************************
+import os
+import re
+import gzip
+import json
+import time
+import datetime
+import threading
+
+from pathlib import Path
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from mcp_server.config import tigerGraphTuning
+from mcp_server.tigerGraph.session import TigerGraph_Session
+from mcp_server.mcp_logger import setErrorHandler, logger
+
+BACKUP_DIR = "backups"
+MANIFEST_FILE = "manifest.json"
+PROGRESS_FILE = "progress.json"
+RESTORE_FILE = "restore_state.json"
+SHARD_SUFFIX = ".ndjson.gz"
+NUMERIC_TYPES = ("INT", "UINT", "FLOAT", "DOUBLE")
+#
+# Text of a GSQL output reporting a failed statement (matched lower case)
+#
+GSQL_FAILURES = ("fail", "error", "exception", "does not exist", "is not a valid", "already exists", "invalid",
+                 "conflict", "not allowed")
+
+
+class SchemaChangeError(Exception):
+    """The SCHEMA_CHANGE job of a restore did not succeed"""
+
+
+def schemaChangeFailure(output) -> Optional[str]:
+    """The reason a RUN SCHEMA_CHANGE JOB output reports a failure, None when the job succeeded"""
+    text = str(output or "")
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    for line in lines:
+        if any(failure in line.lower() for failure in GSQL_FAILURES):
+            return line
+    if "succeeded" not in text.lower():
+        return f"no schema change success message in the GSQL output: {text.strip()[:200]}"
+    return None
+
+
+class ShardWriter():
+    """
+    Writes NDJSON rows into numbered gzip shards of at most shardRows rows.
+    A shard is written to a .tmp file and renamed once complete, so a shard
+    file on disk is always whole.
+    """
+    def __init__(self, directory:Path, prefix:str, shardRows:int, shardIndex:int=0):
+        self.directory = directory
+        self.prefix = prefix
+        self.shardRows = shardRows
+        self.shardIndex = shardIndex
+        self.rows:List[str] = []
+        self.bytesWritten = 0
+
+    def shardName(self, index:int) -> str:
+        return f"{self.prefix}_{index:05d}{SHARD_SUFFIX}"
+
+    def add(self, row:dict) -> Optional[dict]:
+        """Add a row, returns the shard info when a shard was committed"""
+        self.rows.append(json.dumps(row, separators=(',', ':')))
+        if len(self.rows) >= self.shardRows:
+            return self.commit()
+        return None
+
+    def commit(self) -> Optional[dict]:
+        if len(self.rows) == 0:
+            return None
+        name = self.shardName(self.shardIndex)
+        staging = self.directory / f"{name}.tmp"
+        with gzip.open(staging, 'wt', encoding='utf-8') as file:
+            file.write("\n".join(self.rows) + "\n")
+        os.replace(staging, self.directory / name)
+        size = (self.directory / name).stat().st_size
+        shard = {"file": name, "rows": len(self.rows), "bytes": size}
+        self.bytesWritten += size
+        self.shardIndex += 1
+        self.rows = []
+        return shard
+
+
+def edgeKey(row:dict) -> list:
+    """Sort key of an edge row: its endpoints, then its attributes (to order parallel edges)"""
+    return [str(row.get("from_type")), str(row.get("from_id")), str(row.get("to_type")), str(row.get("to_id")),
+            json.dumps(row.get("attributes", {}), sort_keys=True, default=str)]
+
+
+def _resumeRows(rows, keyOf, cursor, committedRows:int):
+    """
+    Yield (row, key) for the rows of a type read in one request, sorted by keyOf so the order does
+    not depend on the order RESTPP returns them in. The key of the last row of a committed shard is
+    saved as the cursor, and a resumed run skips the rows up to and including it. Progress files
+    written without a cursor fall back to skipping the first committedRows rows of the sorted order.
+    """
+    ordered = sorted(((keyOf(row), row) for row in rows), key=lambda item: item[0])
+    for i, (key, row) in enumerate(ordered):
+        if (cursor is not None and key <= list(cursor)) or (cursor is None and i < committedRows):
+            continue
+        yield (row, key)
+
+
+class BackupServices():
+
+    def __init__(self, session:TigerGraph_Session, outputPath:str):
+        setErrorHandler()
+        self.session = session
+        self.backup_path = Path(outputPath) / BACKUP_DIR
+        self.lock = threading.Lock()
+
+    def getBackupDir(self, backup_name:str) -> Path:
+        if not re.match(r'^[A-Za-z0-9_\-]+$', backup_name):
+            raise ValueError(f"Invalid backup name '{backup_name}', use letters, digits, '_' or '-'")
+        return self.backup_path / backup_name
+
+    def backupGraph(self, backup_name:str, workers:int=0, page_size:int=0, shard_rows:int=0) -> str:
+        """
+        Dump every vertex and edge type of the graph into compressed NDJSON shards,
+        one type per worker, together with a manifest holding the schema.
+        Re-running the same backup_name resumes after the last committed shard.
+        """
+        try:
+            start = time.perf_counter()
+            workers = workers if workers > 0 else tigerGraphTuning('backupWorkers')
+            page_size = page_size if page_size > 0 else tigerGraphTuning('backupPageSize')
+            shard_rows = shard_rows if shard_rows > 0 else tigerGraphTuning('backupShardRows')
+
+            directory = self.getBackupDir(backup_name)
+            directory.mkdir(parents=True, exist_ok=True)
+            conn = self.session.getConnection()
+            schema = conn.getSchema(force=True)
+            progress = self.readProgress(directory)
+
+            manifest = {
+                "name": backup_name,
+                "graph": conn.graphname,
+                "created": progress.get("created", datetime.datetime.now().isoformat(timespec='seconds')),
+                "schema": schema,
+                "vertexTypes": [vt.get("Name") for vt in schema.get("VertexTypes", [])],
+                "edgeTypes": [et.get("Name") for et in schema.get("EdgeTypes", [])],
+                "complete": False,
+            }
+            self._writeJson(directory / MANIFEST_FILE, manifest)
+            progress["created"] = manifest["created"]
+            progress.setdefault("types", {})
+            self._writeJson(directory / PROGRESS_FILE, progress)
+
+            tasks = [("vertex", vt) for vt in schema.get("VertexTypes", [])] + \
+                    [("edge", et) for et in schema.get("EdgeTypes", [])]
+            report = {}
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(self._dumpType, directory, progress, kind, definition,
+                                           page_size, shard_rows): definition.get("Name")
+                           for (kind, definition) in tasks}
+                for future in as_completed(futures):
+                    typeName = futures[future]
+                    try:
+                        report[typeName] = future.result()
+                    except Exception as error:
+                        logger.error(f"Error backing up {typeName}: {error}")
+                        report[typeName] = {"error": str(error)}
+
+            failed = [name for name, result in report.items() if "error" in result]
+            manifest["complete"] = len(failed) == 0
+            manifest["shards"] = [dict(shard, type=name, kind=info.get("kind"))
+                                  for name, info in progress["types"].items() for shard in info.get("shards", [])]
+            self._writeJson(directory / MANIFEST_FILE, manifest)
+
+            elapsed = time.perf_counter() - start
+            rows = sum(result.get("rows", 0) for result in report.values())
+            size = sum(result.get("bytes", 0) for result in report.values())
+            summary = {
+                "backup": str(directory),
+                "complete": manifest["complete"],
+                "failedTypes": failed,
+                "rows": rows,
+                "megabytes": round(size / (1024 * 1024), 3),
+                "seconds": round(elapsed, 3),
+                "rowsPerSecond": round(rows / elapsed, 1) if elapsed > 0 else 0,
+                "types": report,
+            }
+            return json.dumps(summary, indent=4, separators=(',', ':'))
+
+        except Exception as error:
+            logger.error(f"Error in backupGraph(): {error}")
+            return f"Error backing up graph to {backup_name}: {error}"
+
+    def backupStatus(self, backup_name:str="") -> List[str]:
+        """Report the progress of one backup, or list all backups"""
+        status:List[str] = []
+        try:
+            names = [backup_name] if backup_name else \
+                    sorted(p.name for p in self.backup_path.iterdir() if p.is_dir()) if self.backup_path.exists() else []
+            for name in names:
+                directory = self.getBackupDir(name)
+                progress = self.readProgress(directory)
+                manifest = self._readJson(directory / MANIFEST_FILE)
+                types = progress.get("types", {})
+                done = sum(1 for info in types.values() if info.get("done"))
+                rows = sum(info.get("rows", 0) for info in types.values())
+                status.append(f"{name:<25} complete={manifest.get('complete', False)!s:<6} "
+                              f"types={done}/{len(manifest.get('vertexTypes', [])) + len(manifest.get('edgeTypes', []))} "
+                              f"rows={rows:,} created={progress.get('created', '')}")
+                if backup_name:
+                    for typeName, info in types.items():
+                        status.append(f"   {info.get('kind', ''):<6} {typeName:<25} rows={info.get('rows', 0):>12,} "
+                                      f"shards={len(info.get('shards', [])):>5} done={info.get('done', False)}")
+        except Exception as error:
+            logger.error(f"Error in backupStatus(): {error}")
+        return status
+
+    def restoreGraph(self, backup_name:str, workers:int=0, batch_size:int=0, create_schema:bool=True) -> str:
+        """
+        Restore a backup into the current graph: the schema manifest is replayed through a
+        single SCHEMA_CHANGE job, then vertex shards are loaded before edge shards with a
+        pool of workers using batched upserts. The committed line offset of every shard is
+        recorded after each batch, so a failed restore resumes where it stopped.
+        """
+        try:
+            start = time.perf_counter()
+            workers = workers if workers > 0 else tigerGraphTuning('restoreWorkers')
+            batch_size = batch_size if batch_size > 0 else tigerGraphTuning('restoreBatchSize')
+            directory = self.getBackupDir(backup_name)
+            manifest = self._readJson(directory / MANIFEST_FILE)
+            if not manifest.get("complete", False):
+                raise LookupError(f"Backup '{backup_name}' is missing or incomplete")
+            state = self._readJson(directory / RESTORE_FILE)
+            state.setdefault("shards", {})
+
+            schemaResults = "skipped"
+            if create_schema and not state.get("schemaApplied", False):
+                # raises when the job failed, so schemaApplied is only saved for a schema in place
+                schemaResults = self.applySchema(manifest.get("schema", {}), f"restore_{backup_name}")
+                state["schemaApplied"] = True
+                self._writeJson(directory / RESTORE_FILE, state)
+            schemaSeconds = time.perf_counter() - start
+
+            vertexDefinitions = {vt.get("Name"): vt for vt in manifest.get("schema", {}).get("VertexTypes", [])}
+            report = {"schema": schemaResults, "schemaSeconds": round(schemaSeconds, 3)}
+            for kind in ("vertex", "edge"):
+                phaseStart = time.perf_counter()
+                shards = [shard for shard in manifest.get("shards", []) if shard.get("kind") == kind]
+                rows = 0
+                failed = []
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = {executor.submit(self._loadShard, directory, state, shard, batch_size,
+                                               vertexDefinitions): shard.get("file") for shard in shards}
+                    for future in as_completed(futures):
+                        try:
+                            rows += future.result()
+                        except Exception as error:
+                            logger.error(f"Error restoring shard {futures[future]}: {error}")
+                            failed.append(futures[future])
+                elapsed = time.perf_counter() - phaseStart
+                report[f"{kind}Shards"] = len(shards)
+                report[f"{kind}Rows"] = rows
+                report[f"{kind}Seconds"] = round(elapsed, 3)
+                report[f"{kind}RowsPerSecond"] = round(rows / elapsed, 1) if elapsed > 0 else 0
+                if failed:
+                    # edges must not be loaded before all their vertices exist
+                    report["failedShards"] = failed
+                    report["complete"] = False
+                    report["seconds"] = round(time.perf_counter() - start, 3)
+                    return json.dumps(report, indent=4, separators=(',', ':'))
+
+            report["complete"] = True
+            report["seconds"] = round(time.perf_counter() - start, 3)
+            return json.dumps(report, indent=4, separators=(',', ':'))
+
+        except Exception as error:
+            logger.error(f"Error in restoreGraph(): {error}")
+            return f"Error restoring graph from {backup_name}: {error}"
+
+    def applySchema(self, schema:dict, jobName:str) -> str:
+        """Create all vertex / edge types of schema missing from the graph in one SCHEMA_CHANGE job"""
+        conn = self.session.getConnection()
+        current = conn.getSchema(force=True)
+        existing = {vt.get("Name") for vt in current.get("VertexTypes", [])} | \
+                   {et.get("Name") for et in current.get("EdgeTypes", [])}
+        statements = []
+        for vertexType in schema.get("VertexTypes", []):
+            if vertexType.get("Name") not in existing:
+                statements.extend(self.vertexStatements(vertexType))
+        for edgeType in schema.get("EdgeTypes", []):
+            if edgeType.get("Name") not in existing:
+                statements.append(self.edgeStatement(edgeType))
+        if len(statements) == 0:
+            return "schema already present"
+
+        job_name = f"{jobName.lower()}_schema_job"
+        gsql_parts = [
+            f"USE Graph {conn.graphname}\n",
+            f"CREATE SCHEMA_CHANGE JOB {job_name} {{\n",
+        ]
+        gsql_parts.extend(f"  {statement}\n" for statement in statements)
+        gsql_parts.append("}\n")
+        gsql_parts.append(f"RUN SCHEMA_CHANGE JOB {job_name}")
+
+        dropJob = f"DROP JOB {job_name}"
+        conn.gsql(dropJob)
+        try:
+            results = conn.gsql("".join(gsql_parts), conn.graphname)
+            logger.info(f"*** Restore Schema Results >>>: {results}")
+        finally:
+            conn.gsql(dropJob)
+        failure = schemaChangeFailure(results)
+        if failure is not None:
+            raise SchemaChangeError(f"Schema change job {job_name} failed: {failure}")
+        return f"{len(statements)} schema statements applied"
+
+    def vertexStatements(self, vertexType:dict) -> List[str]:
+        primaryId = vertexType.get("PrimaryId", {})
+        parts = [f"PRIMARY_ID {primaryId.get('AttributeName')} {self.attributeType(primaryId.get('AttributeType', {}))}"]
+        parts.extend(f"{attr.get('AttributeName')} {self.attributeType(attr.get('AttributeType', {}))}"
+                     for attr in vertexType.get("Attributes", []))
+        statement = f"ADD VERTEX {vertexType.get('Name')} ({', '.join(parts)})"
+        if vertexType.get("Config", {}).get("PRIMARY_ID_AS_ATTRIBUTE", False) or primaryId.get("PrimaryIdAsAttribute", False):
+            statement += ' WITH PRIMARY_ID_AS_ATTRIBUTE="true"'
+        statements = [statement + ";"]
+        for vector in vertexType.get("EmbeddingAttributes", []):
+            options = [f"DIMENSION={vector.get('Dimension')}"]
+            for key, option in (("Metric", "METRIC"), ("IndexType", "INDEXTYPE"), ("DataType", "DATATYPE")):
+                if vector.get(key):
+                    options.append(f'{option}="{vector.get(key)}"')
+            statements.append(f"ALTER VERTEX {vertexType.get('Name')} ADD VECTOR ATTRIBUTE "
+                              f"{vector.get('Name')}({', '.join(options)});")
+        return statements
+
+    def edgeStatement(self, edgeType:dict) -> str:
+        pairs = edgeType.get("EdgePairs", []) or [{"From": edgeType.get("FromVertexTypeName"),
+                                                    "To": edgeType.get("ToVertexTypeName")}]
+        parts = [" | ".join(f"FROM {pair.get('From')}, TO {pair.get('To')}" for pair in pairs)]
+        attributes = edgeType.get("Attributes", [])
+        discriminator = [f"{attr.get('AttributeName')} {self.attributeType(attr.get('AttributeType', {}))}"
+                         for attr in attributes if attr.get("IsDiscriminator", False)]
+        if discriminator:
+            parts.append(f"DISCRIMINATOR({', '.join(discriminator)})")
+        parts.extend(f"{attr.get('AttributeName')} {self.attributeType(attr.get('AttributeType', {}))}"
+                     for attr in attributes if not attr.get("IsDiscriminator", False))
+        directed = "DIRECTED" if edgeType.get("IsDirected", False) else "UNDIRECTED"
+        statement = f"ADD {directed} EDGE {edgeType.get('Name')} ({', '.join(parts)})"
+        reverse = edgeType.get("Config", {}).get("REVERSE_EDGE", "")
+        if edgeType.get("IsDirected", False) and reverse:
+            statement += f' WITH REVERSE_EDGE="{reverse}"'
+        return statement + ";"
+
+    def attributeType(self, attributeType:dict) -> str:
+        name = attributeType.get("Name", "STRING").upper()
+        if name in ("LIST", "SET"):
+            return f"{name}<{attributeType.get('ValueTypeName', 'STRING')}>"
+        if name == "MAP":
+            return f"MAP<{attributeType.get('KeyTypeName', 'STRING')}, {attributeType.get('ValueTypeName', 'STRING')}>"
+        return name
+
+    def _loadShard(self, directory:Path, state:dict, shard:dict, batch_size:int, vertexDefinitions:dict) -> int:
+        fileName = shard.get("file")
+        typeName = shard.get("type")
+        with self.lock:
+            committed = state["shards"].get(fileName, 0)
+        if committed >= shard.get("rows", 0):
+            return 0
+
+        conn = self.session.getConnection()
+        idAttribute = vertexDefinitions.get(typeName, {}).get("PrimaryId", {}).get("AttributeName", "")
+        loaded = 0
+        batch = []
+
+        def flush():
+            nonlocal committed, loaded
+            if shard.get("kind") == "vertex":
+                conn.upsertVertices(typeName, [(row.get("v_id"), {k: v for k, v in row.get("attributes", {}).items()
+                                                                 if k != idAttribute}) for row in batch])
+            else:
+                pairs:Dict[tuple, list] = {}
+                for row in batch:
+                    pairs.setdefault((row.get("from_type"), row.get("to_type")), []).append(
+                        (row.get("from_id"), row.get("to_id"), row.get("attributes", {})))
+                for (fromType, toType), edges in pairs.items():
+                    conn.upsertEdges(fromType, typeName, toType, edges)
+            committed += len(batch)
+            loaded += len(batch)
+            with self.lock:
+                state["shards"][fileName] = committed
+                self._writeJson(directory / RESTORE_FILE, state)
+            batch.clear()
+
+        with gzip.open(directory / fileName, 'rt', encoding='utf-8') as file:
+            for i, line in enumerate(file):
+                if i < committed or not line.strip():
+                    continue
+                batch.append(json.loads(line))
+                if len(batch) >= batch_size:
+                    flush()
+        if batch:
+            flush()
+        return loaded
+
+    def readProgress(self, directory:Path) -> dict:
+        return self._readJson(directory / PROGRESS_FILE)
+
+    def _dumpType(self, directory:Path, progress:dict, kind:str, definition:dict, page_size:int, shard_rows:int) -> dict:
+        typeName = definition.get("Name")
+        with self.lock:
+            state = progress["types"].setdefault(typeName, {"kind": kind, "rows": 0, "shards": [],
+                                                            "cursor": None, "done": False})
+        if state.get("done"):
+            return {"kind": kind, "rows": state.get("rows", 0), "skipped": True,
+                    "bytes": sum(shard.get("bytes", 0) for shard in state.get("shards", []))}
+
+        start = time.perf_counter()
+        writer = ShardWriter(directory, f"{kind}_{typeName}", shard_rows, len(state.get("shards", [])))
+        committedRows = state.get("rows", 0)
+        if kind == "vertex":
+            rows = self._vertexRows(typeName, definition, page_size, state.get("cursor"), committedRows)
+        else:
+            rows = self._edgeRows(typeName, state.get("cursor"), committedRows)
+
+        rowsRead = 0
+        for (row, cursor) in rows:
+            rowsRead += 1
+            shard = writer.add(row)
+            if shard is not None:
+                self._commitShard(directory, progress, state, shard, cursor)
+        shard = writer.commit()
+        if shard is not None:
+            self._commitShard(directory, progress, state, shard, None)
+        with self.lock:
+            state["done"] = True
+            self._writeJson(directory / PROGRESS_FILE, progress)
+
+        elapsed = time.perf_counter() - start
+        logger.info(f"Backup of {kind} {typeName}: {rowsRead} rows in {elapsed:.2f} seconds")
+        return {"kind": kind, "rows": state.get("rows", 0), "rowsThisRun": rowsRead,
+                "bytes": sum(shard.get("bytes", 0) for shard in state.get("shards", [])),
+                "seconds": round(elapsed, 3),
+                "rowsPerSecond": round(rowsRead / elapsed, 1) if elapsed > 0 else 0}
+
+    def _commitShard(self, directory:Path, progress:dict, state:dict, shard:dict, cursor):
+        with self.lock:
+            state["shards"].append(shard)
+            state["rows"] = state.get("rows", 0) + shard.get("rows", 0)
+            state["cursor"] = cursor
+            self._writeJson(directory / PROGRESS_FILE, progress)
+
+    def _vertexRows(self, vertexType:str, definition:dict, page_size:int, cursor, committedRows:int=0):
+        """
+        Yield (row, cursor) for a vertex type. When the primary id is stored as an attribute
+        the vertices are read in pages ordered by the id (keyset pagination), otherwise the
+        type is read in one request and resumed after the last committed v_id (see _resumeRows).
+        """
+        conn = self.session.getConnection()
+        primaryId = definition.get("PrimaryId", {})
+        idAttribute = primaryId.get("AttributeName", "")
+        asAttribute = definition.get("Config", {}).get("PRIMARY_ID_AS_ATTRIBUTE", False) or \
+                      primaryId.get("PrimaryIdAsAttribute", False)
+        if not asAttribute or not idAttribute:
+            rows = ({"v_id": vertex.get("v_id"), "attributes": vertex.get("attributes", {})}
+                    for vertex in conn.getVertices(vertexType))
+            yield from _resumeRows(rows, lambda row: [str(row.get("v_id"))], cursor, committedRows)
+            return
+
+        numeric = primaryId.get("AttributeType", {}).get("Name", "STRING").upper() in NUMERIC_TYPES
+        while True:
+            where = ""
+            if cursor is not None:
+                where = f"{idAttribute}>{cursor}" if numeric else f'{idAttribute}>"{cursor}"'
+            page = conn.getVertices(vertexType, where=where, sort=idAttribute, limit=page_size)
+            for vertex in page:
+                cursor = vertex.get("attributes", {}).get(idAttribute, vertex.get("v_id"))
+                yield ({"v_id": vertex.get("v_id"), "attributes": vertex.get("attributes", {})}, cursor)
+            if len(page) < page_size:
+                return
+
+    def _edgeRows(self, edgeType:str, cursor, committedRows:int=0):
+        """
+        Yield (row, cursor) for an edge type. RESTPP has no paged edge scan, so the type is
+        read in one request and resumed after the last committed edge (see _resumeRows).
+        """
+        conn = self.session.getConnection()
+        rows = ({"from_type": edge.get("from_type"), "from_id": edge.get("from_id"),
+                 "to_type": edge.get("to_type"), "to_id": edge.get("to_id"),
+                 "attributes": edge.get("attributes", {})} for edge in conn.getEdgesByType(edgeType))
+        yield from _resumeRows(rows, edgeKey, cursor, committedRows)
+
+    def _readJson(self, fileName:Path) -> dict:
+        if not fileName.exists():
+            return {}
+        with open(fileName, 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+    def _writeJson(self, fileName:Path, content:dict):
+        staging = fileName.with_name(f"{fileName.name}.tmp")
+        with open(staging, 'w', encoding='utf-8') as file:
+            json.dump(content, file, indent=4, separators=(',', ':'))
+        os.replace(staging, fileName)
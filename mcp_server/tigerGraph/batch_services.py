@@ -0,0 +1,268 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+#
+# batch_services.py: This modelue defines the BatchQueryServices class for
+# running an installed query for many parameter sets with bounded concurrency
+# and merging the outputs into one streamed file, and for running one installed
+# query across several graphs
+#******************************************************************************
+import csv
+import json
+import time
+import contextvars
+
+from pathlib import Path
+from typing import Iterator, List, Literal, Tuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from mcp_server.config import tigerGraphTuning
+from mcp_server.tigerGraph.session import TigerGraph_Session
+from mcp_server.tigerGraph.query_signatures import QuerySignatureCache, QueryParameterError
+from mcp_server.tigerGraph.query_registry import RunningQueryRegistry, runDetached
+from mcp_server.tigerGraph.latency_tracker import QueryLatencyTracker, callStatus
+from mcp_server.tigerGraph.session_registry import useGraph
+from mcp_server.mcp_tracing import tracer
+from mcp_server.mcp_profiler import profiledWorker
+from mcp_server.mcp_logger import setErrorHandler, logger
+
+
+class BatchOutputWriter():
+    """
+    Streams batch rows into a JSON array (.json) or a CSV file (.csv) as they complete,
+    one row per parameter set with the parameters in their own column.
+    """
+    CSV_HEADER = ["row", "params", "status", "seconds", "error", "results"]
+
+    def __init__(self, outputFile:Path, outputFormat:str):
+        self.outputFile = outputFile
+        self.isCSV = outputFormat.lower() == 'csv'
+        self.rows = 0
+
+    def __enter__(self):
+        self.file = open(self.outputFile, 'w', newline='', encoding='utf-8')
+        if self.isCSV:
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(self.CSV_HEADER)
+        else:
+            self.file.write("[\n")
+        return self
+
+    def csvRow(self, row:dict) -> list:
+        return [row.get("row"), json.dumps(row.get("params")), row.get("status"), row.get("seconds"),
+                row.get("error", ""), json.dumps(row.get("results")) if "results" in row else ""]
+
+    def write(self, row:dict):
+        if self.isCSV:
+            self.writer.writerow(self.csvRow(row))
+        else:
+            if self.rows > 0:
+                self.file.write(",\n")
+            self.file.write(json.dumps(row, separators=(',', ':')))
+        self.rows += 1
+
+    def __exit__(self, *args):
+        if not self.isCSV:
+            self.file.write("\n]\n")
+        self.file.close()
+
+
+class FanOutWriter(BatchOutputWriter):
+    """
+    Streams the rows of a fan-out query, one per element of each PRINT output, tagged with
+    the graph and output name they came from; a graph that failed is one row with its error.
+    """
+    CSV_HEADER = ["graph", "output", "status", "seconds", "error", "value"]
+
+    def csvRow(self, row:dict) -> list:
+        return [row.get("graph"), row.get("output", ""), row.get("status"), row.get("seconds"),
+                row.get("error", ""), json.dumps(row.get("value")) if "value" in row else ""]
+
+
+def outputRows(results) -> Iterator[Tuple[str, object]]:
+    """(output name, value) for every element of the PRINT outputs of runInstalledQuery"""
+    for block in results or []:
+        if not isinstance(block, dict):
+            yield ("", block)
+            continue
+        for output, value in block.items():
+            if isinstance(value, list):
+                for element in value:
+                    yield (output, element)
+            else:
+                yield (output, value)
+
+
+class BatchQueryServices():
+
+    def __init__(self, session:TigerGraph_Session, outputPath:str, signatures:QuerySignatureCache=None,
+                 registry:RunningQueryRegistry=None, latency:QueryLatencyTracker=None):
+        setErrorHandler()
+        self.session = session
+        self.output_path = Path(outputPath)
+        self.signatures = signatures if signatures is not None else QuerySignatureCache(session)
+        self.registry = registry if registry is not None else RunningQueryRegistry()
+        self.latency = latency if latency is not None else QueryLatencyTracker()
+
+    def readParamFile(self, param_file:str) -> Iterator[dict]:
+        """Stream parameter dictionaries from a CSV file (header row = parameter names)"""
+        path = Path(param_file)
+        path = path if path.is_absolute() else self.output_path / path
+        with open(path, 'r', newline='', encoding='utf-8') as file:
+            for row in csv.DictReader(file):
+                yield {key: value for key, value in row.items() if key and value not in (None, "")}
+
+    def runOne(self, query_name:str, params:dict, timeout:int, tool:str="batch_run_query") -> Tuple[str, list, str]:
+        """Run one parameter set detached, so abortRunning_Query can abort it by callId; returns (status, results, error)"""
+        try:
+            params = self.signatures.validate(query_name, params)
+        except QueryParameterError as error:
+            return ("invalid", None, str(error))
+        call = self.registry.start(tool, query_name, params)
+        start = time.perf_counter()
+        try:
+            results = runDetached(self.session.getConnection(), call, timeout)
+            self.latency.record(query_name, time.perf_counter() - start)
+            return ("ok", results, "")
+        except Exception as error:
+            status = callStatus(error)
+            self.latency.record(query_name, time.perf_counter() - start, status)
+            return (status, None, str(error))
+        finally:
+            self.registry.finish(call.callId)
+
+    def batchRunQuery(self, query_name:str, param_list:List[dict]=[], param_file:str="",
+                      outputFormat:Literal["CSV","JSON"]="JSON", max_workers:int=0, timeout:int=0) -> str:
+        """
+        Run query_name once per parameter set (param_list and / or the rows of param_file) with at
+        most max_workers requests in flight, streaming every result into one output file.
+        """
+        try:
+            start = time.perf_counter()
+            max_workers = max_workers if max_workers > 0 else tigerGraphTuning('queryWorkers')
+            timeout = timeout if timeout > 0 else self.latency.defaultTimeout(query_name)
+            suffix = "csv" if outputFormat.lower() == 'csv' else "json"
+            outputFile = self.output_path / f"{query_name}_batch.{suffix}"
+
+            def paramSets() -> Iterator[dict]:
+                yield from param_list
+                if param_file:
+                    yield from self.readParamFile(param_file)
+
+            counts = {"ok": 0, "error": 0, "timeout": 0, "invalid": 0}
+            latencies:List[float] = []
+
+            def runRow(row:int, params:dict) -> dict:
+                rowStart = time.perf_counter()
+                status, results, error = self.runOne(query_name, params, timeout)
+                entry = {"row": row, "params": params, "status": status,
+                         "seconds": round(time.perf_counter() - rowStart, 4)}
+                if status == "ok":
+                    entry["results"] = results
+                else:
+                    entry["error"] = error
+                return entry
+
+            def drain(done, writer:BatchOutputWriter):
+                for future in done:
+                    entry = future.result()
+                    counts[entry["status"]] += 1
+                    latencies.append(entry["seconds"])
+                    writer.write(entry)
+
+            with tracer.span("export.batch", query=query_name, file=str(outputFile)) as span, \
+                 BatchOutputWriter(outputFile, outputFormat) as writer:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    pending = set()
+                    for row, params in enumerate(paramSets()):
+                        # run each row in a copy of this context so its backend spans join the trace (and its profile)
+                        pending.add(executor.submit(contextvars.copy_context().run, profiledWorker(runRow), row, params))
+                        if len(pending) >= max_workers * 2:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            drain(done, writer)
+                    done, _ = wait(pending)
+                    drain(done, writer)
+                span.set("rows", writer.rows)
+
+            elapsed = time.perf_counter() - start
+            latencies.sort()
+            summary = {
+                "query": query_name,
+                "output": str(outputFile),
+                "rows": writer.rows,
+                "succeeded": counts["ok"],
+                "failed": counts["error"],
+                "timedOut": counts["timeout"],
+                "invalid": counts["invalid"],
+                "seconds": round(elapsed, 3),
+                "rowsPerSecond": round(writer.rows / elapsed, 1) if elapsed > 0 else 0,
+                "maxRowSeconds": latencies[-1] if latencies else 0,
+                "medianRowSeconds": latencies[len(latencies) // 2] if latencies else 0,
+            }
+            return json.dumps(summary, indent=4, separators=(',', ':'))
+
+        except Exception as error:
+            logger.error(f"Error in batchRunQuery(): {error}")
+            return f"Error running batch for query {query_name}: {error}"
+
+    def fanOutQuery(self, query_name:str, graphs:List[str], params:dict={}, outputFormat:Literal["CSV","JSON"]="JSON",
+                    max_workers:int=0, timeout:int=0) -> str:
+        """
+        Run query_name with the same parameters on every graph in graphs, concurrently, and stream
+        the rows of each graph into one output file as soon as that graph has answered.
+        """
+        try:
+            start = time.perf_counter()
+            graphs = list(dict.fromkeys(graph.strip() for graph in graphs if graph and graph.strip()))
+            if not graphs:
+                return "Error: fan_out_query needs at least one graph"
+            max_workers = min(len(graphs), max_workers if max_workers > 0 else tigerGraphTuning('queryWorkers'))
+            suffix = "csv" if outputFormat.lower() == 'csv' else "json"
+            outputFile = self.output_path / f"{query_name}_fanout.{suffix}"
+
+            def runGraph(graph:str) -> Tuple[str, str, list, str, float]:
+                graphStart = time.perf_counter()
+                with useGraph(graph):
+                    graphTimeout = timeout if timeout > 0 else self.latency.defaultTimeout(query_name)
+                    status, results, error = self.runOne(query_name, dict(params), graphTimeout, "fan_out_query")
+                return (graph, status, results, error, round(time.perf_counter() - graphStart, 4))
+
+            perGraph = {}
+            with tracer.span("export.fanout", query=query_name, file=str(outputFile), graphs=len(graphs)) as span, \
+                 FanOutWriter(outputFile, outputFormat) as writer:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    # each graph runs in a copy of this context, so its backend spans join the trace (and its profile)
+                    pending = {executor.submit(contextvars.copy_context().run, profiledWorker(runGraph), graph)
+                               for graph in graphs}
+                    while pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            graph, status, results, error, seconds = future.result()
+                            rows = 0
+                            if status == "ok":
+                                for output, value in outputRows(results):
+                                    writer.write({"graph": graph, "output": output, "status": status,
+                                                  "seconds": seconds, "value": value})
+                                    rows += 1
+                            else:
+                                writer.write({"graph": graph, "status": status, "seconds": seconds, "error": error})
+                            perGraph[graph] = {"status": status, "seconds": seconds, "rows": rows}
+                            if error:
+                                perGraph[graph]["error"] = error
+                span.set("rows", writer.rows)
+
+            elapsed = time.perf_counter() - start
+            summary = {
+                "query": query_name,
+                "output": str(outputFile),
+                "rows": writer.rows,
+                "graphs": len(graphs),
+                "succeeded": sum(1 for result in perGraph.values() if result["status"] == "ok"),
+                "failed": sum(1 for result in perGraph.values() if result["status"] != "ok"),
+                "seconds": round(elapsed, 3),
+                "perGraph": {graph: perGraph[graph] for graph in graphs},
+            }
+            return json.dumps(summary, indent=4, separators=(',', ':'))
+
+        except Exception as error:
+            logger.error(f"Error in fanOutQuery(): {error}")
+            return f"Error running query {query_name} across graphs: {error}"
@@ -0,0 +1,470 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+#
+# graph_snapshot.py: This modelue defines the GraphSnapshot class, a compact
+# array-backed CSR (compressed sparse row) copy of a TigerGraph subgraph that
+# supports vectorized analytics (BFS, degree, PageRank) without the database
+#******************************************************************************
+import os
+import json
+import shutil
+import datetime
+import numpy as np
+
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+MANIFEST_FILE = "manifest.json"
+OFFSETS_FILE = "offsets.npy"
+TARGETS_FILE = "targets.npy"
+EDGE_CODES_FILE = "edge_types.npy"
+VERTEX_IDS_FILE = "vertex_ids.npy"
+VERTEX_CODES_FILE = "vertex_types.npy"
+VERTEX_ATTR_PREFIX = "vattr_"
+EDGE_ATTR_PREFIX = "eattr_"
+
+
+class GraphSnapshot():
+    """
+    Integer mapped CSR representation of a graph:
+        vertexIds[i], vertexCodes[i]   -> TigerGraph primary id and vertex type code of vertex i
+        offsets[i]:offsets[i+1]        -> slice of targets / edgeCodes holding the out-edges of vertex i
+        vertexAttributes["Type.attr"]  -> float64 array aligned to vertices (NaN when not set)
+        edgeAttributes["Edge.attr"]    -> float64 array aligned to targets (NaN when not set)
+    Undirected edges are stored in both directions.
+    watermarks records, per vertex / edge type, how far the snapshot has been
+    synchronized (used by incremental refresh).
+    """
+    def __init__(self, name:str, vertexTypes:List[str], edgeTypes:List[str],
+                 vertexIds:np.ndarray, vertexCodes:np.ndarray,
+                 offsets:np.ndarray, targets:np.ndarray, edgeCodes:np.ndarray,
+                 vertexAttributes:Dict[str, np.ndarray]={}, edgeAttributes:Dict[str, np.ndarray]={},
+                 created:str="", watermarks:dict={}):
+        self.name = name
+        self.vertexTypes = list(vertexTypes)
+        self.edgeTypes = list(edgeTypes)
+        self.vertexIds = vertexIds
+        self.vertexCodes = vertexCodes
+        self.offsets = offsets
+        self.targets = targets
+        self.edgeCodes = edgeCodes
+        self.vertexAttributes = dict(vertexAttributes)
+        self.edgeAttributes = dict(edgeAttributes)
+        self.created = created if created else datetime.datetime.now().isoformat(timespec='seconds')
+        self.watermarks = dict(watermarks)
+        self._index:Dict[Tuple[int, str], int] = {}
+        self._indexed = False
+        self._newVertices:List[Tuple[int, str]] = []
+        self._deltaEdges:Dict[Tuple[int, int, int], dict] = {}
+        self._stagedAttributes:Dict[str, Dict[int, float]] = {}
+        self._layoutChanged = False
+
+    @property
+    def vertexCount(self) -> int:
+        return int(self.vertexIds.shape[0])
+
+    @property
+    def edgeCount(self) -> int:
+        return int(self.targets.shape[0])
+
+    @classmethod
+    def fromRecords(cls, name:str, vertices:List[dict], edges:List[dict]) -> 'GraphSnapshot':
+        """
+        Build a snapshot from pyTigerGraph getVertices() / getEdgesByType() records.
+        Args:
+            vertices: [{"v_id":..., "v_type":..., "attributes":{...}}, ...]
+            edges:    [{"e_type":..., "directed":bool, "from_type":..., "from_id":...,
+                        "to_type":..., "to_id":..., "attributes":{...}}, ...]
+        Edge end points that are not part of vertices are added without attributes.
+        """
+        vertexTypes:List[str] = []
+        edgeTypes:List[str] = []
+        index:Dict[Tuple[str, str], int] = {}
+        ids:List[str] = []
+        codes:List[int] = []
+        vAttrValues:Dict[str, Dict[int, float]] = {}
+
+        def typeCode(names:List[str], name:str) -> int:
+            if name not in names:
+                names.append(name)
+            return names.index(name)
+
+        def vertexIndex(vType:str, vId) -> int:
+            key = (vType, str(vId))
+            position = index.get(key)
+            if position is None:
+                position = len(ids)
+                index[key] = position
+                ids.append(str(vId))
+                codes.append(typeCode(vertexTypes, vType))
+            return position
+
+        for vertex in vertices:
+            position = vertexIndex(vertex.get("v_type"), vertex.get("v_id"))
+            for attr, value in _numericItems(vertex.get("attributes", {})):
+                vAttrValues.setdefault(f"{vertex.get('v_type')}.{attr}", {})[position] = value
+
+        sources:List[int] = []
+        destinations:List[int] = []
+        eCodes:List[int] = []
+        eAttrValues:Dict[str, Dict[int, float]] = {}
+        for edge in edges:
+            source = vertexIndex(edge.get("from_type"), edge.get("from_id"))
+            target = vertexIndex(edge.get("to_type"), edge.get("to_id"))
+            code = typeCode(edgeTypes, edge.get("e_type"))
+            numeric = list(_numericItems(edge.get("attributes", {})))
+            directions = [(source, target)]
+            if not edge.get("directed", True) and source != target:
+                directions.append((target, source))
+            for (s, t) in directions:
+                for attr, value in numeric:
+                    eAttrValues.setdefault(f"{edge.get('e_type')}.{attr}", {})[len(sources)] = value
+                sources.append(s)
+                destinations.append(t)
+                eCodes.append(code)
+
+        vertexCount = len(ids)
+        vertexAttributes = {key: _denseArray(values, vertexCount) for key, values in vAttrValues.items()}
+        edgeAttributes = {key: _denseArray(values, len(sources)) for key, values in eAttrValues.items()}
+
+        offsets, order = _compressRows(np.asarray(sources, dtype=np.int64), vertexCount)
+        targets = np.asarray(destinations, dtype=np.int64)[order]
+        edgeCodes = np.asarray(eCodes, dtype=np.int16)[order]
+        edgeAttributes = {key: values[order] for key, values in edgeAttributes.items()}
+
+        return cls(name, vertexTypes, edgeTypes,
+                   np.asarray(ids, dtype=str), np.asarray(codes, dtype=np.int16),
+                   offsets, targets, edgeCodes, vertexAttributes, edgeAttributes)
+
+    def save(self, directory:Path) -> Path:
+        """
+        Persist the snapshot as a directory of .npy arrays plus a JSON manifest.
+        The files are written to a staging directory that then replaces directory,
+        so arrays memory-mapped from a previous version stay valid.
+        """
+        directory = Path(directory)
+        staging = directory.with_name(f"{directory.name}.staging")
+        if staging.exists():
+            shutil.rmtree(staging)
+        staging.mkdir(parents=True)
+        np.save(staging / VERTEX_IDS_FILE, self.vertexIds)
+        np.save(staging / VERTEX_CODES_FILE, self.vertexCodes)
+        np.save(staging / OFFSETS_FILE, self.offsets)
+        np.save(staging / TARGETS_FILE, self.targets)
+        np.save(staging / EDGE_CODES_FILE, self.edgeCodes)
+
+        vertexFiles = {}
+        for i, (key, values) in enumerate(self.vertexAttributes.items()):
+            vertexFiles[key] = f"{VERTEX_ATTR_PREFIX}{i}.npy"
+            np.save(staging / vertexFiles[key], values)
+        edgeFiles = {}
+        for i, (key, values) in enumerate(self.edgeAttributes.items()):
+            edgeFiles[key] = f"{EDGE_ATTR_PREFIX}{i}.npy"
+            np.save(staging / edgeFiles[key], values)
+        self._writeManifest(staging, vertexFiles, edgeFiles)
+
+        if directory.exists():
+            retired = directory.with_name(f"{directory.name}.retired")
+            if retired.exists():
+                shutil.rmtree(retired)
+            os.replace(directory, retired)
+            os.replace(staging, directory)
+            shutil.rmtree(retired)
+        else:
+            os.replace(staging, directory)
+        return directory
+
+    def saveManifest(self, directory:Path):
+        """Rewrite only the manifest (e.g. after attributes were patched in place)"""
+        directory = Path(directory)
+        with open(directory / MANIFEST_FILE, 'r', encoding='utf-8') as file:
+            manifest = json.load(file)
+        self._writeManifest(directory, manifest.get("vertexAttributes", {}), manifest.get("edgeAttributes", {}))
+
+    def _writeManifest(self, directory:Path, vertexFiles:dict, edgeFiles:dict):
+        manifest = {
+            "name": self.name,
+            "created": self.created,
+            "vertexTypes": self.vertexTypes,
+            "edgeTypes": self.edgeTypes,
+            "vertexCount": self.vertexCount,
+            "edgeCount": self.edgeCount,
+            "vertexAttributes": vertexFiles,
+            "edgeAttributes": edgeFiles,
+            "watermarks": self.watermarks,
+        }
+        staging = directory / f"{MANIFEST_FILE}.tmp"
+        with open(staging, 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, indent=4, separators=(',', ':'))
+        os.replace(staging, directory / MANIFEST_FILE)
+
+    @classmethod
+    def load(cls, directory:Path, mmap:bool=True, writable:bool=False) -> 'GraphSnapshot':
+        """
+        Load a saved snapshot, memory-mapping the arrays (read only) by default.
+        With writable=True the arrays are mapped read/write so attribute updates
+        are patched directly into the snapshot files.
+        """
+        directory = Path(directory)
+        mode = ('r+' if writable else 'r') if mmap else None
+        with open(directory / MANIFEST_FILE, 'r', encoding='utf-8') as file:
+            manifest = json.load(file)
+
+        def array(fileName:str) -> np.ndarray:
+            return np.load(directory / fileName, mmap_mode=mode)
+
+        return cls(manifest.get("name"), manifest.get("vertexTypes", []), manifest.get("edgeTypes", []),
+                   array(VERTEX_IDS_FILE), array(VERTEX_CODES_FILE),
+                   array(OFFSETS_FILE), array(TARGETS_FILE), array(EDGE_CODES_FILE),
+                   {key: array(f) for key, f in manifest.get("vertexAttributes", {}).items()},
+                   {key: array(f) for key, f in manifest.get("edgeAttributes", {}).items()},
+                   manifest.get("created", ""), manifest.get("watermarks", {}))
+
+    def _ensureIndex(self):
+        """Build the (type code, id) -> position index of all stored vertices once; staged vertices are added to it"""
+        if not self._indexed:
+            stored = {(int(c), str(v)): i for i, (c, v) in enumerate(zip(self.vertexCodes, self.vertexIds))}
+            stored.update(self._index)
+            self._index = stored
+            self._indexed = True
+
+    def lookup(self, vertex_type:str, vertex_id) -> int:
+        """Return the integer index of a vertex, or -1 if it is not in the snapshot"""
+        self._ensureIndex()
+        if vertex_type not in self.vertexTypes:
+            return -1
+        return self._index.get((self.vertexTypes.index(vertex_type), str(vertex_id)), -1)
+
+    def vertexKey(self, position:int) -> Tuple[str, str]:
+        return (self.vertexTypes[int(self.vertexCodes[position])], str(self.vertexIds[position]))
+
+    def typeMask(self, vertex_type:str="") -> np.ndarray:
+        """Boolean mask of the vertices of vertex_type (all vertices when vertex_type is empty)"""
+        if not vertex_type:
+            return np.ones(self.vertexCount, dtype=bool)
+        if vertex_type not in self.vertexTypes:
+            return np.zeros(self.vertexCount, dtype=bool)
+        return np.asarray(self.vertexCodes) == self.vertexTypes.index(vertex_type)
+
+    def outDegree(self) -> np.ndarray:
+        return np.diff(np.asarray(self.offsets))
+
+    def inDegree(self) -> np.ndarray:
+        return np.bincount(np.asarray(self.targets), minlength=self.vertexCount)
+
+    def neighbors(self, frontier:np.ndarray) -> np.ndarray:
+        """Gather the out-neighbors of every vertex in frontier in one vectorized step"""
+        offsets = np.asarray(self.offsets)
+        starts = offsets[frontier]
+        counts = offsets[frontier + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64)
+        shift = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        return np.asarray(self.targets)[shift + np.arange(total)]
+
+    def bfs(self, source:int, max_depth:int=-1) -> np.ndarray:
+        """
+        Level synchronous breadth first search from vertex index source.
+        Returns an int32 array of hop distances (-1 when unreachable)
+        """
+        distance = np.full(self.vertexCount, -1, dtype=np.int32)
+        distance[source] = 0
+        frontier = np.asarray([source], dtype=np.int64)
+        depth = 0
+        while frontier.size > 0 and (max_depth < 0 or depth < max_depth):
+            candidates = self.neighbors(frontier)
+            frontier = np.unique(candidates[distance[candidates] < 0])
+            depth += 1
+            distance[frontier] = depth
+        return distance
+
+    def pagerank(self, damping:float=0.85, max_iter:int=100, tolerance:float=1.0e-6) -> Tuple[np.ndarray, int]:
+        """
+        Power iteration PageRank over the out-edges. Dangling vertices distribute
+        their rank uniformly. Returns (ranks, iterations)
+        """
+        count = self.vertexCount
+        if count == 0:
+            return (np.zeros(0), 0)
+        outDegree = self.outDegree()
+        sources = np.repeat(np.arange(count), outDegree)
+        targets = np.asarray(self.targets)
+        dangling = outDegree == 0
+        safeDegree = np.where(dangling, 1, outDegree)
+        ranks = np.full(count, 1.0 / count)
+        iteration = 0
+        for iteration in range(1, max_iter + 1):
+            contribution = (ranks / safeDegree)[sources]
+            spread = np.bincount(targets, weights=contribution, minlength=count)
+            updated = (1.0 - damping) / count + damping * (spread + ranks[dangling].sum() / count)
+            delta = np.abs(updated - ranks).sum()
+            ranks = updated
+            if delta < tolerance:
+                break
+        return (ranks, iteration)
+
+    def applyDelta(self, vertices:List[dict], edges:List[dict]) -> dict:
+        """
+        Apply changed vertices / edges (same record format as fromRecords()).
+        Numeric attributes of existing vertices and edges are patched in place; new
+        vertices and edges are staged until compact() rebuilds the CSR arrays.
+        Returns the delta counts.
+        """
+        stats = {"updatedVertices": 0, "newVertices": 0, "updatedEdges": 0, "newEdges": 0}
+        self._ensureIndex()
+        vertexCount = self.vertexCount + len(self._newVertices)
+
+        def vertexIndex(vType:str, vId) -> int:
+            position = self.lookup(vType, vId)
+            if position < 0:
+                if vType not in self.vertexTypes:
+                    self.vertexTypes.append(vType)
+                key = (self.vertexTypes.index(vType), str(vId))
+                position = self._index.get(key, -1)
+                if position < 0:
+                    position = self.vertexCount + len(self._newVertices)
+                    self._index[key] = position
+                    self._newVertices.append(key)
+            return position
+
+        for vertex in vertices:
+            position = vertexIndex(vertex.get("v_type"), vertex.get("v_id"))
+            if position < vertexCount:
+                stats["updatedVertices"] += 1
+            else:
+                stats["newVertices"] += 1
+            for attr, value in _numericItems(vertex.get("attributes", {})):
+                self._setAttribute(self.vertexAttributes, f"{vertex.get('v_type')}.{attr}",
+                                   self.vertexCount, position, value)
+            vertexCount = self.vertexCount + len(self._newVertices)
+
+        for edge in edges:
+            source = vertexIndex(edge.get("from_type"), edge.get("from_id"))
+            target = vertexIndex(edge.get("to_type"), edge.get("to_id"))
+            if edge.get("e_type") not in self.edgeTypes:
+                self.edgeTypes.append(edge.get("e_type"))
+            code = self.edgeTypes.index(edge.get("e_type"))
+            numeric = dict(_numericItems(edge.get("attributes", {})))
+            directions = [(source, target)]
+            if not edge.get("directed", True) and source != target:
+                directions.append((target, source))
+            for (s, t) in directions:
+                positions = self._edgePositions(s, t, code)
+                if positions.size > 0:
+                    stats["updatedEdges"] += 1
+                    for attr, value in numeric.items():
+                        self._setAttribute(self.edgeAttributes, f"{edge.get('e_type')}.{attr}",
+                                           self.edgeCount, positions, value)
+                else:
+                    stats["newEdges"] += 1
+                    self._deltaEdges[(s, t, code)] = {f"{edge.get('e_type')}.{attr}": value
+                                                      for attr, value in numeric.items()}
+        return stats
+
+    def hasPendingChanges(self) -> bool:
+        """True when the delta needs compact() + save() rather than an in-place flush()"""
+        return len(self._newVertices) > 0 or len(self._deltaEdges) > 0 or self._layoutChanged
+
+    def flush(self):
+        """Write in-place attribute patches back to the memory-mapped snapshot files"""
+        for values in list(self.vertexAttributes.values()) + list(self.edgeAttributes.values()):
+            if isinstance(values, np.memmap):
+                values.flush()
+
+    def compact(self):
+        """Merge the staged vertices and edges into new CSR arrays (vectorized)"""
+        if not self.hasPendingChanges():
+            return
+        newIds = [vId for (_, vId) in self._newVertices]
+        newCodes = [code for (code, _) in self._newVertices]
+        vertexCount = self.vertexCount + len(newIds)
+        self.vertexIds = np.concatenate([np.asarray(self.vertexIds), np.asarray(newIds, dtype=str)]) if newIds \
+                         else np.asarray(self.vertexIds)
+        self.vertexCodes = np.concatenate([np.asarray(self.vertexCodes), np.asarray(newCodes, dtype=np.int16)])
+        self.vertexAttributes = {key: _extend(values, vertexCount) for key, values in self.vertexAttributes.items()}
+        for key, values in self._stagedAttributes.items():
+            if key not in self.vertexAttributes:
+                self.vertexAttributes[key] = np.full(vertexCount, np.nan)
+            self.vertexAttributes[key][np.fromiter(values.keys(), dtype=np.int64)] = \
+                np.fromiter(values.values(), dtype=np.float64)
+
+        baseCount = self.edgeCount
+        keys = list(self._deltaEdges.keys())
+        sources = np.concatenate([np.repeat(np.arange(len(self.offsets) - 1), self.outDegree()),
+                                  np.asarray([k[0] for k in keys], dtype=np.int64)])
+        targets = np.concatenate([np.asarray(self.targets), np.asarray([k[1] for k in keys], dtype=np.int64)])
+        edgeCodes = np.concatenate([np.asarray(self.edgeCodes), np.asarray([k[2] for k in keys], dtype=np.int16)])
+        edgeAttributes = {key: _extend(values, baseCount + len(keys)) for key, values in self.edgeAttributes.items()}
+        for i, key in enumerate(keys):
+            for attr, value in self._deltaEdges[key].items():
+                if attr not in edgeAttributes:
+                    edgeAttributes[attr] = np.full(baseCount + len(keys), np.nan)
+                edgeAttributes[attr][baseCount + i] = value
+
+        offsets, order = _compressRows(sources, vertexCount)
+        self.offsets = offsets
+        self.targets = targets[order]
+        self.edgeCodes = edgeCodes[order]
+        self.edgeAttributes = {key: values[order] for key, values in edgeAttributes.items()}
+        self._newVertices = []
+        self._deltaEdges = {}
+        self._stagedAttributes = {}
+        self._layoutChanged = False
+
+    def _edgePositions(self, source:int, target:int, code:int) -> np.ndarray:
+        if source >= len(self.offsets) - 1:
+            return np.empty(0, dtype=np.int64)
+        start, end = int(self.offsets[source]), int(self.offsets[source + 1])
+        match = (np.asarray(self.targets[start:end]) == target) & (np.asarray(self.edgeCodes[start:end]) == code)
+        return start + np.flatnonzero(match)
+
+    def _setAttribute(self, attributes:Dict[str, np.ndarray], key:str, size:int, position, value:float):
+        if np.any(np.asarray(position) >= size):
+            # staged vertex, written once compact() has extended the arrays
+            self._stagedAttributes.setdefault(key, {})[int(position)] = value
+            return
+        if key not in attributes:
+            attributes[key] = np.full(size, np.nan)
+            self._layoutChanged = True
+        attributes[key][position] = value
+
+    def summary(self) -> dict:
+        return {
+            "name": self.name,
+            "created": self.created,
+            "vertices": self.vertexCount,
+            "edges": self.edgeCount,
+            "vertexTypes": self.vertexTypes,
+            "edgeTypes": self.edgeTypes,
+            "vertexAttributes": list(self.vertexAttributes.keys()),
+            "edgeAttributes": list(self.edgeAttributes.keys()),
+        }
+
+
+def _numericItems(attributes:dict):
+    for attr, value in (attributes or {}).items():
+        if isinstance(value, (bool, int, float)):
+            yield (attr, float(value))
+
+
+def _denseArray(values:Dict[int, float], size:int) -> np.ndarray:
+    dense = np.full(size, np.nan)
+    if values:
+        dense[np.fromiter(values.keys(), dtype=np.int64)] = np.fromiter(values.values(), dtype=np.float64)
+    return dense
+
+
+def _extend(values:np.ndarray, size:int) -> np.ndarray:
+    extended = np.full(size, np.nan)
+    extended[:values.shape[0]] = values
+    return extended
+
+
+def _compressRows(sources:np.ndarray, vertexCount:int) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (offsets, order) where order stably sorts the edge list by source vertex"""
+    order = np.argsort(sources, kind='stable')
+    offsets = np.zeros(vertexCount + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=vertexCount), out=offsets[1:])
+    return (offsets, order)
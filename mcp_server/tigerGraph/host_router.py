@@ -0,0 +1,163 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+#
+# host_router.py: This modelue defines the HostRouter class that spreads the
+# RESTPP read traffic of a session over the nodes of a TigerGraph cluster
+# (least outstanding requests, health checked) and keeps GSQL / schema
+# operations on the primary host
+#******************************************************************************
+import time
+import threading
+import numpy as np
+
+from collections import deque
+from typing import Callable, Deque, List, Optional
+from mcp_server.config import tigerGraphTuning
+from mcp_server.mcp_metrics import metrics
+from mcp_server.mcp_logger import setErrorHandler, logger
+from mcp_server.tigerGraph.instrumented_connection import InstrumentedConnection
+from mcp_server.tigerGraph.resilience import Resilience, OPEN
+
+LATENCY_WINDOW = 500
+
+#
+# RESTPP calls without side effects, served by whichever node has the fewest requests in flight.
+# Everything else (gsql, schema changes, upserts, secrets, running query lists) stays on the
+# primary host so a sequence of schema operations sees its own changes.
+#
+ROUTED_METHODS = {
+    "runInstalledQuery", "getVertices", "getVerticesById", "getVertexCount", "getVertexStats",
+    "getEdges", "getEdgesByType", "getEdgeCount", "getEdgeCountFrom", "getEdgeStats", "vectorSearch",
+}
+
+
+def parseHosts(primary:str, hosts:str) -> List[str]:
+    """The primary host followed by the TG_HOSTS entries (comma separated), without duplicates"""
+    parsed = [primary]
+    for host in hosts.split(","):
+        host = host.strip().rstrip("/")
+        if host and host not in parsed:
+            parsed.append(host)
+    return parsed
+
+
+class HostEntry():
+    """One cluster node: its connection, circuit breakers, requests in flight and latency history"""
+    def __init__(self, host:str, connection:InstrumentedConnection, resilience:Resilience):
+        self.host = host
+        self.connection = connection
+        self.resilience = resilience
+        self.outstanding = 0
+        self.healthy = True
+        self.lastCheckError:Optional[str] = None
+        self.calls = 0
+        self.errors = 0
+        self.latencies:Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def available(self) -> bool:
+        """Healthy, and no open circuit breaker still waiting for its reset time"""
+        breaker = self.resilience.breakers.get("RESTPP")
+        return self.healthy and (breaker is None or breaker.state != OPEN or breaker.retryIn() == 0)
+
+    def status(self) -> dict:
+        history = np.fromiter(self.latencies, dtype=np.float64)
+        latency = {f"p{quantile}": round(float(value), 4)
+                   for quantile, value in zip((50, 95, 99), np.percentile(history, (50, 95, 99)))} if len(history) else {}
+        return {"host": self.host, "healthy": self.healthy, "available": self.available(),
+                "outstanding": self.outstanding, "calls": self.calls, "errors": self.errors,
+                "latencySeconds": latency, "lastCheckError": self.lastCheckError,
+                "breakers": {api: breaker.state for api, breaker in self.resilience.breakers.items()}}
+
+
+class HostRouter():
+    """
+    Stands in for the session connection. Calls in ROUTED_METHODS go to the available host with
+    the fewest requests in flight (ties go to the lower median latency); every other call and all
+    attribute reads go to the primary host. A background thread pings every host each
+    TG_HOST_CHECK_INTERVAL seconds and takes unreachable ones out of the rotation.
+    """
+    def __init__(self, hosts:List[str], newConnection:Callable[[str, Resilience], InstrumentedConnection],
+                 primaryResilience:Resilience):
+        setErrorHandler()
+        self._lock = threading.Lock()
+        self.entries:List[HostEntry] = []
+        for host in hosts:
+            resilience = primaryResilience if not self.entries else Resilience()
+            self.entries.append(HostEntry(host, newConnection(host, resilience), resilience))
+        self.primary = self.entries[0]
+        self.checkInterval = tigerGraphTuning('hostCheckInterval')
+        self._stopped = threading.Event()
+        self._thread:Optional[threading.Thread] = None
+
+    def connections(self) -> List[InstrumentedConnection]:
+        return [entry.connection for entry in self.entries]
+
+    def __getattr__(self, name:str):
+        if name in ROUTED_METHODS:
+            return lambda *args, **kwargs: self.call(name, *args, **kwargs)
+        return getattr(self.primary.connection, name)
+
+    def choose(self) -> HostEntry:
+        """Reserve the available host with the fewest requests in flight (the primary when none is available)"""
+        with self._lock:
+            available = [entry for entry in self.entries if entry.available()] or [self.primary]
+            entry = min(available, key=lambda entry: (entry.outstanding,
+                                                      float(np.median(entry.latencies)) if entry.latencies else 0.0))
+            entry.outstanding += 1
+            return entry
+
+    def call(self, name:str, *args, **kwargs):
+        entry = self.choose()
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            return getattr(entry.connection, name)(*args, **kwargs)
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            with self._lock:
+                entry.outstanding -= 1
+                entry.calls += 1
+                if status == "ok":
+                    entry.latencies.append(seconds)
+                else:
+                    entry.errors += 1
+            metrics.observeSeconds("tigergraph_host_latency_seconds", seconds, {"host": entry.host, "status": status},
+                                   help="TigerGraph routed call latency by host")
+
+    def checkHealth(self):
+        for entry in self.entries:
+            try:
+                # unwrapped: a health check is neither retried nor held back by an open breaker
+                results = entry.connection.unwrap().ping()
+                healthy = not (isinstance(results, dict) and results.get("error") is True)
+                entry.lastCheckError = None if healthy else str(results.get("message"))
+            except Exception as error:
+                healthy = False
+                entry.lastCheckError = str(error)
+            if healthy != entry.healthy:
+                logger.warning(f"TigerGraph host {entry.host} is {'back in' if healthy else 'taken out of'} rotation"
+                               f"{'' if healthy else ': ' + str(entry.lastCheckError)}")
+            entry.healthy = healthy
+
+    def start(self):
+        if self._thread is not None or len(self.entries) < 2 or self.checkInterval <= 0:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="tigergraph-hosts", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread = None
+
+    def _run(self):
+        while not self._stopped.wait(self.checkInterval):
+            self.checkHealth()
+
+    def status(self) -> List[dict]:
+        with self._lock:
+            return [entry.status() for entry in self.entries]
@@ -0,0 +1,92 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+#
+# instrumented_connection.py: This modelue defines the InstrumentedConnection
+# class, a transparent proxy around TigerGraphConnection that records the
+# latency, payload size, errors and trace span of every backend call
+# (RESTPP vs GSQL), retried and guarded by the session circuit breakers
+#******************************************************************************
+import time
+
+from typing import TYPE_CHECKING, Optional
+from mcp_server.mcp_metrics import metrics, payloadSize
+from mcp_server.mcp_tracing import tracer
+from mcp_server.tigerGraph.resilience import Resilience, CircuitOpenError
+
+if TYPE_CHECKING:
+    from pyTigerGraph import TigerGraphConnection
+
+#
+# pyTigerGraph calls served by the GSQL server, every other public call goes to RESTPP
+#
+GSQL_METHODS = {
+    "gsql", "showQuery", "getUDF", "getSchema", "getVertexTypes", "getEdgeTypes", "createSecret",
+    "getSecrets", "dropSecret", "check_exist_graphs", "createQuery", "installQueries", "getQueryMetadata",
+    "runInterpretedQuery", "getVersion",
+}
+
+
+class InstrumentedConnection():
+    """
+    Forwards attribute access to the wrapped TigerGraphConnection. Public methods are wrapped
+    to record tigergraph_backend_latency_seconds / _response_bytes / _calls_total by method and
+    api (RESTPP or GSQL); attribute writes (apiToken, ...) go to the wrapped connection.
+    With a Resilience, calls are retried on transient failures and rejected while the
+    circuit breaker of their api is open.
+    """
+    def __init__(self, connection:'TigerGraphConnection', resilience:Optional[Resilience]=None):
+        object.__setattr__(self, "_connection", connection)
+        object.__setattr__(self, "_resilience", resilience)
+        object.__setattr__(self, "_wrappers", {})
+
+    def unwrap(self) -> 'TigerGraphConnection':
+        return self._connection
+
+    def __getattr__(self, name:str):
+        attribute = getattr(self._connection, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+        wrapper = self._wrappers.get(name)
+        if wrapper is None:
+            wrapper = self._wrappers[name] = self._instrument(name)
+        return wrapper
+
+    def __setattr__(self, name:str, value):
+        setattr(self._connection, name, value)
+
+    def _instrument(self, name:str):
+        api = "GSQL" if name in GSQL_METHODS else "RESTPP"
+        labels = {"method": name, "api": api}
+
+        def attempt(*args, **kwargs):
+            with tracer.span(f"backend.{name}", api=api):
+                return getattr(self._connection, name)(*args, **kwargs)
+
+        def call(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                if self._resilience is None:
+                    result = attempt(*args, **kwargs)
+                else:
+                    result = self._resilience.call(api, name, attempt, *args, **kwargs)
+            except CircuitOpenError:
+                metrics.inc("tigergraph_backend_calls_total", {**labels, "status": "rejected"},
+                            help="TigerGraph backend calls by method, api and status")
+                raise
+            except Exception:
+                metrics.inc("tigergraph_backend_calls_total", {**labels, "status": "error"},
+                            help="TigerGraph backend calls by method, api and status")
+                metrics.observeSeconds("tigergraph_backend_latency_seconds", time.perf_counter() - start, labels,
+                                       help="TigerGraph backend call latency")
+                raise
+            metrics.observeSeconds("tigergraph_backend_latency_seconds", time.perf_counter() - start, labels,
+                                   help="TigerGraph backend call latency")
+            metrics.inc("tigergraph_backend_calls_total", {**labels, "status": "ok"},
+                        help="TigerGraph backend calls by method, api and status")
+            metrics.observe("tigergraph_backend_response_bytes", payloadSize(result), labels,
+                            help="TigerGraph backend response size")
+            return result
+
+        call.__name__ = name
+        return call
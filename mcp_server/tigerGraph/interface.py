@@ -5,10 +5,12 @@
 # TigerGraphInterface.py: This modelue defines the interfaces that support the
 # TigerGraph MCP Server and the associated services
 #******************************************************************************
-import pandas as pd
-
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Tuple, Union, Literal
+from typing import TYPE_CHECKING, Dict, Any, Tuple, Union, Literal
+
+if TYPE_CHECKING:
+    # type hints only, pandas takes ~0.2s to import
+    import pandas as pd
 
 
 class TigerGraphInterface(ABC):
@@ -31,7 +33,7 @@ class TigerGraphInterface(ABC):
         pass
 
     @abstractmethod
-    def run_query(self, query_name: str, params: Dict[str, Any] = {}, outputFormat:Literal["Terminal","CSV","JSON"]="Terminal", timeout: int = 60) -> Any:
+    def run_query(self, query_name: str, params: Dict[str, Any] = {}, outputFormat:Literal["Terminal","CSV","JSON"]="Terminal", timeout: int = 0) -> Any:
         """
         Run a TigerGraph query with parameters.
         
@@ -43,7 +45,8 @@ class TigerGraphInterface(ABC):
                         CSV or JSON. If either CSV, or CSV is passed, the query results will be written to a file in the output 
                         directory defined in the .env file. By default, the format is 'Terminal', which returns JSON data 
                         directly to the caller without writing to a file.
-            timeout (int, optional): Maximum duration for successful query execution in seconds. Defaults to 60 seconds.
+            timeout (int, optional): Maximum duration for successful query execution in seconds. Defaults to 0, the
+                        timeout learned from the query's latency history (60 seconds until there is enough history).
         
         Returns:
             Any: The query execution results.
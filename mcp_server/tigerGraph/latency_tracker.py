@@ -0,0 +1,112 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+#
+# latency_tracker.py: This modelue defines the QueryLatencyTracker class that
+# records the latency history of each installed query and derives a default
+# timeout (p99 x factor, clamped) from it
+#******************************************************************************
+import math
+import threading
+import numpy as np
+
+from collections import deque
+from typing import Deque, Dict, Optional
+from mcp_server.config import tigerGraphTuning
+from mcp_server.mcp_logger import setErrorHandler, logger
+
+DEFAULT_TIMEOUT = 60
+RECENT_SAMPLES = 10
+
+
+def callStatus(error:Exception) -> str:
+    """Classify a failed query call as 'timeout' or 'error'"""
+    message = str(error).lower()
+    return "timeout" if "timeout" in message or "timed out" in message else "error"
+
+
+class QueryLatencyTracker():
+    """
+    Keeps the last latencyWindow latencies (seconds) of the successful and timed out calls of
+    every query. Until a query has latencyMinSamples samples its default timeout is the fixed
+    60 seconds; after that it is p99 x timeoutFactor, clamped to [timeoutMin, timeoutMax].
+    """
+    def __init__(self):
+        setErrorHandler()
+        self._lock = threading.Lock()
+        self._samples:Dict[str, Deque[float]] = {}
+        self._errors:Dict[str, int] = {}
+        self._timeouts:Dict[str, int] = {}
+        self.reconfigure()
+
+    def reconfigure(self):
+        """(Re)read the latency settings; a new window keeps the most recent samples of every query"""
+        with self._lock:
+            self.window = tigerGraphTuning('latencyWindow')
+            self.minSamples = tigerGraphTuning('latencyMinSamples')
+            self.factor = tigerGraphTuning('timeoutFactor')
+            self.minTimeout = tigerGraphTuning('timeoutMin')
+            self.maxTimeout = tigerGraphTuning('timeoutMax')
+            for name, samples in self._samples.items():
+                if samples.maxlen != self.window:
+                    self._samples[name] = deque(samples, maxlen=self.window)
+
+    def record(self, query_name:str, seconds:float, status:str="ok") -> Optional[str]:
+        """Record one call, returns a warning message when the query is running slower than its history"""
+        warning = None
+        with self._lock:
+            samples = self._samples.setdefault(query_name, deque(maxlen=self.window))
+            if status not in ("ok", "timeout"):
+                # failed calls return early and would pull the learned timeout down
+                self._errors[query_name] = self._errors.get(query_name, 0) + 1
+                return None
+            if len(samples) >= self.minSamples:
+                history = np.fromiter(samples, dtype=np.float64)
+                p99 = float(np.percentile(history, 99))
+                recent = float(np.median(history[-RECENT_SAMPLES:]))
+                if seconds > p99:
+                    warning = f"query {query_name} took {seconds:.3f}s, above its p99 of {p99:.3f}s"
+                elif recent > 2 * float(np.median(history)):
+                    warning = f"query {query_name} is trending slow: recent median {recent:.3f}s is over twice its median"
+            # a timed out call is recorded at its timeout, a lower bound of its real latency
+            samples.append(seconds)
+            if status == "timeout":
+                self._timeouts[query_name] = self._timeouts.get(query_name, 0) + 1
+        if warning:
+            logger.warning(warning)
+        return warning
+
+    def defaultTimeout(self, query_name:str) -> int:
+        """Learned default timeout (seconds) for query_name"""
+        with self._lock:
+            samples = self._samples.get(query_name)
+            if samples is None or len(samples) < self.minSamples:
+                return DEFAULT_TIMEOUT
+            p99 = float(np.percentile(np.fromiter(samples, dtype=np.float64), 99))
+        return int(min(max(math.ceil(p99 * self.factor), self.minTimeout), self.maxTimeout))
+
+    def statistics(self, query_name:str="") -> Dict[str, dict]:
+        """Latency percentiles and learned timeout of one (or every) query"""
+        with self._lock:
+            names = [query_name] if query_name else sorted(self._samples.keys())
+            snapshot = {name: np.fromiter(self._samples.get(name, ()), dtype=np.float64) for name in names}
+        results = {}
+        for name, history in snapshot.items():
+            if history.size == 0:
+                continue
+            p50, p90, p99 = (float(value) for value in np.percentile(history, [50, 90, 99]))
+            recent = float(np.median(history[-RECENT_SAMPLES:]))
+            results[name] = {
+                "samples": int(history.size),
+                "p50Seconds": round(p50, 4),
+                "p90Seconds": round(p90, 4),
+                "p99Seconds": round(p99, 4),
+                "maxSeconds": round(float(history.max()), 4),
+                "recentMedianSeconds": round(recent, 4),
+                "trendingSlow": bool(history.size >= self.minSamples and recent > 2 * p50),
+                "errors": self._errors.get(name, 0),
+                "timeouts": self._timeouts.get(name, 0),
+                "learnedTimeout": self.defaultTimeout(name),
+                "learned": bool(history.size >= self.minSamples),
+            }
+        return results
@@ -8,49 +8,81 @@ import os
 import sys
 import csv
 import json
+import time
+import anyio
 import warnings
+import functools
+import threading
 
-from typing import Literal, Optional
+from functools import partial
+from typing import Literal
 from mcp.server.fastmcp import FastMCP
-from mcp_server.config import tigerGraphConstants
+from mcp_server.config import settings, tigerGraphConstants, tigerGraphTuning
 from mcp_server.tigerGraph.services import TigerGraphServices
 from mcp_server.tigerGraph.prettyPrintDir import PrettyPrintDirectory
+from mcp_server.tigerGraph.session_registry import graphTool
 from mcp_server.mcp_logger import setErrorHandler, logger, logging
+from mcp_server.mcp_metrics import metrics, instrumentTool, startMetricsServer
+from mcp_server.mcp_tracing import traceTool
+from mcp_server.mcp_profiler import profileTool, profilingEnabled, runProfiled, withReport
 
 
 # Disable logger
 warnings.filterwarnings('ignore')
 logging.getLogger('mcp.server.lowlevel.server').disabled = True
 OUTPUT_DIR = tigerGraphConstants(output=True)
+#
+# Seconds between background connect attempts of a lazy session (doubling up to the maximum)
+#
+WARMUP_RETRY_SECONDS = 5
+WARMUP_RETRY_MAX_SECONDS = 60
 
 class TigerGraph_MCP_Server():
     
     def __init__(self):
         setErrorHandler()
+        start = time.perf_counter()
         self.title="Custom Discoveries TigerGraph_MCP_Server"
         self.version="V3.1"
         self.mcp = FastMCP("TigerGraph MCP Server")
         self.services = TigerGraphServices()
         self.prettyPrintDir:PrettyPrintDirectory = PrettyPrintDirectory(OUTPUT_DIR)
+        self._adminLock = threading.Lock()
+        self.adminTools = False
         
         # Register tools directly
-        self.mcp.tool()(self.get_schema)
-        self.mcp.tool()(self.run_query)
-        self.mcp.tool()(self.show_query)
-        self.mcp.tool()(self.get_installed_query)
-        self.mcp.tool()(self.define_vertex)
-        self.mcp.tool()(self.update_vertex)
-        self.mcp.tool()(self.alter_vertex)
-        self.mcp.tool()(self.define_edge)
-        self.mcp.tool()(self.update_edge)
-        self.mcp.tool()(self.get_vertex)
-        self.mcp.tool()(self.get_udf)
-        if self.services.hasRole("superuser"):
-            self.mcp.tool()(self.displayService_Status)
-            self.mcp.tool()(self.displayDetailed_Service_Status)
-            self.mcp.tool()(self.displayComponent_Version)
-            self.mcp.tool()(self.displayCPUMemory_Usage)
-            self.mcp.tool()(self.displayDiskSpace_Usage)
+        self.registerGraphTool(self.get_schema)
+        self.registerGraphTool(self.run_query)
+        self.registerGraphTool(self.batch_run_query)
+        self.registerTool(self.fan_out_query)
+        self.registerGraphTool(self.show_query)
+        self.registerGraphTool(self.get_installed_query)
+        self.registerTool(self.metadata_cache_status)
+        self.registerGraphTool(self.define_vertex)
+        self.registerGraphTool(self.update_vertex)
+        self.registerGraphTool(self.alter_vertex)
+        self.registerGraphTool(self.load_vectors)
+        self.registerGraphTool(self.vector_search)
+        self.registerGraphTool(self.define_edge)
+        self.registerGraphTool(self.update_edge)
+        self.registerGraphTool(self.get_vertex)
+        self.registerTool(self.get_udf)
+        self.registerTool(self.create_snapshot)
+        self.registerTool(self.refresh_snapshot)
+        self.registerTool(self.list_snapshots)
+        self.registerTool(self.snapshot_degree)
+        self.registerTool(self.snapshot_bfs)
+        self.registerTool(self.snapshot_pagerank)
+        self.registerTool(self.backup_graph)
+        self.registerTool(self.backup_status)
+        self.registerTool(self.restore_graph)
+        # a lazy session cannot check the role before the server starts: warmUp() registers the
+        # admin tools once the background connect has confirmed the superuser role
+        if not self.services.lazy and self.isSuperuser():
+            self.registerAdminTools()
+        self.metricsServer = startMetricsServer(tigerGraphTuning('metricsPort'))
+        settings.onChange(self.applySettings)
+        settings.startWatcher()
         # Register Prompts directly
         self.mcp.prompt()(self.define_vertex_prompt)
         self.mcp.prompt()(self.update_vertex_prompt)
@@ -60,10 +92,94 @@ class TigerGraph_MCP_Server():
 
             self.mcp.resource(uri="listdir://listOutput")(self.listQueryDir)
             self.mcp.resource(uri="listdir://{query_name}")(self.listQueryOutput)
+            self.mcp.resource(uri="latency://queries")(self.queryLatencyStats)
+            self.mcp.resource(uri="latency://{query_name}")(self.queryLatency)
+            self.mcp.resource(uri="metrics://prometheus", mime_type="text/plain")(self.prometheusMetrics)
+            self.mcp.resource(uri="metrics://summary", mime_type="application/json")(self.metricsSummary)
+            self.mcp.resource(uri="startup://timings", mime_type="application/json")(self.startupTimings)
+            self.mcp.resource(uri="settings://current", mime_type="application/json")(self.currentSettings)
+            self.mcp.resource(uri="token://status", mime_type="application/json")(self.tokenStatus)
+            self.mcp.resource(uri="graphs://sessions", mime_type="application/json")(self.graphSessions)
 
         except Exception as error:
             logger.error(f"Error in initization: {error}")
 
+        self.initSeconds = time.perf_counter() - start
+        logger.info(f"TigerGraph MCP Server initialized in {self.initSeconds:.3f}s"
+                    f"{' (lazy connect)' if self.services.lazy else ''}")
+        if self.services.lazy:
+            threading.Thread(target=self.warmUp, name="tigergraph-connect", daemon=True).start()
+
+    def registerTool(self, tool):
+        """Register an MCP tool, wrapped to record its latency, response size, errors and trace span (and profile it on request)"""
+        self.mcp.tool()(instrumentTool(traceTool(profileTool(tool))))
+
+    def registerGraphTool(self, tool):
+        """Register an MCP tool that also accepts an optional graph argument (default TG_GRAPH)"""
+        self.registerTool(graphTool(tool))
+
+    def registerAdminTools(self):
+        """Register the superuser tools (once) and start the metrics sampler behind the trend tools"""
+        with self._adminLock:
+            if self.adminTools:
+                return
+            self.registerAdminTool(self.displayService_Status)
+            self.registerAdminTool(self.displayDetailed_Service_Status)
+            self.registerAdminTool(self.displayComponent_Version)
+            self.registerAdminTool(self.displayCPUMemory_Usage)
+            self.registerAdminTool(self.displayDiskSpace_Usage)
+            self.registerAdminTool(self.displayRunning_Queries)
+            self.registerAdminTool(self.abortRunning_Query)
+            self.registerAdminTool(self.displayBackend_Health)
+            self.registerAdminTool(self.displayCPUMemory_Trend)
+            self.registerAdminTool(self.displayDiskSpace_Trend)
+            self.registerAdminTool(self.displayDiskGrowth_Forecast)
+            self.adminTools = True
+        self.services.metricsSampler.start()
+
+    def registerAdminTool(self, tool):
+        """Register a superuser tool; the role is checked again whenever the tool is called"""
+        @functools.wraps(tool)
+        def guarded(*args, **kwargs):
+            if not self.isSuperuser():
+                return f"Error: {tool.__name__} requires the TigerGraph superuser role"
+            return tool(*args, **kwargs)
+        self.registerTool(guarded)
+
+    def isSuperuser(self) -> bool:
+        """Whether the database user has the superuser role (see TigerGraph_Session.hasRole)"""
+        return bool(self.services.hasRole("superuser"))
+
+    def warmUp(self, sleep=time.sleep):
+        """
+        Establish a lazy TigerGraph session in the background, so the first tool call does not wait
+        for it, and register the admin tools when the user has the superuser role. A failed connect
+        is retried until the session is up (a tool call may connect it first).
+        """
+        delay = WARMUP_RETRY_SECONDS
+        while True:
+            try:
+                self.services.connect()
+                if self.services.session.connected:
+                    if self.isSuperuser():
+                        self.registerAdminTools()
+                    return
+            except Exception as error:
+                logger.error(f"Error connecting to TigerGraph in the background, retrying in {delay}s: {error}")
+            sleep(delay)
+            delay = min(delay * 2, WARMUP_RETRY_MAX_SECONDS)
+
+    def applySettings(self, changes:dict):
+        """Move the /metrics endpoint, or change the .env check interval, after a reloaded .env file changed them"""
+        if 'settingsReloadInterval' in changes:
+            settings.stopWatcher()
+            settings.startWatcher()
+        if 'metricsPort' in changes:
+            if self.metricsServer is not None:
+                self.metricsServer.shutdown()
+                self.metricsServer.server_close()
+            self.metricsServer = startMetricsServer(tigerGraphTuning('metricsPort'))
+
     def displayService_Status(self):
         """TigerGraph MCP Admin tool: Get TigerGraph Database Status"""
         return self.services.displayServicesStatus()
@@ -84,35 +200,150 @@ class TigerGraph_MCP_Server():
         """TigerGraph MCP Admin tool: Get TigerGraph Disk Space Usage"""
         return self.services.displayDiskSpaceUsage()
 
+    def displayCPUMemory_Trend(self, window_minutes: int = 60, service: str = ""):
+        """TigerGraph MCP Admin tool: Show the CPU and memory usage trend of every TigerGraph service (min, avg, p95,
+           max, last value and a sparkline) over the last window_minutes, from the background metrics samples.
+            Args:
+                window_minutes (int): The time window to summarize, in minutes.
+                service (str): Only show the services whose name contains this text (e.g. GPE, RESTPP).
+        """
+        return self.services.displayCPUMemoryTrend(window_minutes, service)
+
+    def displayDiskSpace_Trend(self, window_minutes: int = 60, path: str = ""):
+        """TigerGraph MCP Admin tool: Show the size and free space trend of every TigerGraph disk path (min, avg, p95,
+           max, last value and a sparkline) over the last window_minutes, from the background metrics samples.
+            Args:
+                window_minutes (int): The time window to summarize, in minutes.
+                path (str): Only show the paths whose name contains this text (e.g. gstore, log).
+        """
+        return self.services.displayDiskSpaceTrend(window_minutes, path)
+
+    def displayDiskGrowth_Forecast(self, window_minutes: int = 1440, path: str = ""):
+        """TigerGraph MCP Admin tool: Forecast when the TigerGraph disks fill up: fits the growth rate of every disk
+           path (MB per hour, % per day) over the last window_minutes of background metrics samples, estimates the
+           time until its free space runs out and flags the paths filling up soon or growing fast.
+            Args:
+                window_minutes (int): The time window to fit, in minutes (24 hours by default).
+                path (str): Only show the paths whose name contains this text (e.g. gstore, log).
+        """
+        return self.services.displayDiskGrowthForecast(window_minutes, path)
+
+    def displayRunning_Queries(self):
+        """TigerGraph MCP Admin tool: List the queries currently running on the graph with their request id, url
+           and elapsed time, plus the MCP tool call (tool, callId, params) that started them when known"""
+        return self.services.displayRunningQueries()
+
+    def displayBackend_Health(self):
+        """TigerGraph MCP Admin tool: Show the circuit breaker state (closed, open, half_open), consecutive
+           failures and retry counts of the RESTPP and GSQL servers"""
+        return self.services.displayBackendHealth()
+
+    def abortRunning_Query(self, request_id: str):
+        """TigerGraph MCP Admin tool: Abort a running query.
+            Args:
+                request_id (str): The TigerGraph request id shown by displayRunning_Queries, or the callId
+                                  (e.g. mcp-12) of a run_query call, or of one batch_run_query row or
+                                  fan_out_query graph, made through this server
+        """
+        return self.services.abortRunningQuery(request_id)
+
     def get_schema(self):
         """TigerGraph MCP tool: Get TigerGraph Schema."""
         return self.services.get_schema()
 
 
-    def run_query(self, query_name: str, params: dict = {}, outputFormat:Literal["Terminal","CSV","JSON"]="Terminal", timeout:int=60):
+    async def run_query(self, query_name: str, params: dict = {}, outputFormat:Literal["Terminal","CSV","JSON"]="Terminal", timeout:int=0,
+                        profile: bool = False):
         """ TigerGraph MCP tool: Run a TigerGraph query with parameters.
             Args:
                 query:
                     The name of the query to run.
                 params:
-                    A dictionary of parameters to pass into query.
+                    A dictionary of parameters to pass into query. Parameters are checked against the installed
+                    query signature (names, types, required vertex parameters) and coerced, e.g. "5" for an INT,
+                    a list for SET / LIST parameters, before the query is sent to TigerGraph.
                 outputFormat:
                     Users can specify the query output format as Terminal, CSV or JSON. If either CSV, or CSV is passed,
                     the query results will be written to a file in the output directory defined in the .env file. By default,
                     the format is 'Terminal', which returns JSON data directly to the caller without writing to a file.
                 timeout: 
-                    Maximum duration for successful query execution, in seconds (default=60 seconds)
+                    Maximum duration for successful query execution, in seconds. By default (0) the timeout is learned
+                    from the query's latency history (p99 x TG_TIMEOUT_FACTOR, see latency://queries); 60 seconds
+                    until enough calls have been recorded. A call above the query's p99, or a query trending slow,
+                    appends a "# Warning:" line to the response.
+                profile:
+                    Run the call under cProfile and tracemalloc and write the report (top functions, top allocation
+                    sites) to profile_run_query_<timestamp>_<n>.txt in the output directory, see listdir://listOutput.
+                If the client cancels the tool call, the query is aborted on the TigerGraph server as well.
                 """
-        return self.services.run_query(query_name, params, outputFormat=outputFormat, timeout=timeout)
+        callId = self.services.queryRegistry.newCallId()
+        work = partial(self.services.run_query, query_name, params, outputFormat=outputFormat, timeout=timeout, call_id=callId)
+        profiled = profilingEnabled("run_query", profile)
+        if profiled:
+            work = partial(runProfiled, "run_query", work)
+        try:
+            # run in a worker thread so the call can be cancelled while TigerGraph is still executing it
+            result = await anyio.to_thread.run_sync(work, abandon_on_cancel=True)
+        except anyio.get_cancelled_exc_class():
+            with anyio.CancelScope(shield=True):
+                logger.info(f"run_query {query_name} cancelled, aborting call {callId}")
+                await anyio.to_thread.run_sync(self.services.abortRunningQuery, callId)
+            raise
+        return withReport(*result, profile) if profiled else result
+
+    def batch_run_query(self, query_name: str, param_list: list[dict] = [], param_file: str = "",
+                        outputFormat: Literal["CSV","JSON"] = "JSON", max_workers: int = 0, timeout: int = 0,
+                        profile: bool = False):
+        """ TigerGraph MCP tool: Run an installed query once per parameter set, concurrently, and merge all outputs
+            into one file (<query_name>_batch.json or .csv) in the output directory. Each row carries its parameters,
+            status (ok / error / timeout / invalid) and duration; a summary with failure and timeout counts is returned.
+            Parameter sets that do not match the installed query signature are rejected locally as 'invalid'.
+            Args:
+                query_name: The name of the installed query to run.
+                param_list: A list of parameter dictionaries, one per query run.
+                param_file: Optional CSV file of parameters (header row = parameter names) in the output directory.
+                outputFormat: CSV or JSON output file.
+                max_workers: Maximum concurrent query requests (0 = TG_QUERY_WORKERS, default 8).
+                timeout: Maximum duration of each query run, in seconds (0 = learned from the query's latency history)
+                profile: Profile the batch and its worker threads (cProfile, tracemalloc) into profile_batch_run_query_<timestamp>_<n>.txt
+        """
+        return self.services.batch_run_query(query_name, param_list, param_file, outputFormat, max_workers, timeout)
+
+    def fan_out_query(self, query_name: str, graphs: list[str], params: dict = {},
+                      outputFormat: Literal["CSV","JSON"] = "JSON", max_workers: int = 0, timeout: int = 0,
+                      profile: bool = False):
+        """ TigerGraph MCP tool: Run the same installed query, with the same parameters, on several graphs concurrently
+            and merge the results into one file (<query_name>_fanout.json or .csv) in the output directory. Every
+            row is one element of a PRINT output, tagged with its graph and output name; a graph that failed is
+            written as one row with its error. A summary with the latency, row count and status of each graph is returned.
+            Args:
+                query_name: The name of the query installed on every graph.
+                graphs: The graphs to run the query on (TG_GRAPH is the server's default graph).
+                params: The query parameters, checked against the installed query signature of each graph.
+                outputFormat: CSV or JSON output file.
+                max_workers: Maximum graphs queried at the same time (0 = TG_QUERY_WORKERS, default 8).
+                timeout: Maximum duration of the query on each graph, in seconds (0 = learned from the latency history)
+                profile: Profile the call and its worker threads (cProfile, tracemalloc) into profile_fan_out_query_<timestamp>_<n>.txt
+        """
+        return self.services.fan_out_query(query_name, graphs, params, outputFormat, max_workers, timeout)
+
+    def show_query(self, query_name: str, refresh: bool = False):
+        """TigerGraph MCP tool: Retrieve the content of a GSQL query.
+           The query text is cached (see metadata_cache_status); pass refresh=True to re-read it from TigerGraph."""
+        return self.services.show_query(query_name, refresh)
 
-    def show_query(self, query_name: str):
-        """TigerGraph MCP tool: Retrieve the content of a GSQL query."""
-        return self.services.show_query(query_name)
 
+    def get_installed_query(self, refresh: bool = False):
+        """TigerGraph MCP tool: List all installed GSQL queries.
+           The list is cached (see metadata_cache_status); pass refresh=True to re-read it from TigerGraph."""
+        return self.services.get_installed_queries(refresh)
 
-    def get_installed_query(self):
-        """TigerGraph MCP tool: List all installed GSQL queries."""
-        return self.services.get_installed_queries()
+
+    def metadata_cache_status(self):
+        """TigerGraph MCP tool: Show the cached query / UDF metadata used by show_query, get_installed_query and
+           get_udf: age in seconds, content hash, when the content last changed, and whether the entry is stale
+           (older than TG_METADATA_TTL) and will be re-read on its next use."""
+        return self.services.metadata_cache_status()
 
 
     def define_vertex(self, vertex_type: str, vertex_id_name: str, attributes: dict):
@@ -134,6 +365,37 @@ class TigerGraph_MCP_Server():
         return self.services.alter_vertex(vertex_type, operator, attributes, vector_attributes)
 
 
+    def load_vectors(self, vertex_type: str, vector_attribute: str, id_file: str, vector_file: str,
+                     batch_size: int = 0, workers: int = 0):
+        """ TigerGraph MCP tool: Bulk load a VECTOR attribute (created with alter_vertex) for many vertices.
+            Args:
+                vertex_type (str): The vertex type holding the vector attribute
+                vector_attribute (str): The name of the VECTOR attribute
+                id_file (str): Vertex ids, one per line (or a 1-D .npy array); relative paths are in the output directory
+                vector_file (str): 2-D .npy matrix, row i is the vector of the i-th id. The column count must match
+                                   the attribute DIMENSION. The file is memory-mapped and streamed in batches.
+                batch_size (int): Vertices per upsert request (0 = TG_VECTOR_BATCH_SIZE, default 500)
+                workers (int): Concurrent upsert requests (0 = TG_VECTOR_WORKERS, default 2)
+        """
+        return self.services.load_vectors(vertex_type, vector_attribute, id_file, vector_file, batch_size, workers)
+
+    def vector_search(self, vertex_type: str, vector_attribute: str, query_vectors: list[list[float]], top_k: int = 10,
+                      rerank: bool = False, candidate_k: int = 0, filters: dict = {}, workers: int = 0):
+        """ TigerGraph MCP tool: Top-k vector similarity search on a VECTOR attribute for a batch of query vectors.
+            The searches run concurrently and the per-query latency is reported.
+            Args:
+                vertex_type (str): The vertex type holding the vector attribute
+                vector_attribute (str): The name of the VECTOR attribute
+                query_vectors (list): One or more query vectors, each with DIMENSION values
+                top_k (int): Number of nearest vertices to return per query
+                rerank (bool): Re-rank the candidates locally with exact distances for the attribute METRIC
+                candidate_k (int): Candidates fetched per query when re-ranking or filtering (default 4 x top_k, at least top_k)
+                filters (dict): {attribute: value} equality filters applied locally to the candidates
+                workers (int): Concurrent searches (0 = TG_VECTOR_WORKERS, default 2)
+        """
+        return self.services.vector_search(vertex_type, vector_attribute, query_vectors, top_k,
+                                           rerank, candidate_k, filters, workers)
+
     def define_edge(self, edge_name: str, from_vertex: str, to_vertex: str, edge_type:Literal["UNDIRECTED", "DIRECTED"],
                     attributes: dict = {}, discriminator: dict = {}):
         """ TigerGraph MCP tool: Define an edge.
@@ -166,10 +428,79 @@ class TigerGraph_MCP_Server():
     #     return client.run_gsql(query)
 
 
-    def get_udf(self, ExprFunctions: bool = True, ExprUtil: bool = True, json_out=False):
-        """TigerGraph MCP tool: Get UDF files."""
-        return self.services.get_udf(ExprFunctions, ExprUtil, json_out)
+    def get_udf(self, ExprFunctions: bool = True, ExprUtil: bool = True, json_out=False, refresh: bool = False):
+        """TigerGraph MCP tool: Get UDF files.
+           The UDF files are cached (see metadata_cache_status); pass refresh=True to re-read them from TigerGraph."""
+        return self.services.get_udf(ExprFunctions, ExprUtil, json_out, refresh)
+
+
+    def create_snapshot(self, snapshot_name: str, vertex_types: list[str], edge_types: list[str],
+                        watermark_attributes: dict[str, str] = {}):
+        """ TigerGraph MCP tool: Materialize vertex & edge types into a local graph snapshot for offline analytics.
+            Args:
+                snapshot_name (str): Name of the snapshot (letters, digits, '_' or '-'), stored under the output directory
+                vertex_types (list): Vertex types to copy, including their numeric attributes
+                edge_types (list): Edge types to copy (end point vertices are added automatically)
+                watermark_attributes (dict): Optional {vertex_type: timestamp_attribute} used by refresh_snapshot to
+                                             fetch only changed vertices. Other types are refreshed from the log of
+                                             update_vertex / update_edge calls made through this server.
+        """
+        return self.services.create_snapshot(snapshot_name, vertex_types, edge_types, watermark_attributes)
+
+    def refresh_snapshot(self, snapshot_name: str):
+        """TigerGraph MCP tool: Incrementally refresh a local graph snapshot with the vertices & edges changed since
+        it was created or last refreshed, reporting delta sizes and refresh time."""
+        return self.services.refresh_snapshot(snapshot_name)
+
+    def list_snapshots(self):
+        """TigerGraph MCP tool: List the local graph snapshots."""
+        return self.services.list_snapshots()
+
+    def snapshot_degree(self, snapshot_name: str, vertex_type: str = "", top_k: int = 10):
+        """TigerGraph MCP tool: Degree statistics and the top_k highest degree vertices of a local snapshot
+        (no database access)."""
+        return self.services.snapshot_degree(snapshot_name, vertex_type, top_k)
+
+    def snapshot_bfs(self, snapshot_name: str, vertex_type: str, vertex_id: str, max_depth: int = 3, limit: int = 100):
+        """ TigerGraph MCP tool: Breadth first search from a vertex over a local snapshot (no database access).
+            Args:
+                max_depth (int): Maximum number of hops, -1 for unlimited
+                limit (int): Maximum number of reached vertices to return
+        """
+        return self.services.snapshot_bfs(snapshot_name, vertex_type, vertex_id, max_depth, limit)
 
+    def snapshot_pagerank(self, snapshot_name: str, vertex_type: str = "", top_k: int = 10,
+                          damping: float = 0.85, max_iter: int = 100):
+        """TigerGraph MCP tool: PageRank over a local snapshot (no database access), returns the top_k vertices."""
+        return self.services.snapshot_pagerank(snapshot_name, vertex_type, top_k, damping, max_iter)
+
+    def backup_graph(self, backup_name: str, workers: int = 0, page_size: int = 0, shard_rows: int = 0):
+        """ TigerGraph MCP tool: Back up every vertex and edge type of the graph into compressed NDJSON shards
+            (plus a schema manifest) under the backups folder of the output directory. Types are exported in
+            parallel, one type per worker. Re-running with the same backup_name resumes after the last completed shard.
+            Args:
+                backup_name (str): Name of the backup folder (letters, digits, '_' or '-')
+                workers (int): Number of parallel workers (0 = TG_BACKUP_WORKERS, default 4)
+                page_size (int): Vertices read per request (0 = TG_BACKUP_PAGE_SIZE, default 10000)
+                shard_rows (int): Rows per shard file (0 = TG_BACKUP_SHARD_ROWS, default 100000)
+        """
+        return self.services.backup_graph(backup_name, workers, page_size, shard_rows)
+
+    def backup_status(self, backup_name: str = ""):
+        """TigerGraph MCP tool: Show the progress of a backup, or list all backups when no name is given."""
+        return self.services.backup_status(backup_name)
+
+    def restore_graph(self, backup_name: str, workers: int = 0, batch_size: int = 0, create_schema: bool = True):
+        """ TigerGraph MCP tool: Restore a backup created by backup_graph into the current graph. The schema manifest is
+            replayed in one SCHEMA_CHANGE job (types that already exist are skipped), then vertex shards are loaded
+            before edge shards with batched upserts. A failed restore resumes from the last committed batch when re-run.
+            Args:
+                backup_name (str): Name of the backup folder
+                workers (int): Number of parallel workers (0 = TG_RESTORE_WORKERS, default 4)
+                batch_size (int): Rows per upsert request (0 = TG_RESTORE_BATCH_SIZE, default 1000)
+                create_schema (bool): Create missing vertex / edge types from the backup schema
+        """
+        return self.services.restore_graph(backup_name, workers, batch_size, create_schema)
 
     def define_vertex_prompt(self) -> str:
         """ TigerGraph MCP prompt: This prompt is designed to be used with a Desktop Agent, like Anthropic Claude.
@@ -257,11 +588,77 @@ class TigerGraph_MCP_Server():
                         data.append(row)                
             
                 return json.dumps(data,indent=4, separators=(',',':'))
+
+            elif query_name.endswith(".txt"):
+                with open(query_output_file, 'r', encoding='utf-8') as file:
+                    return file.read()
             
         except Exception as error:
             return f"# Error {error} reading query data for {query_name}\n"
 
 
+    def queryLatencyStats(self) -> str:
+        """
+        Latency percentiles (p50 / p90 / p99), error and timeout counts and the learned default
+        timeout of every installed query run through this server.
+        """
+        return self.services.query_latency_stats()
+
+    def queryLatency(self, query_name) -> str:
+        """
+        Latency percentiles and learned default timeout of one installed query.
+        Args:
+            query_name: Name of the installed query
+        """
+        return self.services.query_latency_stats(query_name)
+
+
+    def prometheusMetrics(self) -> str:
+        """
+        Tool and TigerGraph backend (RESTPP / GSQL) latency, payload size, error and cache
+        metrics in Prometheus text format (also served on TG_METRICS_PORT when it is set).
+        """
+        return metrics.prometheusText()
+
+    def metricsSummary(self) -> str:
+        """
+        Tool and TigerGraph backend metrics as JSON: counters and latency / size percentiles.
+        """
+        return json.dumps(metrics.snapshot(), indent=4, separators=(',', ':'))
+
+
+    def startupTimings(self) -> str:
+        """
+        Startup timing breakdown: server initialization, TigerGraph session validation steps (ping, graph,
+        secrets, version and role probes) and which probe results came from the startup cache.
+        """
+        return json.dumps({"serverInitSeconds": round(self.initSeconds, 4), **self.services.startup_status()},
+                          indent=4, separators=(',', ':'))
+
+
+    def currentSettings(self) -> str:
+        """
+        The TigerGraph MCP settings in effect (password, secret and token hidden); the .env file is
+        reloaded when it changes (TG_SETTINGS_RELOAD_INTERVAL).
+        """
+        return json.dumps(settings.asDict(), indent=4, separators=(',', ':'))
+
+
+    def tokenStatus(self) -> str:
+        """
+        TigerGraph API token state: expiry, next background refresh, refresh count and last error.
+        """
+        return json.dumps(self.services.token_status(), indent=4, separators=(',', ':'))
+
+
+    def graphSessions(self) -> str:
+        """
+        Graphs served by this server: the default graph (TG_GRAPH) and the further graphs named by tool calls
+        that have an open connection, with their call counts and idle time.
+        """
+        return json.dumps(self.services.graph_sessions(), indent=4, separators=(',', ':'))
+
+
     def run_server(self):
         """Run server"""
 
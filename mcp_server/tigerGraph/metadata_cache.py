@@ -0,0 +1,160 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+#
+# metadata_cache.py: This modelue defines the MetadataCache class that keeps
+# installed query, query text and UDF metadata in memory with a TTL and a
+# content hash, so agents asking for the same context repeatedly are answered
+# without a database round trip
+#******************************************************************************
+import json
+import time
+import hashlib
+import threading
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from mcp_server.config import tigerGraphTuning
+from mcp_server.tigerGraph.session import TigerGraph_Session
+from mcp_server.mcp_logger import setErrorHandler, logger
+from mcp_server.mcp_metrics import metrics
+
+INSTALLED_QUERIES = "installedQueries"
+SHOW_QUERY = "showQuery"
+UDF = "udf"
+
+
+class CacheEntry():
+
+    def __init__(self, value:Any, digest:str):
+        self.value = value
+        self.digest = digest
+        self.fetched = time.time()
+        self.changed = self.fetched
+        self.hits = 0
+        self.refreshes = 0
+
+
+class MetadataCache():
+    """
+    Caches get_installed_queries, show_query and get_udf results. An entry is served from memory
+    until its TTL expires; it is then re-read and its content hash compared, so "changed" reports
+    when the metadata last differed. Entries are invalidated by the server's own schema and
+    install tools, and a background check re-reads the (cheap) installed query list to drop
+    cached query text when queries were changed by someone else. Entries are kept per graph
+    (the graph of the tool call, see TigerGraph_Session.currentGraphName()).
+    """
+    def __init__(self, session:TigerGraph_Session, ttl:int=-1):
+        setErrorHandler()
+        self.session = session
+        self.ttl = ttl if ttl >= 0 else tigerGraphTuning('metadataTTL')
+        self.generation = 0
+        self._entries:Dict[Tuple[str, str, str], CacheEntry] = {}
+        self._lock = threading.Lock()
+        self._stopWatcher = threading.Event()
+        self._watcher:Optional[threading.Thread] = None
+
+    @staticmethod
+    def contentHash(value:Any) -> str:
+        text = value if isinstance(value, str) else json.dumps(value, sort_keys=True, default=str)
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def lookup(self, kind:str, key:str, loader:Callable[[], Any], refresh:bool=False) -> Tuple[Any, str]:
+        """Return (value, content hash) for kind/key, calling loader when missing or expired"""
+        entryKey = (self.session.currentGraphName(), kind, key)
+        with self._lock:
+            entry = self._entries.get(entryKey)
+            if entry is not None and not refresh and (time.time() - entry.fetched) < self.ttl:
+                entry.hits += 1
+                metrics.inc("mcp_cache_requests_total", {"cache": kind, "result": "hit"},
+                            help="Metadata cache lookups by cache kind and result")
+                return (entry.value, entry.digest)
+        metrics.inc("mcp_cache_requests_total", {"cache": kind, "result": "miss"},
+                    help="Metadata cache lookups by cache kind and result")
+        value = loader()
+        digest = self.contentHash(value)
+        with self._lock:
+            current = self._entries.get(entryKey)
+            if current is not None and current.digest == digest:
+                current.fetched = time.time()
+                current.refreshes += 1
+                return (current.value, current.digest)
+            entry = CacheEntry(value, digest)
+            if current is not None:
+                entry.refreshes = current.refreshes + 1
+                self.generation += 1
+            self._entries[entryKey] = entry
+        return (value, digest)
+
+    def installedQueries(self, refresh:bool=False) -> Tuple[Any, str]:
+        return self.lookup(INSTALLED_QUERIES, "", lambda: self.session.getConnection().getInstalledQueries(), refresh)
+
+    def showQuery(self, query_name:str, refresh:bool=False) -> Tuple[Any, str]:
+        return self.lookup(SHOW_QUERY, query_name, lambda: self.session.getConnection().showQuery(query_name), refresh)
+
+    def getUDF(self, ExprFunctions:bool=True, ExprUtil:bool=True, json_out:bool=False, refresh:bool=False) -> Tuple[Any, str]:
+        return self.lookup(UDF, f"{ExprFunctions}/{ExprUtil}/{json_out}",
+                           lambda: self.session.getConnection().getUDF(ExprFunctions, ExprUtil, json_out), refresh)
+
+    def invalidate(self, kind:str="", key:str="", graph:str=""):
+        """Drop all entries, all entries of one kind, or a single entry (of every graph, or of one graph)"""
+        with self._lock:
+            for entryKey in list(self._entries.keys()):
+                if (not graph or entryKey[0] == graph) and (not kind or entryKey[1] == kind) and \
+                   (not key or entryKey[2] == key):
+                    del self._entries[entryKey]
+            self.generation += 1
+
+    def checkForChanges(self) -> bool:
+        """Re-read the installed query list, dropping cached query text when it changed"""
+        graph = self.session.currentGraphName()
+        with self._lock:
+            entry = self._entries.get((graph, INSTALLED_QUERIES, ""))
+            previous = entry.digest if entry is not None else None
+        _, digest = self.installedQueries(refresh=True)
+        if previous is not None and digest != previous:
+            logger.info("Installed queries changed, invalidating cached query metadata")
+            self.invalidate(SHOW_QUERY, graph=graph)
+            return True
+        return False
+
+    def startWatcher(self, interval:float=-1):
+        """Run checkForChanges() every interval seconds on a daemon thread (0 = disabled)"""
+        interval = interval if interval >= 0 else tigerGraphTuning('metadataCheckInterval')
+        if interval <= 0 or self._watcher is not None:
+            return
+
+        # each watcher waits on its own event: a watcher stopped while checking exits when it
+        # returns instead of waiting on the event of the watcher that replaced it
+        def watch(stopped:threading.Event):
+            while not stopped.wait(interval):
+                try:
+                    self.checkForChanges()
+                except Exception as error:
+                    logger.error(f"Error checking metadata for changes: {error}")
+
+        self._stopWatcher = threading.Event()
+        self._watcher = threading.Thread(target=watch, args=(self._stopWatcher,), name="metadata-cache-watcher",
+                                         daemon=True)
+        self._watcher.start()
+
+    def stopWatcher(self):
+        self._stopWatcher.set()
+        self._watcher = None
+
+    def reconfigure(self):
+        """Apply new TG_METADATA_TTL / TG_METADATA_CHECK_INTERVAL settings, restarting the watcher"""
+        self.ttl = tigerGraphTuning('metadataTTL')
+        if self._watcher is not None:
+            self.stopWatcher()
+        self.startWatcher()
+
+    def status(self) -> List[dict]:
+        """Age, TTL, content hash and hit counts of every cached entry"""
+        now = time.time()
+        with self._lock:
+            return [{"graph": graph, "kind": kind, "key": key, "hash": entry.digest[:12],
+                     "ageSeconds": round(now - entry.fetched, 1),
+                     "changedSecondsAgo": round(now - entry.changed, 1),
+                     "stale": (now - entry.fetched) >= self.ttl,
+                     "hits": entry.hits, "refreshes": entry.refreshes}
+                    for (graph, kind, key), entry in sorted(self._entries.items())]
@@ -0,0 +1,328 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+#
+# metrics_sampler.py: This modelue defines the MetricsSampler class that polls
+# the TigerGraph system metrics (CPU, memory, disk space) in the background
+# into fixed-size array-backed ring buffers, summarizes their trends and
+# forecasts when the disks fill up
+#******************************************************************************
+import time
+import threading
+import numpy as np
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from mcp_server.config import tigerGraphTuning
+from mcp_server.mcp_logger import setErrorHandler, logger
+
+if TYPE_CHECKING:
+    from mcp_server.tigerGraph.session import TigerGraph_Session
+
+CPU_MEMORY = "cpu-memory"
+DISKSPACE = "diskspace"
+SPARK_CHARACTERS = "▁▂▃▄▅▆▇█"
+SPARK_WIDTH = 40
+
+#
+# Series key: (kind, component, metric), e.g. ("cpu-memory", "GPE_1#1", "cpu") or ("diskspace", "gstore", "sizeMB")
+#
+SeriesKey = Tuple[str, str, str]
+
+
+class RingBuffer():
+    """
+    The last capacity (time, value) samples of one series in two preallocated float64 arrays;
+    appending overwrites the oldest sample once the buffer is full.
+    """
+    def __init__(self, capacity:int):
+        self.capacity = max(1, capacity)
+        self.times = np.zeros(self.capacity, dtype=np.float64)
+        self.values = np.zeros(self.capacity, dtype=np.float64)
+        self.next = 0
+        self.count = 0
+
+    def append(self, timestamp:float, value:float):
+        self.times[self.next] = timestamp
+        self.values[self.next] = value
+        self.next = (self.next + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def ordered(self) -> Tuple[np.ndarray, np.ndarray]:
+        """All samples, oldest first (copies)"""
+        start = (self.next - self.count) % self.capacity
+        index = (start + np.arange(self.count)) % self.capacity
+        return self.times[index], self.values[index]
+
+    def window(self, since:float=0.0) -> Tuple[np.ndarray, np.ndarray]:
+        """The samples taken at or after since, oldest first"""
+        times, values = self.ordered()
+        first = int(np.searchsorted(times, since, side="left"))
+        return times[first:], values[first:]
+
+    def resized(self, capacity:int) -> 'RingBuffer':
+        """A buffer of the new capacity holding the most recent samples of this one"""
+        buffer = RingBuffer(capacity)
+        times, values = self.ordered()
+        for timestamp, value in zip(times[-buffer.capacity:], values[-buffer.capacity:]):
+            buffer.append(timestamp, value)
+        return buffer
+
+
+def sparkline(values:np.ndarray, width:int=SPARK_WIDTH) -> str:
+    """values averaged into at most width buckets, drawn with block characters scaled min..max"""
+    if len(values) == 0:
+        return ""
+    buckets = np.array([bucket.mean() for bucket in np.array_split(values, min(width, len(values)))])
+    low, high = buckets.min(), buckets.max()
+    if high - low <= 0:
+        return SPARK_CHARACTERS[0] * len(buckets)
+    levels = np.round((buckets - low) / (high - low) * (len(SPARK_CHARACTERS) - 1)).astype(int)
+    return "".join(SPARK_CHARACTERS[level] for level in levels)
+
+
+def fitSlopes(series:Dict[str, Tuple[np.ndarray, np.ndarray]]) -> Dict[str, Tuple[float, float]]:
+    """
+    Least-squares slope (value per hour) and r² of every series at once: the samples of all
+    series are concatenated and reduced per series with np.bincount, so no Python loop runs
+    over the samples. Series with fewer than two distinct sample times get a slope of 0.
+    """
+    names = list(series)
+    if not names:
+        return {}
+    counts = np.array([len(series[name][0]) for name in names], dtype=np.float64)
+    ids = np.repeat(np.arange(len(names)), counts.astype(int))
+    times = np.concatenate([series[name][0] for name in names]) / 3600.0
+    values = np.concatenate([series[name][1] for name in names])
+    safeCounts = np.maximum(counts, 1)
+    times = times - (np.bincount(ids, times, len(names)) / safeCounts)[ids]
+    values = values - (np.bincount(ids, values, len(names)) / safeCounts)[ids]
+    sxx = np.bincount(ids, times * times, len(names))
+    sxy = np.bincount(ids, times * values, len(names))
+    syy = np.bincount(ids, values * values, len(names))
+    fitted = sxx > 0
+    slopes = np.divide(sxy, sxx, out=np.zeros(len(names)), where=fitted)
+    r2 = np.divide(sxy * sxy, sxx * syy, out=np.zeros(len(names)), where=fitted & (syy > 0))
+    return {name: (float(slopes[index]), float(r2[index])) for index, name in enumerate(names)}
+
+
+def formatHours(hours:Optional[float]) -> str:
+    if hours is None:
+        return "never"
+    if hours >= 48:
+        return f"{hours / 24:,.1f} days"
+    return f"{hours:,.1f} hours"
+
+
+def serviceName(metric:dict) -> str:
+    """ServiceName, with partition / replica and host when reported (GPE_1#1@m1)"""
+    descriptor = metric.get('ServiceDescriptor') or {}
+    name = str(descriptor.get('ServiceName', 'unknown'))
+    if descriptor.get('Partition') is not None:
+        name += f"_{descriptor.get('Partition')}#{descriptor.get('Replica', 1)}"
+    if metric.get('HostID'):
+        name += f"@{metric.get('HostID')}"
+    return name
+
+
+def diskName(metric:dict) -> str:
+    disk = metric.get('Disk') or {}
+    name = str(disk.get('PathName') or disk.get('Path') or 'unknown')
+    if metric.get('HostID'):
+        name += f"@{metric.get('HostID')}"
+    return name
+
+
+class MetricsSampler():
+    """
+    Polls getSystemMetrics(latest=1) for cpu-memory and diskspace every TG_METRICS_SAMPLE_INTERVAL
+    seconds (0 = off) on a daemon thread and keeps the last TG_METRICS_HISTORY samples of every
+    service / path metric in a RingBuffer: cpu (%) and memoryMB per service, sizeMB and freeMB
+    per disk path. summarize() reduces a time window of each series with numpy.
+    """
+    def __init__(self, session:'TigerGraph_Session', interval:Optional[float]=None, capacity:Optional[int]=None):
+        setErrorHandler()
+        self.session = session
+        self.interval = tigerGraphTuning('metricsSampleInterval') if interval is None else interval
+        self.capacity = tigerGraphTuning('metricsHistory') if capacity is None else capacity
+        self.series:Dict[SeriesKey, RingBuffer] = {}
+        self.samples = 0
+        self.errors = 0
+        self.lastSample:Optional[float] = None
+        self.lastError:Optional[str] = None
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread:Optional[threading.Thread] = None
+
+    def record(self, kind:str, component:str, metric:str, timestamp:float, value):
+        if value is None:
+            return
+        with self._lock:
+            buffer = self.series.get((kind, component, metric))
+            if buffer is None:
+                buffer = self.series[(kind, component, metric)] = RingBuffer(self.capacity)
+            buffer.append(timestamp, float(value))
+
+    def sample(self, timestamp:Optional[float]=None) -> bool:
+        """Take one sample of every cpu-memory and diskspace metric, False when the server could not be read"""
+        timestamp = time.time() if timestamp is None else timestamp
+        try:
+            connection = self.session.getConnection()
+            results = connection.getSystemMetrics(latest=1, what=CPU_MEMORY) or {}
+            for metric in results.get('CPUMemoryMetrics') or []:
+                service = serviceName(metric)
+                self.record(CPU_MEMORY, service, "cpu", timestamp, (metric.get('CPU') or {}).get('CPUUsage') or 0)
+                self.record(CPU_MEMORY, service, "memoryMB", timestamp, (metric.get('Memory') or {}).get('MemoryUsageMB'))
+            results = connection.getSystemMetrics(latest=1, what=DISKSPACE) or {}
+            for metric in results.get('DiskMetrics') or []:
+                path = diskName(metric)
+                disk = metric.get('Disk') or {}
+                self.record(DISKSPACE, path, "sizeMB", timestamp, disk.get('SizeMB'))
+                self.record(DISKSPACE, path, "freeMB", timestamp, disk.get('FreeSizeMB'))
+            self.samples += 1
+            self.lastSample = timestamp
+            return True
+        except Exception as error:
+            self.errors += 1
+            self.lastError = str(error)
+            logger.error(f"Error sampling TigerGraph system metrics: {error}")
+            return False
+
+    def start(self):
+        """Start sampling (for a user allowed to read the system metrics); TG_METRICS_SAMPLE_INTERVAL=0 keeps it off"""
+        self.enabled = True
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self._stopped,), name="tigergraph-metrics-sampler",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread = None
+
+    def _run(self, stopped:threading.Event):
+        while not stopped.is_set():
+            self.sample()
+            stopped.wait(max(1.0, self.interval))
+
+    def reconfigure(self):
+        """Apply new TG_METRICS_SAMPLE_INTERVAL / TG_METRICS_HISTORY settings, keeping the recent samples"""
+        self.interval = tigerGraphTuning('metricsSampleInterval')
+        capacity = tigerGraphTuning('metricsHistory')
+        with self._lock:
+            if capacity != self.capacity:
+                self.capacity = capacity
+                self.series = {key: buffer.resized(capacity) for key, buffer in self.series.items()}
+        if self.interval <= 0:
+            self.stop()
+        elif self.enabled:
+            self.start()
+
+    def history(self, kind:str, metric:str, component:str="", since:float=0.0) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """{component: (times, values)} of one metric since a time, components containing component only"""
+        with self._lock:
+            return {key[1]: buffer.window(since) for key, buffer in sorted(self.series.items())
+                    if key[0] == kind and key[2] == metric and component.lower() in key[1].lower()}
+
+    def summarize(self, kind:str, metric:str, window:float, component:str="") -> List[dict]:
+        """min / max / avg / p50 / p95 / p99 / last and a sparkline of every matching series over the last window seconds"""
+        summaries = []
+        for name, (times, values) in self.history(kind, metric, component, time.time() - window).items():
+            if len(values) == 0:
+                continue
+            p50, p95, p99 = np.percentile(values, (50, 95, 99))
+            summaries.append({"component": name, "samples": int(len(values)), "min": float(values.min()),
+                              "max": float(values.max()), "avg": float(values.mean()), "p50": float(p50),
+                              "p95": float(p95), "p99": float(p99), "last": float(values[-1]),
+                              "spanSeconds": float(times[-1] - times[0]), "sparkline": sparkline(values)})
+        return summaries
+
+    def displayTrend(self, title:str, kind:str, metrics:List[Tuple[str, str]], window_minutes:int=60,
+                     component:str="") -> List[str]:
+        """Report lines: one row per component and metric (label, metric name) with its window statistics"""
+        status:List[str] = [f"\n{title} (last {window_minutes} minutes, sampled every {self.interval:g}s)\n"]
+        if self.samples == 0:
+            status.append("No samples yet: set TG_METRICS_SAMPLE_INTERVAL above 0 and wait for the first sample"
+                          + (f" (last error: {self.lastError})" if self.lastError else ""))
+            return status
+        status.append(f"{'Component':22s} {'Metric':9s} {'Min':>11s} {'Avg':>11s} {'p95':>11s} {'Max':>11s} "
+                      f"{'Last':>11s}  Trend")
+        status.append("-" * (22 + 10 + 5 * 12 + 2 + SPARK_WIDTH))
+        rows = []
+        for label, metric in metrics:
+            for summary in self.summarize(kind, metric, window_minutes * 60, component):
+                rows.append((summary["component"], label, summary))
+        for name, label, summary in sorted(rows, key=lambda row: (row[0], row[1])):
+            status.append(f"{name:22s} {label:9s} {summary['min']:11,.2f} {summary['avg']:11,.2f} "
+                          f"{summary['p95']:11,.2f} {summary['max']:11,.2f} {summary['last']:11,.2f}  {summary['sparkline']}")
+        if not rows:
+            status.append(f"No samples in the last {window_minutes} minutes" + (f" for '{component}'" if component else ""))
+        return status
+
+    def forecastDisks(self, window_minutes:int=1440, path:str="") -> List[dict]:
+        """
+        Growth rate of every disk path over the last window_minutes (slope of sizeMB), the rate its
+        free space shrinks (slope of freeMB) and the hours until that free space reaches 0 at this rate
+        """
+        since = time.time() - window_minutes * 60
+        sizes = {name: sample for name, sample in self.history(DISKSPACE, "sizeMB", path, since).items() if len(sample[0])}
+        frees = {name: sample for name, sample in self.history(DISKSPACE, "freeMB", path, since).items() if len(sample[0])}
+        sizeSlopes = fitSlopes(sizes)
+        freeSlopes = fitSlopes(frees)
+        fullHours = tigerGraphTuning('diskFullAlertHours')
+        growthPercent = tigerGraphTuning('diskGrowthAlertPercent')
+        forecasts = []
+        for name in sorted(set(sizes) | set(frees)):
+            growth, fit = sizeSlopes.get(name, (0.0, 0.0))
+            shrink = -freeSlopes.get(name, (0.0, 0.0))[0]
+            size = float(sizes[name][1][-1]) if name in sizes else None
+            free = float(frees[name][1][-1]) if name in frees else None
+            times = sizes[name][0] if name in sizes else frees[name][0]
+            hoursToFull = free / shrink if free is not None and shrink > 0 else None
+            percentPerDay = growth * 24 / size * 100 if size else 0.0
+            alerts = []
+            if hoursToFull is not None and hoursToFull <= fullHours:
+                alerts.append("full soon")
+            if percentPerDay >= growthPercent:
+                alerts.append("fast growth")
+            forecasts.append({"path": name, "samples": int(len(times)), "spanHours": float(times[-1] - times[0]) / 3600,
+                              "sizeMB": size, "freeMB": free, "growthMBPerHour": growth, "growthPercentPerDay": percentPerDay,
+                              "fit": fit, "freeShrinkMBPerHour": shrink, "hoursToFull": hoursToFull, "alerts": alerts})
+        return forecasts
+
+    def displayDiskForecast(self, window_minutes:int=1440, path:str="") -> List[str]:
+        """Report lines: growth rate, time to full and alerts of every disk path, flagged paths first"""
+        status:List[str] = [f"\nDisk Growth Forecast (last {window_minutes} minutes, sampled every {self.interval:g}s)\n"]
+        if self.samples == 0:
+            status.append("No samples yet: set TG_METRICS_SAMPLE_INTERVAL above 0 and wait for the first sample"
+                          + (f" (last error: {self.lastError})" if self.lastError else ""))
+            return status
+        forecasts = self.forecastDisks(window_minutes, path)
+        if not forecasts:
+            status.append(f"No samples in the last {window_minutes} minutes" + (f" for '{path}'" if path else ""))
+            return status
+        status.append(f"{'Path':22s} {'Size MB':>11s} {'Free MB':>13s} {'MB/hour':>10s} {'%/day':>7s} {'Fit r²':>6s} "
+                      f"{'Time to full':>14s}  Alerts")
+        status.append("-" * 100)
+        for forecast in sorted(forecasts, key=lambda forecast: (not forecast["alerts"], forecast["path"])):
+            size = "" if forecast["sizeMB"] is None else f"{forecast['sizeMB']:,.2f}"
+            free = "" if forecast["freeMB"] is None else f"{forecast['freeMB']:,.2f}"
+            hours = formatHours(forecast["hoursToFull"])
+            if forecast["samples"] < 2:
+                hours = "need 2 samples"
+            status.append(f"{forecast['path']:22s} {size:>11s} {free:>13s} {forecast['growthMBPerHour']:10,.2f} "
+                          f"{forecast['growthPercentPerDay']:7,.2f} {forecast['fit']:6.2f} {hours:>14s}  "
+                          f"{', '.join(forecast['alerts'])}")
+        flagged = sum(1 for forecast in forecasts if forecast["alerts"])
+        status.append(f"\n{flagged} of {len(forecasts)} paths flagged (full within {tigerGraphTuning('diskFullAlertHours')} hours "
+                      f"or growing {tigerGraphTuning('diskGrowthAlertPercent')}% per day or more)")
+        return status
+
+    def status(self) -> dict:
+        with self._lock:
+            series = len(self.series)
+        return {"running": self._thread is not None, "intervalSeconds": self.interval, "capacity": self.capacity,
+                "series": series, "samples": self.samples, "errors": self.errors,
+                "lastSample": time.ctime(self.lastSample) if self.lastSample else None, "lastError": self.lastError}
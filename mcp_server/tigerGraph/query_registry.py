@@ -0,0 +1,139 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+#
+# query_registry.py: This modelue defines the RunningQueryRegistry class that
+# keeps track of the installed query calls in flight from MCP tools, and
+# runs queries detached so each call knows its TigerGraph request id
+#******************************************************************************
+import re
+import time
+import itertools
+import threading
+
+from typing import Callable, Dict, List, Optional
+
+#
+# Detached queries are polled right away, then every 10 ms growing by half up to 250 ms, so a call
+# finishes at most half its runtime (and never more than 250 ms) after TigerGraph completed it
+#
+POLL_INITIAL_SECONDS = 0.01
+POLL_GROWTH = 1.5
+POLL_MAX_SECONDS = 0.25
+#
+# How long past its GSQL-TIMEOUT a detached query may still report 'running' before it is aborted
+#
+DEADLINE_GRACE_SECONDS = 30
+CALL_ID = re.compile(r"^mcp-\d+$")
+
+
+class DetachedQueryError(Exception):
+    """A detached query that ended with a status other than success (aborted, timeout, error)"""
+
+
+class QueryCall():
+    """One installed query call made on behalf of an MCP tool"""
+
+    def __init__(self, callId:str, tool:str, queryName:str, params:dict):
+        self.callId = callId
+        self.tool = tool
+        self.queryName = queryName
+        self.params = params
+        self.started = time.time()
+        self.requestId:Optional[str] = None
+        self.cancelled = False
+
+    def elapsedSeconds(self) -> float:
+        return time.time() - self.started
+
+    def asDict(self) -> dict:
+        return {"callId": self.callId, "tool": self.tool, "query": self.queryName, "params": self.params,
+                "elapsedSeconds": round(self.elapsedSeconds(), 3), "requestId": self.requestId}
+
+
+class RunningQueryRegistry():
+    """
+    RESTPP does not let a client choose the request id of a query, so each call is tagged locally
+    (callId). Calls run with runDetached() learn the request id TigerGraph assigned to them; only
+    that exact id is ever aborted or shown for the call.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counter = itertools.count(1)
+        self._calls:Dict[str, QueryCall] = {}
+
+    def newCallId(self) -> str:
+        return f"mcp-{next(self._counter)}"
+
+    @staticmethod
+    def isCallId(identifier:str) -> bool:
+        """Whether identifier is a local callId (mcp-N) rather than a TigerGraph request id"""
+        return bool(CALL_ID.match(identifier or ""))
+
+    def start(self, tool:str, queryName:str, params:dict, callId:str="") -> QueryCall:
+        call = QueryCall(callId or self.newCallId(), tool, queryName, params)
+        with self._lock:
+            self._calls[call.callId] = call
+        return call
+
+    def finish(self, callId:str):
+        with self._lock:
+            self._calls.pop(callId, None)
+
+    def get(self, callId:str) -> Optional[QueryCall]:
+        with self._lock:
+            return self._calls.get(callId)
+
+    def calls(self) -> List[QueryCall]:
+        with self._lock:
+            return sorted(self._calls.values(), key=lambda call: call.started)
+
+    def match(self, running:List[dict]) -> Dict[str, QueryCall]:
+        """
+        Map server request ids (showprocesslist results) to the local calls that were given exactly
+        that request id. Requests of other clients, and calls without a request id, are not matched.
+        """
+        byRequest = {call.requestId: call for call in self.calls() if call.requestId}
+        return {request.get("requestid"): byRequest[request.get("requestid")] for request in running
+                if request.get("requestid") in byRequest}
+
+
+def queryStatus(connection, requestId:str) -> Optional[dict]:
+    """The query_status entry of requestId, None while TigerGraph does not report it"""
+    statuses = connection.checkQueryStatus(requestId) or []
+    if isinstance(statuses, dict):
+        statuses = [statuses]
+    for status in statuses:
+        if isinstance(status, dict) and status.get("requestid", requestId) == requestId:
+            return status
+    return None
+
+
+def runDetached(connection, call:QueryCall, timeout:int, sleep:Callable[[float], None]=time.sleep):
+    """
+    Run the installed query of call in detached mode (GSQL-ASYNC): the request id TigerGraph
+    returns is stored on the call before polling query_status on a short, growing interval, and the
+    printed results are fetched once the request succeeded. timeout is in seconds.
+    """
+    requestId = connection.runInstalledQuery(call.queryName, call.params, timeout=(timeout*1000), runAsync=True)
+    if not requestId:
+        raise DetachedQueryError(f"TigerGraph returned no request id for query {call.queryName}")
+    call.requestId = str(requestId)
+    if call.cancelled:
+        # aborted before TigerGraph had assigned the request id
+        connection.abortQuery(call.requestId)
+    deadline = time.monotonic() + timeout + DEADLINE_GRACE_SECONDS
+    interval = POLL_INITIAL_SECONDS
+    while True:
+        status = queryStatus(connection, call.requestId)
+        state = str((status or {}).get("status", "running")).lower()
+        if state == "success":
+            return connection.getQueryResult(call.requestId)
+        if state != "running":
+            raise DetachedQueryError(f"Query {call.queryName} (request {call.requestId}) ended with status {state}"
+                                     + (f": {status.get('message')}" if status.get("message") else ""))
+        if time.monotonic() >= deadline:
+            connection.abortQuery(call.requestId)
+            raise DetachedQueryError(f"Query {call.queryName} (request {call.requestId}) timed out after {timeout}s")
+        sleep(interval)
+        interval = min(POLL_MAX_SECONDS, interval * POLL_GROWTH)
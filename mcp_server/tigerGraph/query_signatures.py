@@ -0,0 +1,302 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+#
+# query_signatures.py: This modelue defines the QuerySignatureCache class for
+# parsing installed query signatures and validating / coercing query
+# parameters locally before they are sent to TigerGraph
+#******************************************************************************
+import re
+import difflib
+import datetime
+import threading
+
+from typing import Dict, List, Optional, Set, Tuple
+from mcp_server.tigerGraph.session import TigerGraph_Session
+from mcp_server.tigerGraph.metadata_cache import MetadataCache, INSTALLED_QUERIES, SHOW_QUERY
+from mcp_server.mcp_logger import setErrorHandler, logger
+
+COLLECTION_TYPES = ("SET", "LIST", "BAG")
+INTEGER_TYPES = ("INT", "UINT", "INT64", "UINT64")
+FLOAT_TYPES = ("FLOAT", "DOUBLE")
+DATETIME_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%Y-%m-%dT%H:%M:%S")
+
+
+class QueryParameterError(ValueError):
+    """Raised when query parameters do not match the installed query signature"""
+
+
+class QueryParameter():
+    """One formal parameter of a GSQL query, e.g. SET<VERTEX<Person>> people"""
+
+    def __init__(self, name:str, gsqlType:str, default:Optional[str]=None):
+        self.name = name
+        self.gsqlType = re.sub(r"\s+", "", gsqlType).upper()
+        self.default = default
+        match = re.fullmatch(r"(SET|LIST|BAG)<(.+)>", self.gsqlType)
+        self.collection = match.group(1) if match else None
+        self.elementType = match.group(2) if match else self.gsqlType
+        # GSQL fills in missing primitive and collection parameters, but not vertex parameters
+        self.required = default is None and self.collection is None and self.elementType.startswith("VERTEX")
+
+    def asDict(self) -> dict:
+        return {"name": self.name, "type": self.gsqlType, "default": self.default, "required": self.required}
+
+
+class QuerySignature():
+
+    def __init__(self, queryName:str, parameters:List[QueryParameter]):
+        self.queryName = queryName
+        self.parameters = {param.name: param for param in parameters}
+
+    @staticmethod
+    def parse(queryName:str, queryText) -> Optional['QuerySignature']:
+        """Parse the parameter list out of the CREATE QUERY header returned by SHOW QUERY"""
+        if not isinstance(queryText, str):
+            return None
+        header = re.search(r"\bQUERY\s+" + re.escape(queryName) + r"\s*\(", queryText, re.IGNORECASE)
+        if header is None:
+            return None
+        paramText = _balancedText(queryText, header.end())
+        if paramText is None:
+            return None
+        parameters = []
+        for declaration in _splitTopLevel(paramText):
+            match = re.fullmatch(r"(?P<type>.+?)\s+(?P<name>\w+)\s*(?:=\s*(?P<default>.+))?", declaration.strip(), re.DOTALL)
+            if match is None:
+                return None
+            default = match.group("default")
+            parameters.append(QueryParameter(match.group("name"), match.group("type"),
+                                             default.strip().strip('"') if default is not None else None))
+        return QuerySignature(queryName, parameters)
+
+    def validate(self, params:dict) -> dict:
+        """Return a coerced copy of params, raising QueryParameterError on any mismatch"""
+        errors = []
+        coerced = {}
+        for name, value in (params or {}).items():
+            param = self.parameters.get(name)
+            if param is None:
+                suggestion = difflib.get_close_matches(name, self.parameters.keys(), n=1)
+                hint = f" (did you mean '{suggestion[0]}'?)" if suggestion else ""
+                errors.append(f"unknown parameter '{name}'{hint}")
+                continue
+            try:
+                coerced[name] = _coerceParameter(param, value)
+            except (TypeError, ValueError) as error:
+                errors.append(f"parameter '{name}' ({param.gsqlType}): {error}")
+        for param in self.parameters.values():
+            if param.required and param.name not in coerced and param.name not in (params or {}):
+                errors.append(f"missing required parameter '{param.name}' ({param.gsqlType})")
+        if errors:
+            expected = ", ".join(f"{p.gsqlType} {p.name}" for p in self.parameters.values())
+            raise QueryParameterError(f"{'; '.join(errors)}. Expected: {self.queryName}({expected})")
+        return coerced
+
+
+class QuerySignatureCache():
+    """
+    Parses installed query signatures (SHOW QUERY headers) and installed query names
+    (getInstalledQueries) read through the MetadataCache, so bad run_query calls are rejected
+    without a server round trip. Parsed signatures are kept per content hash and re-parsed only
+    when the query text changes. A query whose signature cannot be determined is passed
+    through unvalidated. Signatures are kept per graph, like the metadata they are parsed from.
+    """
+    def __init__(self, session:TigerGraph_Session, metadata:MetadataCache=None):
+        setErrorHandler()
+        self.session = session
+        self.metadata = metadata if metadata is not None else MetadataCache(session)
+        self._lock = threading.Lock()
+        self._signatures:Dict[Tuple[str, str], Tuple[str, Optional[QuerySignature]]] = {}
+        self._installed:Dict[str, Tuple[str, Set[str]]] = {}
+        self._failed:Dict[Tuple[str, str], int] = {}
+
+    def invalidate(self, query_name:str=""):
+        graph = self.session.currentGraphName()
+        if query_name:
+            self.metadata.invalidate(SHOW_QUERY, query_name, graph=graph)
+        else:
+            self.metadata.invalidate(SHOW_QUERY, graph=graph)
+        self.metadata.invalidate(INSTALLED_QUERIES, graph=graph)
+
+    def forget(self, graph:str):
+        """Drop the signatures and cached metadata of graph (its connection was closed)"""
+        self.metadata.invalidate(graph=graph)
+        with self._lock:
+            self._installed.pop(graph, None)
+            for key in [key for key in self._signatures if key[0] == graph]:
+                del self._signatures[key]
+            for key in [key for key in self._failed if key[0] == graph]:
+                del self._failed[key]
+
+    def installedQueries(self) -> Set[str]:
+        try:
+            installed, digest = self.metadata.installedQueries()
+        except Exception as error:
+            logger.error(f"Error reading installed queries: {error}")
+            return set()
+        graph = self.session.currentGraphName()
+        with self._lock:
+            if self._installed.get(graph, ("",))[0] != digest:
+                self._installed[graph] = (digest, _installedNames(installed))
+            return self._installed[graph][1]
+
+    def getSignature(self, query_name:str) -> Optional[QuerySignature]:
+        key = (self.session.currentGraphName(), query_name)
+        with self._lock:
+            # do not retry a failed SHOW QUERY until the cached metadata changes
+            if self._failed.get(key) == self.metadata.generation:
+                return None
+        try:
+            queryText, digest = self.metadata.showQuery(query_name)
+        except Exception as error:
+            logger.error(f"Error reading signature of query {query_name}: {error}")
+            with self._lock:
+                self._failed[key] = self.metadata.generation
+            return None
+        with self._lock:
+            cached = self._signatures.get(key)
+            if cached is not None and cached[0] == digest:
+                return cached[1]
+        signature = QuerySignature.parse(query_name, queryText)
+        with self._lock:
+            self._signatures[key] = (digest, signature)
+        return signature
+
+    def validate(self, query_name:str, params:dict) -> dict:
+        """Validate and coerce params for query_name, returns the params to send"""
+        installed = self.installedQueries()
+        if installed and query_name not in installed:
+            # the cached list may predate a query installed outside this server: re-read it once
+            self.metadata.invalidate(INSTALLED_QUERIES, graph=self.session.currentGraphName())
+            installed = self.installedQueries()
+        if installed and query_name not in installed:
+            suggestion = difflib.get_close_matches(query_name, installed, n=1)
+            hint = f" (did you mean '{suggestion[0]}'?)" if suggestion else ""
+            raise QueryParameterError(f"query '{query_name}' is not installed{hint}")
+        signature = self.getSignature(query_name)
+        if signature is None:
+            return params
+        return signature.validate(params)
+
+
+def _balancedText(text:str, start:int) -> Optional[str]:
+    """Return the text up to the parenthesis closing the one just before start"""
+    depth = 1
+    quote = None
+    for position in range(start, len(text)):
+        char = text[position]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                return text[start:position]
+    return None
+
+
+def _splitTopLevel(text:str) -> List[str]:
+    """Split a parameter list on commas outside <...> and quotes"""
+    parts, depth, quote, current = [], 0, None, []
+    for char in text:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char in "<(":
+            depth += 1
+        elif char in ">)":
+            depth -= 1
+        elif char == ',' and depth == 0:
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    if "".join(current).strip():
+        parts.append("".join(current))
+    return [part for part in parts if part.strip()]
+
+
+def _installedNames(installed) -> Set[str]:
+    names = set()
+    if isinstance(installed, dict):
+        for endpoint in installed.keys():
+            if "/query/" in str(endpoint):
+                names.add(str(endpoint).rstrip('/').rsplit('/', 1)[-1])
+    return names
+
+
+def _coerceParameter(param:QueryParameter, value):
+    if param.collection is None:
+        return _coerceValue(param.elementType, value)
+    if isinstance(value, (list, tuple, set)) and not _isVertexPair(param.elementType, value):
+        values = list(value)
+    elif isinstance(value, str) and param.elementType not in ("STRING",) and "," in value:
+        values = [item.strip() for item in value.split(",")]
+    else:
+        values = [value]
+    return [_coerceValue(param.elementType, item) for item in values]
+
+
+def _isVertexPair(elementType:str, value) -> bool:
+    return elementType == "VERTEX" and isinstance(value, (list, tuple)) and len(value) == 2 \
+        and all(isinstance(item, (str, int)) for item in value)
+
+
+def _coerceValue(gsqlType:str, value):
+    if gsqlType in INTEGER_TYPES:
+        if isinstance(value, bool):
+            raise TypeError(f"expected an integer, got {value!r}")
+        if isinstance(value, float):
+            if not value.is_integer():
+                raise ValueError(f"expected an integer, got {value!r}")
+            value = int(value)
+        number = int(str(value).strip()) if not isinstance(value, int) else value
+        if gsqlType.startswith("U") and number < 0:
+            raise ValueError(f"expected a non negative integer, got {number}")
+        return number
+    if gsqlType in FLOAT_TYPES:
+        if isinstance(value, bool):
+            raise TypeError(f"expected a number, got {value!r}")
+        return float(value)
+    if gsqlType == "BOOL":
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in ("true", "1", "yes"):
+            return True
+        if text in ("false", "0", "no"):
+            return False
+        raise ValueError(f"expected true or false, got {value!r}")
+    if gsqlType == "STRING":
+        if isinstance(value, (dict, list, tuple, set)):
+            raise TypeError(f"expected a string, got {type(value).__name__}")
+        return str(value)
+    if gsqlType == "DATETIME":
+        text = str(value).strip()
+        for fmt in DATETIME_FORMATS:
+            try:
+                return datetime.datetime.strptime(text, fmt).strftime("%Y-%m-%d %H:%M:%S")
+            except ValueError:
+                pass
+        raise ValueError(f"expected 'YYYY-MM-DD HH:MM:SS', got {value!r}")
+    if gsqlType == "VERTEX":
+        # untyped vertex parameters need both the id and the vertex type
+        if isinstance(value, dict) and "id" in value and "type" in value:
+            return (str(value["id"]), str(value["type"]))
+        if _isVertexPair(gsqlType, value):
+            return (str(value[0]), str(value[1]))
+        raise ValueError(f"expected a (vertex_id, vertex_type) pair, got {value!r}")
+    if gsqlType.startswith("VERTEX<"):
+        if isinstance(value, dict) and "id" in value:
+            value = value["id"]
+        if isinstance(value, (str, int)) and not isinstance(value, bool) and str(value) != "":
+            return str(value)
+        raise ValueError(f"expected a vertex id, got {value!r}")
+    return value
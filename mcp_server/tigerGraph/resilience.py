@@ -0,0 +1,205 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+#
+# resilience.py: This modelue defines the CircuitBreaker and Resilience classes
+# that retry transient TigerGraph backend failures with jittered backoff and
+# fail fast while the RESTPP or GSQL server is unhealthy
+#******************************************************************************
+import time
+import random
+import threading
+
+from typing import Callable, Dict, Optional
+from requests.exceptions import ConnectionError as RequestsConnectionError, ConnectTimeout, HTTPError, Timeout
+from mcp_server.config import tigerGraphTuning
+from mcp_server.mcp_metrics import metrics
+from mcp_server.mcp_logger import logger
+
+#
+# HTTP status codes of a backend that is restarting or overloaded
+#
+TRANSIENT_STATUS = {429, 502, 503, 504}
+
+#
+# Calls without side effects: retried on any transient failure. Every other call (gsql schema
+# changes, upserts, installed queries that may write) is only retried when its request never
+# reached the server.
+#
+READ_PREFIXES = ("get", "show", "check", "ping", "echo")
+READ_METHODS = {"vectorSearch", "runInterpretedQuery"}
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised without calling TigerGraph while the circuit breaker of the api is open"""
+
+
+def isReadMethod(name:str) -> bool:
+    return name.startswith(READ_PREFIXES) or name in READ_METHODS
+
+
+def _causes(error:BaseException):
+    """error and the exceptions it wraps (pyTigerGraph re-raises connection errors as its own)"""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+
+def isTransient(error:BaseException) -> bool:
+    """Connection failures, timeouts and 429 / 502 / 503 / 504 replies; query and schema errors are not"""
+    for cause in _causes(error):
+        if isinstance(cause, CircuitOpenError):
+            return False
+        if isinstance(cause, HTTPError):
+            return cause.response is not None and cause.response.status_code in TRANSIENT_STATUS
+        if isinstance(cause, (RequestsConnectionError, Timeout)):
+            return True
+        if str(cause).startswith("Connection error"):
+            return True
+    return False
+
+
+def notSent(error:BaseException) -> bool:
+    """True when the request never reached the server (refused or timed out connecting), so any call is safe to retry"""
+    for cause in _causes(error):
+        if isinstance(cause, ConnectTimeout):
+            return True
+        message = str(cause)
+        if "Failed to establish a new connection" in message or "Connection refused" in message:
+            return True
+    return False
+
+
+class CircuitBreaker():
+    """
+    Counts consecutive transient failures of one api. After TG_BREAKER_FAILURES of them the
+    breaker opens and calls are rejected at once; TG_BREAKER_RESET_SECONDS later a single trial
+    call is let through (half open) and closes the breaker again when it succeeds.
+    """
+    def __init__(self, name:str, failureThreshold:Optional[int]=None, resetSeconds:Optional[float]=None):
+        self.name = name
+        self.failureThreshold = tigerGraphTuning('breakerFailures') if failureThreshold is None else failureThreshold
+        self.resetSeconds = tigerGraphTuning('breakerResetSeconds') if resetSeconds is None else resetSeconds
+        self.state = CLOSED
+        self.failures = 0
+        self.openedAt:Optional[float] = None
+        self.lastError:Optional[str] = None
+        self.rejected = 0
+        self.trips = 0
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.openedAt >= self.resetSeconds:
+                self._transition(HALF_OPEN)
+            if self.state == CLOSED or (self.state == HALF_OPEN and not self._trial):
+                self._trial = self.state == HALF_OPEN
+                return True
+            self.rejected += 1
+            return False
+
+    def recordSuccess(self):
+        with self._lock:
+            self.failures = 0
+            self._trial = False
+            if self.state != CLOSED:
+                self._transition(CLOSED)
+
+    def recordFailure(self, error:BaseException):
+        with self._lock:
+            self.failures += 1
+            self.lastError = str(error)
+            self._trial = False
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failureThreshold):
+                self.openedAt = time.monotonic()
+                self.trips += 1
+                self._transition(OPEN)
+
+    def _transition(self, state:str):
+        self.state = state
+        metrics.inc("tigergraph_breaker_transitions_total", {"api": self.name, "state": state},
+                    help="TigerGraph circuit breaker state changes by api")
+        if state == OPEN:
+            logger.error(f"TigerGraph {self.name} circuit breaker open after {self.failures} failures: {self.lastError}")
+        else:
+            logger.info(f"TigerGraph {self.name} circuit breaker {state}")
+
+    def retryIn(self) -> float:
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.resetSeconds - (time.monotonic() - self.openedAt))
+
+    def status(self) -> dict:
+        return {"state": self.state, "consecutiveFailures": self.failures, "failureThreshold": self.failureThreshold,
+                "resetSeconds": self.resetSeconds, "retryInSeconds": round(self.retryIn(), 1), "trips": self.trips,
+                "rejected": self.rejected, "lastError": self.lastError}
+
+
+class Resilience():
+    """
+    Retry policy and one circuit breaker per api (RESTPP, GSQL) shared by the connections of a
+    session. call() makes up to TG_RETRY_ATTEMPTS attempts, sleeping a random time up to
+    TG_RETRY_BASE_DELAY * 2^attempt (capped at TG_RETRY_MAX_DELAY) between them.
+    """
+    def __init__(self, sleep:Callable[[float], None]=time.sleep):
+        self.sleep = sleep
+        self.breakers:Dict[str, CircuitBreaker] = {}
+        self.retries = 0
+        self._lock = threading.Lock()
+        self.reconfigure()
+
+    def reconfigure(self):
+        self.attempts = max(1, tigerGraphTuning('retryAttempts'))
+        self.baseDelay = tigerGraphTuning('retryBaseDelay')
+        self.maxDelay = tigerGraphTuning('retryMaxDelay')
+        for breaker in self.breakers.values():
+            breaker.failureThreshold = tigerGraphTuning('breakerFailures')
+            breaker.resetSeconds = tigerGraphTuning('breakerResetSeconds')
+
+    def breaker(self, api:str) -> CircuitBreaker:
+        with self._lock:
+            if api not in self.breakers:
+                self.breakers[api] = CircuitBreaker(api)
+            return self.breakers[api]
+
+    def backoff(self, attempt:int) -> float:
+        return random.uniform(0, min(self.maxDelay, self.baseDelay * (2 ** attempt)))
+
+    def call(self, api:str, name:str, func:Callable, *args, **kwargs):
+        breaker = self.breaker(api)
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(f"TigerGraph {api} unavailable (circuit breaker open, retry in "
+                                       f"{breaker.retryIn():.0f}s): {breaker.lastError}")
+            try:
+                result = func(*args, **kwargs)
+            except Exception as error:
+                if not isTransient(error):
+                    # the server answered: the error is the call's, not the backend's
+                    breaker.recordSuccess()
+                    raise
+                breaker.recordFailure(error)
+                attempt += 1
+                if attempt >= self.attempts or not (isReadMethod(name) or notSent(error)):
+                    raise
+                delay = self.backoff(attempt - 1)
+                self.retries += 1
+                metrics.inc("tigergraph_backend_retries_total", {"method": name, "api": api},
+                            help="TigerGraph backend calls retried after a transient failure")
+                logger.warning(f"TigerGraph {api} call {name} failed ({error}), retry {attempt} in {delay:.2f}s")
+                self.sleep(delay)
+                continue
+            breaker.recordSuccess()
+            return result
+
+    def status(self) -> dict:
+        return {"retryAttempts": self.attempts, "retryBaseDelay": self.baseDelay, "retryMaxDelay": self.maxDelay,
+                "retries": self.retries, "breakers": {api: breaker.status() for api, breaker in self.breakers.items()}}
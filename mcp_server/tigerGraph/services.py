@@ -10,22 +10,42 @@ import re
 import csv
 import json
 import datetime
+import time
 import traceback
-import pandas as pd
 from pathlib import Path
-from typing import Dict, Any, Tuple, Union, Literal
+from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple, Union, Literal
 
-from pyTigerGraph import TigerGraphConnection
-from mcp_server.config import OUTPUT_PATH, tigerGraphConstants
+if TYPE_CHECKING:
+    # type hints only: pandas and pyTigerGraph are slow to import, see TigerGraph_Session.newConnection()
+    import pandas as pd
+    from pyTigerGraph import TigerGraphConnection
+from mcp_server.config import OUTPUT_PATH, settings, tigerGraphConstants, tigerGraphTuning
 from mcp_server.tigerGraph.interface import TigerGraphInterface
 from mcp_server.tigerGraph.session import TigerGraph_Session
 from mcp_server.tigerGraph.system_services import SystemUtilities
+from mcp_server.tigerGraph.snapshot_services import SnapshotServices
+from mcp_server.tigerGraph.backup_services import BackupServices
+from mcp_server.tigerGraph.vector_services import VectorServices
+from mcp_server.tigerGraph.batch_services import BatchQueryServices
+from mcp_server.tigerGraph.metadata_cache import MetadataCache
+from mcp_server.tigerGraph.query_signatures import QuerySignatureCache, QueryParameterError
+from mcp_server.tigerGraph.query_registry import RunningQueryRegistry, runDetached
+from mcp_server.tigerGraph.latency_tracker import QueryLatencyTracker, callStatus
+from mcp_server.tigerGraph.metrics_sampler import MetricsSampler, CPU_MEMORY, DISKSPACE
+from mcp_server.mcp_tracing import tracer
 from mcp_server.mcp_logger import setErrorHandler, logger
 #
 #intialize TigerGraph Constants by reading .env file
 #
 OUTPUT_PATH = tigerGraphConstants(output=True)
 
+#
+# Settings read once at startup, a change to them is only applied by restarting the server
+#
+RESTART_SETTINGS = ('host', 'graph', 'user', 'password', 'outputPath', 'lazyConnect', 'startupCacheTTL', 'hosts')
+LATENCY_SETTINGS = ('latencyWindow', 'latencyMinSamples', 'timeoutFactor', 'timeoutMin', 'timeoutMax')
+RESILIENCE_SETTINGS = ('retryAttempts', 'retryBaseDelay', 'retryMaxDelay', 'breakerFailures', 'breakerResetSeconds')
+
 #
 # The assumption is that you have setup (at a minumum) a user and password
 # in your Tigergraph database
@@ -36,25 +56,88 @@ class TigerGraphServices(TigerGraphInterface):
     Assumption that TigerGraph server is up and running
     with a user id defined
     """
-    def __init__(self):
+    def __init__(self, lazy:Optional[bool]=None):
         setErrorHandler()
-        self.session = TigerGraph_Session()
-        self.adminServices = SystemUtilities(self.session)
+        self.lazy = tigerGraphTuning('lazyConnect') if lazy is None else lazy
+        self.session = TigerGraph_Session(lazy=self.lazy)
+        self.adminServices = SystemUtilities(self.session, lazy=self.lazy)
+        self.snapshotServices = SnapshotServices(self.session, OUTPUT_PATH)
+        self.backupServices = BackupServices(self.session, OUTPUT_PATH)
+        self.vectorServices = VectorServices(self.session, OUTPUT_PATH)
+        self.metadataCache = MetadataCache(self.session)
+        self.metadataCache.startWatcher()
+        self.querySignatures = QuerySignatureCache(self.session, self.metadataCache)
+        self.queryRegistry = RunningQueryRegistry()
+        self.latencyTracker = QueryLatencyTracker()
+        self.batchServices = BatchQueryServices(self.session, OUTPUT_PATH, self.querySignatures, self.queryRegistry,
+                                                self.latencyTracker)
+        self.session.registry.onEvict(self.querySignatures.forget)
+        self.metricsSampler = MetricsSampler(self.session)
         self.initOutputDir()
+        settings.onChange(self.applySettings)
+
+    def applySettings(self, changes:dict):
+        """
+        Reconfigure the caches and trackers in place after the .env file was reloaded. Worker pool
+        sizes, batch sizes and profiling options are read on every call and need nothing here.
+        """
+        logger.info(f"Settings changed: {', '.join(sorted(changes))}")
+        if {'metadataTTL', 'metadataCheckInterval'} & changes.keys():
+            self.metadataCache.reconfigure()
+        if set(LATENCY_SETTINGS) & changes.keys():
+            self.latencyTracker.reconfigure()
+        if {'traceSampleRate', 'traceFile'} & changes.keys():
+            tracer.configure()
+        if set(RESILIENCE_SETTINGS) & changes.keys():
+            for resilience in self.session.resiliences():
+                resilience.reconfigure()
+        if {'metricsSampleInterval', 'metricsHistory'} & changes.keys():
+            self.metricsSampler.reconfigure()
+        if {'graphIdleSeconds', 'maxGraphs'} & changes.keys():
+            self.session.registry.reconfigure()
+        if 'hostCheckInterval' in changes and self.session.router is not None:
+            self.session.router.checkInterval = tigerGraphTuning('hostCheckInterval')
+        tokenManager = self.session.tokenManager
+        if {'tokenLifetime', 'tokenRefreshBefore'} & changes.keys():
+            tokenManager.reconfigure()
+        if 'token' in changes and settings.token and settings.token != tokenManager.token:
+            # a token written to the .env file by hand (the refreshed ones are in use already)
+            tokenManager.adopt(settings.token, tokenManager.parseExpiration(settings.tokenExpiration))
+        restart = sorted(set(RESTART_SETTINGS) & changes.keys())
+        if restart:
+            logger.warning(f"Settings {', '.join(restart)} changed, they take effect after the MCP server is restarted")
 
     def hasRole(self, roleName:str):
         return self.session.hasRole(roleName)
 
+    def connect(self):
+        """Establish the (lazy) TigerGraph session now"""
+        self.session.connect()
+
+    def token_status(self) -> dict:
+        """Expiry and refresh state of the TigerGraph API token"""
+        return self.session.tokenManager.status()
+
+    def graph_sessions(self) -> dict:
+        """The default graph and the further graphs with an open connection"""
+        registry = self.session.registry
+        return {"defaultGraph": self.session.graphName, "idleSeconds": registry.idleSeconds,
+                "maxGraphs": registry.maxGraphs, "graphs": registry.status()}
+
+    def startup_status(self) -> dict:
+        """Session validation timings and startup probe results"""
+        return self.session.startupStatus()
+
     def initOutputDir(self):
         self.output_path = Path(OUTPUT_PATH)
         if not self.output_path.exists():
             Path.mkdir(self.output_path, exist_ok=True)
 
-    def getConnection(self) -> TigerGraphConnection:
+    def getConnection(self) -> 'TigerGraphConnection':
         return self.session.getConnection()
 
     def getGraphName(self) -> str:
-        return self.session.graphName
+        return self.session.currentGraphName()
 
     def displayServicesStatus(self):
         return self.adminServices.displayServicesStatus()
@@ -74,10 +157,109 @@ class TigerGraphServices(TigerGraphInterface):
         """Get TigerGraph Disk Space Usage"""
         return self.adminServices.displayDiskStatus()
 
+    def displayCPUMemoryTrend(self, window_minutes:int=60, service:str=""):
+        """CPU and memory statistics and sparklines of every service over the sampled window"""
+        return self.metricsSampler.displayTrend("CPU & Memory Utilitzation Trend", CPU_MEMORY,
+                                                [("CPU %", "cpu"), ("Memory MB", "memoryMB")], window_minutes, service)
+
+    def displayDiskSpaceTrend(self, window_minutes:int=60, path:str=""):
+        """Disk size and free space statistics and sparklines of every path over the sampled window"""
+        return self.metricsSampler.displayTrend("Disk Space Utilitzation Trend", DISKSPACE,
+                                                [("Size MB", "sizeMB"), ("Free MB", "freeMB")], window_minutes, path)
+
+    def displayDiskGrowthForecast(self, window_minutes:int=1440, path:str=""):
+        """Disk growth rates, time to full and alerts of every path fitted over the sampled window"""
+        return self.metricsSampler.displayDiskForecast(window_minutes, path)
+
+    def displayRunningQueries(self) -> str:
+        """Running queries on the server, annotated with the MCP tool call that started them"""
+        try:
+            running = self.adminServices.getRunningQueries()
+            matches = self.queryRegistry.match(running)
+            queries = []
+            for request in running:
+                call = matches.get(request.get("requestid"))
+                queries.append({"requestId": request.get("requestid"), "url": request.get("url"),
+                                "startTime": request.get("startTime"),
+                                "elapsedSeconds": round(float(request.get("elapsedTime", 0) or 0) / 1000.0, 3),
+                                "expirationTime": request.get("expirationTime"),
+                                "tool": call.tool if call else None, "callId": call.callId if call else None,
+                                "params": call.params if call else None})
+            # calls sent by this server that TigerGraph is not (yet / any longer) reporting
+            pending = [call.asDict() for call in self.queryRegistry.calls() if call.requestId not in matches]
+            return json.dumps({"running": queries, "pendingCalls": pending}, indent=4, separators=(',', ':'))
+        except Exception as error:
+            logger.error(f"Error in displayRunningQueries(): {error}")
+            return f"Error listing running queries: {error}"
+
+    def displayBackendHealth(self) -> str:
+        """Retry counts and circuit breaker state of the RESTPP and GSQL servers, and the cluster nodes in use"""
+        health = self.session.resilience.status()
+        if self.session.router is not None:
+            health["hosts"] = self.session.router.status()
+        return json.dumps(health, indent=4, separators=(',', ':'))
+
+    def abortRunningQuery(self, request_id:str) -> str:
+        """Abort a running query by TigerGraph request id, or by the callId of a run_query / batch / fan-out call"""
+        try:
+            if self.queryRegistry.isCallId(request_id):
+                call = self.queryRegistry.get(request_id)
+                if call is None:
+                    return f"Query call {request_id} is not running (it has finished or was never sent)"
+                call.cancelled = True
+                if call.requestId is None:
+                    return (f"Query call {request_id} ({call.queryName}) is aborted as soon as TigerGraph returns "
+                            f"its request id")
+                request_id = call.requestId
+            results = self.adminServices.abortQuery(request_id)
+            return json.dumps(results, indent=4, separators=(',', ':'), default=str)
+        except Exception as error:
+            logger.error(f"Error in abortRunningQuery(): {error}")
+            return f"Error aborting query {request_id}: {error}"
+
+    def query_latency_stats(self, query_name:str="") -> str:
+        """Latency percentiles and learned default timeouts of the installed queries run so far"""
+        return json.dumps(self.latencyTracker.statistics(query_name), indent=4, separators=(',', ':'))
+
     def get_schema(self):
         return self.getConnection().getSchema(force=True)
 
-    def run_query(self, query_name: str, params: dict, outputFormat:Literal["Terminal","CSV","JSON"]="Terminal", timeout:int=60):
+    def create_snapshot(self, snapshot_name:str, vertex_types:list, edge_types:list, watermark_attributes:dict={}):
+        """Materialize vertex & edge types into a local CSR snapshot"""
+        return self.snapshotServices.createSnapshot(snapshot_name, vertex_types, edge_types, watermark_attributes)
+
+    def refresh_snapshot(self, snapshot_name:str):
+        """Incrementally synchronize a local snapshot with the database"""
+        return self.snapshotServices.refreshSnapshot(snapshot_name)
+
+    def list_snapshots(self):
+        return self.snapshotServices.listSnapshots()
+
+    def snapshot_degree(self, snapshot_name:str, vertex_type:str="", top_k:int=10):
+        return self.snapshotServices.snapshotDegree(snapshot_name, vertex_type, top_k)
+
+    def snapshot_bfs(self, snapshot_name:str, vertex_type:str, vertex_id:str, max_depth:int=3, limit:int=100):
+        return self.snapshotServices.snapshotBFS(snapshot_name, vertex_type, vertex_id, max_depth, limit)
+
+    def snapshot_pagerank(self, snapshot_name:str, vertex_type:str="", top_k:int=10, damping:float=0.85, max_iter:int=100):
+        return self.snapshotServices.snapshotPageRank(snapshot_name, vertex_type, top_k, damping, max_iter)
+
+    def backup_graph(self, backup_name:str, workers:int=0, page_size:int=0, shard_rows:int=0):
+        """Dump all vertex & edge types into compressed NDJSON shards"""
+        return self.backupServices.backupGraph(backup_name, workers, page_size, shard_rows)
+
+    def backup_status(self, backup_name:str=""):
+        return self.backupServices.backupStatus(backup_name)
+
+    def restore_graph(self, backup_name:str, workers:int=0, batch_size:int=0, create_schema:bool=True):
+        """Restore schema and data from NDJSON backup shards"""
+        results = self.backupServices.restoreGraph(backup_name, workers, batch_size, create_schema)
+        if create_schema:
+            self.metadataCache.invalidate()
+        return results
+
+    def run_query(self, query_name: str, params: dict, outputFormat:Literal["Terminal","CSV","JSON"]="Terminal", timeout:int=0,
+                  call_id:str=""):
         """Runs a GSQL query and processes the output.
 
         Args:
@@ -85,24 +267,61 @@ class TigerGraphServices(TigerGraphInterface):
                 The text of the query to run as one string. The query is one or more GSQL statement.
             params:
                 A dictionary of parameters to pass into query.
-            timeout: Maximum duration for successful query execution (in seconds)
+            timeout: Maximum duration for successful query execution (in seconds), 0 uses the timeout learned
+                     from the query's latency history (60 seconds until there is enough history)
+            call_id: Optional id used to track (and abort) this call in the running query registry
             """
-        results = self.getConnection().runInstalledQuery(query_name, params, timeout=(timeout*1000))
+        try:
+            with tracer.span("query.validate", query=query_name):
+                params = self.querySignatures.validate(query_name, params)
+        except QueryParameterError as error:
+            logger.error(f"Invalid parameters for query {query_name}: {error}")
+            return f"Invalid parameters for query {query_name}: {error}"
+        timeout = timeout if timeout > 0 else self.latencyTracker.defaultTimeout(query_name)
+        call = self.queryRegistry.start("run_query", query_name, params, call_id)
+        start = time.perf_counter()
+        try:
+            # detached, so a cancelled call can abort exactly its own request id
+            results = runDetached(self.getConnection(), call, timeout)
+            warning = self.latencyTracker.record(query_name, time.perf_counter() - start)
+        except Exception as error:
+            self.latencyTracker.record(query_name, time.perf_counter() - start, callStatus(error))
+            # the query may have been re-installed with a different signature
+            self.querySignatures.invalidate(query_name)
+            raise
+        finally:
+            self.queryRegistry.finish(call.callId)
         self.emptyResults = self.isResultSetEmpty(query_name, results)
+        output = ""
         if self.emptyResults == False:
+            # an unknown output format returns nothing, as before
+            output = None
             if outputFormat.lower() == 'terminal':
-                return(f"{json.dumps(results, indent=4, separators=(',', ':'))}")
-            if outputFormat.lower() == 'csv':
+                with tracer.span("serialize.json", query=query_name):
+                    output = f"{json.dumps(results, indent=4, separators=(',', ':'))}"
+            elif outputFormat.lower() == 'csv':
                 outputFile = f"{OUTPUT_PATH}/{query_name}.csv"
-                self.json_to_csv(results, outputFile)
-                return(f"\nWriting Query Results to {outputFile}")
+                with tracer.span("export.csv", query=query_name, file=outputFile):
+                    self.json_to_csv(results, outputFile)
+                output = f"\nWriting Query Results to {outputFile}"
             elif outputFormat.lower() == 'json':
                 outputFile = f"{OUTPUT_PATH}/{query_name}.json"
-                with open(outputFile, 'w', encoding='utf-8') as file:
-                    json.dump(results, file, indent=4, separators=(',', ':'))
-                return(f"\nWriting Query Results to {outputFile}")
-        else:
-            return ""
+                with tracer.span("export.json", query=query_name, file=outputFile):
+                    with open(outputFile, 'w', encoding='utf-8') as file:
+                        json.dump(results, file, indent=4, separators=(',', ':'))
+                output = f"\nWriting Query Results to {outputFile}"
+        # the caller sees a slow / trending slow query too, not only the server log
+        return f"{output}\n# Warning: {warning}" if warning and output is not None else output
+
+    def batch_run_query(self, query_name:str, param_list:list=[], param_file:str="",
+                        outputFormat:Literal["CSV","JSON"]="JSON", max_workers:int=0, timeout:int=0):
+        """Run an installed query for many parameter sets, merged into one output file"""
+        return self.batchServices.batchRunQuery(query_name, param_list, param_file, outputFormat, max_workers, timeout)
+
+    def fan_out_query(self, query_name:str, graphs:list, params:dict={}, outputFormat:Literal["CSV","JSON"]="JSON",
+                      max_workers:int=0, timeout:int=0):
+        """Run an installed query on several graphs concurrently, merged into one output file"""
+        return self.batchServices.fanOutQuery(query_name, graphs, params, outputFormat, max_workers, timeout)
 
     def json_to_csv(self, json_data, csv_filename):
         with open(csv_filename, mode='w', newline='', encoding='utf-8') as file:
@@ -213,11 +432,16 @@ class TigerGraphServices(TigerGraphInterface):
         return self.emptyResults
 
 
-    def show_query(self, query_name: str):
-        return self.getConnection().showQuery(query_name)
+    def show_query(self, query_name: str, refresh: bool = False):
+        return self.metadataCache.showQuery(query_name, refresh)[0]
+
+    def get_installed_queries(self, refresh: bool = False) -> Union[dict, str, 'pd.DataFrame']:
+        return self.metadataCache.installedQueries(refresh)[0]
 
-    def get_installed_queries(self) -> Union[dict, str, 'pd.DataFrame']:
-        return self.getConnection().getInstalledQueries()
+    def metadata_cache_status(self) -> str:
+        """Age, content hash and staleness of the cached query / UDF metadata"""
+        status = {"ttlSeconds": self.metadataCache.ttl, "entries": self.metadataCache.status()}
+        return json.dumps(status, indent=4, separators=(',', ':'))
 
     def define_vertex(self, vertex_type: str, vertex_id_name: str, attributes: dict) -> bool:
         """
@@ -264,6 +488,7 @@ class TigerGraphServices(TigerGraphInterface):
             #print(f">>> gsql AddVertex: {gsqlAddVertex}", file=sys.stderr)
 
             results = self.getConnection().gsql(gsqlAddVertex,self.getGraphName())
+            self.metadataCache.invalidate()
             if isinstance(results, str):
                 logger.info(f"*** Define Vertex Results >>>: {results}", file=sys.stderr)
 
@@ -356,6 +581,7 @@ class TigerGraphServices(TigerGraphInterface):
             results = self.getConnection().gsql(dropJob)
 
             results = self.getConnection().gsql(gsqlAlterVertex,self.getGraphName())
+            self.metadataCache.invalidate()
             if isinstance(results, str):
                 logger.info(f"*** Alter Vertex Results >>>: {results}", file=sys.stderr)
                 results = self.getConnection().gsql(dropJob)
@@ -421,6 +647,7 @@ class TigerGraphServices(TigerGraphInterface):
             results = self.getConnection().gsql(dropJob)
 
             results = self.getConnection().gsql(gsqlAddEdge,self.getGraphName())
+            self.metadataCache.invalidate()
             if isinstance(results, str):
                 logger.info(f"*** Define Edge Results >>>: {results}", file=sys.stderr)
 
@@ -525,14 +752,29 @@ class TigerGraphServices(TigerGraphInterface):
 
             Prompt: update_vertex_prompt() -> defined on mcp_server.py
         """
-        return self.getConnection().upsertVertex(vertex_type, vertex_id, attributes)
+        results = self.getConnection().upsertVertex(vertex_type, vertex_id, attributes)
+        self.snapshotServices.recordVertexWrite(vertex_type, vertex_id)
+        return results
 
 
     def upsert_edge(self, source_type: str, source_id: str, edge_type: str,
                     target_type: str, target_id: str, attributes: dict = {})  -> int:
 
-        return self.getConnection().upsertEdge(source_type, source_id, edge_type,
+        results = self.getConnection().upsertEdge(source_type, source_id, edge_type,
                                     target_type, target_id, attributes or {})
+        self.snapshotServices.recordEdgeWrite(source_type, source_id, edge_type, target_type, target_id)
+        return results
+
+    def load_vectors(self, vertex_type:str, vector_attribute:str, id_file:str, vector_file:str,
+                     batch_size:int=0, workers:int=0) -> str:
+        """Bulk upsert a VECTOR attribute from an id file and a memory-mapped .npy matrix"""
+        return self.vectorServices.loadVectors(vertex_type, vector_attribute, id_file, vector_file, batch_size, workers)
+
+    def vector_search(self, vertex_type:str, vector_attribute:str, query_vectors:list, top_k:int=10,
+                      rerank:bool=False, candidate_k:int=0, filters:dict={}, workers:int=0) -> str:
+        """Batched top-k vector similarity search with optional local filtering / re-ranking"""
+        return self.vectorServices.vectorSearch(vertex_type, vector_attribute, query_vectors, top_k,
+                                                rerank, candidate_k, filters, workers)
 
     def get_vertex(self, vertex_type: str, vertex_id: str) -> Union[list, str, 'pd.DataFrame']:
         return self.getConnection().getVerticesById(vertex_type, vertex_id)
@@ -541,6 +783,6 @@ class TigerGraphServices(TigerGraphInterface):
         return self.getConnection().gsql(query=query, graphname=self.getConnection().graphname)
 
     def get_udf(self, ExprFunctions: bool = True, ExprUtil: bool = True,
-                json_out: bool = False) -> Union[Tuple[str, str], Dict[str, Any], str]:
+                json_out: bool = False, refresh: bool = False) -> Union[Tuple[str, str], Dict[str, Any], str]:
 
-        return self.getConnection().getUDF(ExprFunctions, ExprUtil, json_out)
+        return self.metadataCache.getUDF(ExprFunctions, ExprUtil, json_out, refresh)[0]
@@ -6,21 +6,43 @@
 # managing TigerGraph authenitcation and session to the graph database
 #******************************************************************************
 import sys
+import time
 import logging
+import threading
 import traceback
 
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
 from requests.exceptions import HTTPError
-from pyTigerGraph import TigerGraphConnection
 from mcp_server.mcp_logger import setErrorHandler, logger
+from mcp_server.tigerGraph.instrumented_connection import InstrumentedConnection
+from mcp_server.tigerGraph.resilience import Resilience
+from mcp_server.tigerGraph.host_router import HostRouter, parseHosts
+from mcp_server.tigerGraph.session_registry import SessionRegistry, currentGraph
+from mcp_server.tigerGraph.startup_cache import StartupCache
+from mcp_server.tigerGraph.token_manager import TokenManager, tokenExpiration
+
+if TYPE_CHECKING:
+    from pyTigerGraph import TigerGraphConnection
 
 # Suppress all pyTigerGraph logs
 logging.getLogger("pyTigerGraph").setLevel(logging.WARNING)
 #
 # Import Database configuration parameters from .env file
 #
-from mcp_server.config import tigerGraphConstants, set_Constents, TG_SYSTEM
+from mcp_server.config import tigerGraphConstants, tigerGraphTuning, set_Constents, TG_SYSTEM
 HOST, GRAPH, USER, PASSWORD, SECRET, TOKEN = tigerGraphConstants()
 
+#
+# Roles looked up at startup (the admin tools are only offered to superusers)
+#
+PROBED_ROLES = ("superuser",)
+#
+# Probe results kept in the startup cache; role membership grants the admin tools and is
+# never read from disk, it is re-checked every TG_ROLE_CHECK_SECONDS instead (see hasRole)
+#
+CACHED_PROBES = ("graphExists", "version")
+
 class TigerGraph_Session():
     """
     The TigerGraph Session initialization performs the following checks:
@@ -29,8 +51,13 @@ class TigerGraph_Session():
     3. Checks to see if there is a Secret registered by the db user name and graph name, if there
        is no Secret, the system will create a secret and token and write it out to your .env file
     4. Once the session is authenticated it will set a TigerGraph Connection
+    With lazy=True these checks are deferred to connect(), run on the first getConnection() call
+    (or by a background warm up), so the MCP server can answer initialize / list_tools at once.
+    When TG_HOSTS lists further cluster nodes the connection is a HostRouter spreading read
+    queries over them. Tool calls naming another graph (see session_registry.useGraph) are
+    served by a connection to that graph from the SessionRegistry.
     """
-    def __init__(self):
+    def __init__(self, lazy:bool=False):
         setErrorHandler()
         self.username = USER
         self.password = PASSWORD
@@ -38,63 +65,210 @@ class TigerGraph_Session():
         self._secret = SECRET
         self._token = TOKEN
         self.host = HOST
+        self.hosts = parseHosts(HOST, tigerGraphTuning('hosts'))
+        self.lazy = lazy
+        self.connected = False
+        self.connectSeconds:Optional[float] = None
+        self.startupTimings:Dict[str, float] = {}
+        self.probes:dict = {}
+        self._roleChecks:Dict[str, Tuple[bool, float]] = {}
+        self._roleLock = threading.Lock()
+        self.startupCache = StartupCache(f"{HOST}|{GRAPH}|{USER}")
+        self.resilience = Resilience()
+        self.tokenManager = TokenManager(self, connections=self.connections)
+        self.registry = SessionRegistry(self)
+        self._connectLock = threading.Lock()
+
+        if self.host.find("tgcloud.io") > 0:
+            self.tgCloud = True
+        else:
+            self.tgCloud = False
+
+        self.conn:Optional[Union[InstrumentedConnection, HostRouter]] = None
+        self.router:Optional[HostRouter] = None
+        if not lazy:
+            self.conn = self.openConnection()
+            self.connect()
+
+    def newConnection(self, host:Optional[str]=None, resilience:Optional[Resilience]=None,
+                      graph:Optional[str]=None) -> InstrumentedConnection:
+        # pyTigerGraph (with aiohttp) takes ~0.4s to import: a lazy session only imports it in connect()
+        from pyTigerGraph import TigerGraphConnection
+        return InstrumentedConnection(TigerGraphConnection(
+            host=host or HOST,
+            graphname=graph or GRAPH,
+            apiToken=TOKEN,
+            username=USER,
+            password=PASSWORD,
+            tgCloud=self.tgCloud
+        ), resilience=resilience or self.resilience)
+
+    def openConnection(self) -> Union[InstrumentedConnection, HostRouter]:
+        """The session connection: a single host, or a router over the TG_HOSTS cluster nodes"""
+        if len(self.hosts) < 2:
+            return self.newConnection()
+        self.router = HostRouter(self.hosts, lambda host, resilience: self.newConnection(host, resilience),
+                                 self.resilience)
+        return self.router
+
+    def connections(self) -> List[InstrumentedConnection]:
+        """Every connection of the session (one per host, then one per further graph in use)"""
+        if self.router is not None:
+            return self.router.connections() + self.registry.connections()
+        return ([self.conn] if self.conn is not None else []) + self.registry.connections()
+
+    def resiliences(self) -> List[Resilience]:
+        """The retry policy and circuit breakers of every host"""
+        if self.router is not None:
+            return [entry.resilience for entry in self.router.entries]
+        return [self.resilience]
 
+    def connect(self):
+        """
+        Validate the session once; concurrent callers wait for the first one. The ping -> graph -> secret
+        chain runs alongside the version and role probes, and results found in the startup cache are reused.
+        """
+        if self.connected:
+            return
+        with self._connectLock:
+            if self.connected:
+                return
+            start = time.perf_counter()
+            self.startupTimings = {}
+            if self.conn is None:
+                self.conn = self._timed("import", self.openConnection)
+            self.tokenManager.ensureValid()
+            cached = {key: value for key, value in self.startupCache.load().items() if key in CACHED_PROBES}
+            self.probes = dict(cached)
+            try:
+                with ThreadPoolExecutor(max_workers=2, thread_name_prefix="tigergraph-probe") as pool:
+                    probes = {}
+                    if "version" not in cached:
+                        probes["version"] = pool.submit(self._timed, "version", self._probeVersion)
+                    probes["roles"] = pool.submit(self._timed, "roles", self._probeRoles)
+                    try:
+                        self._validateSession(skipChecks=bool(cached.get("graphExists")))
+                    finally:
+                        for key, future in probes.items():
+                            try:
+                                self.probes[key] = future.result()
+                            except Exception as error:
+                                logger.error(f"Error in TigerGraph startup probe {key}: {error}")
+                checked = time.monotonic()
+                with self._roleLock:
+                    self._roleChecks = {role: (member, checked) for role, member in self.probes.get("roles", {}).items()}
+                self.connected = True
+                self.connectSeconds = time.perf_counter() - start
+                self.tokenManager.start()
+                if self.router is not None:
+                    self.router.start()
+                self.registry.startWatcher()
+                persistent = {key: value for key, value in self.probes.items() if key in CACHED_PROBES}
+                if persistent != cached:
+                    self.startupCache.save(persistent)
+                steps = ", ".join(f"{name} {seconds:.3f}s" for name, seconds in self.startupTimings.items())
+                reused = f", cached: {', '.join(sorted(cached))}" if cached else ""
+                logger.info(f"TigerGraph session for graph {self.graphName} established in {self.connectSeconds:.3f}s "
+                            f"({steps}{reused})")
+
+            except HTTPError as error:
+                if error.response.status_code == 401:
+                    raise ConnectionError(">>> ERROR - Invalid credentials, please check your TigerGraph username / password.")
+
+                raise ConnectionError(f">>> ERROR - TigerGraph server not running, {error}: ")
+
+            except Exception as error:
+                 logger.error(f">>> ERROR - TigerGraph server not running, {error}: ")
+
+    def _timed(self, step:str, func, *args, **kwargs):
+        start = time.perf_counter()
         try:
-            if self.host.find("tgcloud.io") > 0:
-                self.tgCloud = True
+            return func(*args, **kwargs)
+        finally:
+            self.startupTimings[step] = round(time.perf_counter() - start, 4)
+
+    def _validateSession(self, skipChecks:bool=False):
+        """ping, then make sure the graph and its secret exist (skipped when the startup cache knows they do)"""
+        results = self._timed("ping", self.conn.ping)
+        if (results['error'] is not True) and not skipChecks:
+            if(self._timed("graph", self.conn.check_exist_graphs, self.graphName) == False):
+                self._timed("createGraph", self._createGraph)
             else:
-                self.tgCloud = False
-
-            self.conn = TigerGraphConnection(
-                host=HOST,
-                graphname=GRAPH,
-                apiToken=TOKEN,
-                username=USER,
-                password=PASSWORD,
-                tgCloud=self.tgCloud
-            )
-            results = self.getConnection().ping()
-            if (results['error'] is not True):
-                if(self.getConnection().check_exist_graphs(self.graphName) == False):
-                    self._createGraph()    
-                else:
-                    self.secretsExists()
-
-        except HTTPError as error:
-            if error.response.status_code == 401:
-                raise ConnectionError(">>> ERROR - Invalid credentials, please check your TigerGraph username / password.")
-            
-            raise ConnectionError(f">>> ERROR - TigerGraph server not running, {error}: ")
+                self._timed("secrets", self.secretsExists)
+            self.probes["graphExists"] = True
 
-        except Exception as error:
-             logger.error(f">>> ERROR - TigerGraph server not running, {error}: ",file=sys.stderr)
+    def _probeVersion(self) -> str:
+        results = self.conn.getVersion()
+        return results[0]['version'] if len(results) > 0 else ""
+
+    def _probeRoles(self) -> dict:
+        return {roleName: self.username in self.conn.gsql(f"SHOW GRANTS OF ROLE {roleName}")
+                for roleName in PROBED_ROLES}
+
+    def startupStatus(self) -> dict:
+        """Timing breakdown of the last session validation and the probe results it used"""
+        return {"connected": self.connected, "lazy": self.lazy,
+                "connectSeconds": round(self.connectSeconds, 4) if self.connectSeconds is not None else None,
+                "steps": self.startupTimings, "probes": self.probes,
+                "cacheFile": self.startupCache.cacheFile, "cacheTTL": self.startupCache.ttl}
 
     def isRemote(self) -> bool:
         return self.tgCloud
     
-    def getConnection(self) -> TigerGraphConnection:
+    def getConnection(self) -> 'TigerGraphConnection':
+        if not self.connected:
+            self.connect()
+        graph = currentGraph.get()
+        if graph and graph != self.graphName:
+            return self.registry.connection(graph)
         return self.conn
 
+    def currentGraphName(self) -> str:
+        """Graph of the tool call being served"""
+        return currentGraph.get() or self.graphName
+
     def getHost(self) -> str:
         return self.host
        
+    def getSecret(self) -> str:
+        return self._secret or ""
+
     def getSecretAlias(self) -> str:
         return f"{self.username}_{self.graphName}"
 
-    def hasRole(self, roleName:str):
-        
-      results = self.getConnection().gsql(f"SHOW GRANTS OF ROLE {roleName}")
-      if self.username in results:
-          return True
-      else:
-          return False
+    def hasRole(self, roleName:str) -> bool:
+        """
+        Whether the user holds roleName. The answer is kept in memory for TG_ROLE_CHECK_SECONDS, so a
+        revoked role stops granting the admin tools soon after; a failed check counts as not granted.
+        """
+        connection = self.getConnection()
+        with self._roleLock:
+            member, checked = self._roleChecks.get(roleName, (False, None))
+            if checked is not None and time.monotonic() - checked < tigerGraphTuning('roleCheckSeconds'):
+                return member
+            try:
+                member = self.username in connection.gsql(f"SHOW GRANTS OF ROLE {roleName}")
+            except Exception as error:
+                logger.error(f"Error checking role {roleName} of user {self.username}: {error}")
+                member = False
+            self._roleChecks[roleName] = (member, time.monotonic())
+            self.probes.setdefault("roles", {})[roleName] = member
+            return member
+
+    def getVersionString(self) -> str:
+        """Database version string (e.g. release_4.2.0_...), probed at startup"""
+        connection = self.getConnection()
+        if not self.probes.get("version"):
+            results = connection.getVersion()
+            self.probes["version"] = results[0]['version'] if len(results) > 0 else ""
+        return self.probes["version"]
     #
     # This is a internal function that is called as part of the initialization process
     # If there is no Graph, create one and assign secrect and token to user.
     #
     def _createGraph(self) -> bool:
         resultSet = {}
-        resultSet = self.getConnection().gsql("CREATE GRAPH "+ self.graphName + "(*)")
+        resultSet = self.conn.gsql("CREATE GRAPH "+ self.graphName + "(*)")
         logger.info(resultSet)
         if isinstance(resultSet,str):
             if (resultSet.find("created") >=0):
@@ -110,7 +284,7 @@ class TigerGraph_Session():
     # already exists.
     #
     def secretsExists(self):
-        results = self.getConnection().getSecrets()
+        results = self.conn.getSecrets()
         if (results.get(self.getSecretAlias(),None) is None):
             self._createSecret(self.getSecretAlias())
         else:
@@ -128,7 +302,7 @@ class TigerGraph_Session():
             # Create a Secret, assign it an alias name
             #                     
             if (len(aliasName) > 0):
-                    self._secret = self.getConnection().createSecret(alias=aliasName)
+                    self._secret = self.conn.createSecret(alias=aliasName)
                     update_Flag=True
                     self._token = ""
                     #print("Secret =",self._secret)
@@ -136,13 +310,14 @@ class TigerGraph_Session():
             # Create a token with default of 30 day expiration
             #            
             if (self._secret is not None):
-                tokenTuple = self.getConnection().getToken('',lifetime=int(expirationDate))
+                requestedAt = time.time()
+                tokenTuple = self.conn.getToken('',lifetime=int(expirationDate))
                 update_Flag=True
                 self._token = tokenTuple[0]
-                self.getConnection().apiToken = self._token
+                self.tokenManager.adopt(self._token, tokenExpiration(tokenTuple, requestedAt, int(expirationDate)))
                 #print("New Token =", tokenTuple)
             else:
-                self.getConnection().apiToken = self._token
+                self.conn.apiToken = self._token
         
             # 
             # Update configuration .env file
@@ -150,6 +325,7 @@ class TigerGraph_Session():
             if (update_Flag == True):
                 set_Constents('secret',self._secret, TG_SYSTEM)
                 set_Constents('token',self._token, TG_SYSTEM)
+                set_Constents('tokenExpiration', str(int(self.tokenManager.expiration or 0)), TG_SYSTEM)
                         
 
         except LookupError as error:
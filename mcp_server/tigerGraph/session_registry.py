@@ -0,0 +1,208 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+#
+# session_registry.py: This modelue defines the SessionRegistry class that
+# opens connections to further graphs of the TigerGraph server on first use
+# and closes them when idle, and the graphTool wrapper that adds the optional
+# graph argument to MCP tools
+#******************************************************************************
+import time
+import inspect
+import functools
+import threading
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+from mcp_server.config import tigerGraphTuning
+from mcp_server.mcp_logger import setErrorHandler, logger
+from mcp_server.tigerGraph.instrumented_connection import InstrumentedConnection
+from mcp_server.tigerGraph.token_manager import applyToken
+
+if TYPE_CHECKING:
+    from mcp_server.tigerGraph.session import TigerGraph_Session
+
+#
+# Graph of the tool call being served, None for the TG_GRAPH of the session
+#
+currentGraph:ContextVar[Optional[str]] = ContextVar("currentGraph", default=None)
+
+
+@contextmanager
+def useGraph(graph:Optional[str]):
+    """Run the block (and the worker threads it starts with the copied context) against graph"""
+    token = currentGraph.set(graph or None)
+    try:
+        yield
+    finally:
+        currentGraph.reset(token)
+
+
+def shareHttpPool(connection:InstrumentedConnection, primary:InstrumentedConnection):
+    """Let connection use the per-thread HTTP sessions (and their sockets) of the primary connection"""
+    local = getattr(primary.unwrap(), "_local", None)
+    if local is not None:
+        connection.unwrap()._local = local
+
+
+class GraphConnection():
+
+    def __init__(self, graph:str, connection:InstrumentedConnection):
+        self.graph = graph
+        self.connection = connection
+        self.opened = time.time()
+        self.lastUsed = self.opened
+        self.calls = 0
+
+
+class SessionRegistry():
+    """
+    Connections to the graphs other than TG_GRAPH, opened the first time a tool call names the
+    graph. They authenticate with the session token (kept fresh by its TokenManager) and share
+    the HTTP sessions of the primary connection. A graph unused for TG_GRAPH_IDLE_SECONDS is
+    closed, and when TG_MAX_GRAPHS graphs are open the least recently used one makes room.
+    """
+    def __init__(self, session:'TigerGraph_Session', idleSeconds:Optional[int]=None, maxGraphs:Optional[int]=None):
+        setErrorHandler()
+        self.session = session
+        self.idleSeconds = tigerGraphTuning('graphIdleSeconds') if idleSeconds is None else idleSeconds
+        self.maxGraphs = tigerGraphTuning('maxGraphs') if maxGraphs is None else maxGraphs
+        self._graphs:Dict[str, GraphConnection] = {}
+        # held only for bookkeeping, never across a call to the TigerGraph server
+        self._lock = threading.Lock()
+        self._callbacks:List[Callable[[str], None]] = []
+        self._watching = False
+        self._stopWatcher = threading.Event()
+        self._watcher:Optional[threading.Thread] = None
+
+    def onEvict(self, callback:Callable[[str], None]):
+        """Call callback(graph) when the connection to graph is closed (to drop its cached metadata)"""
+        self._callbacks.append(callback)
+
+    def connection(self, graph:str) -> InstrumentedConnection:
+        with self._lock:
+            entry = self._use(graph)
+            if entry is not None:
+                return entry.connection
+        # checking the graph exists is a server call: made without the lock, so a slow graph
+        # does not hold up the calls to the graphs already open
+        connection = self._open(graph)
+        with self._lock:
+            entry = self._use(graph)
+            if entry is not None:
+                # another call opened the graph meanwhile
+                return entry.connection
+            self._makeRoom(self.maxGraphs - 1)
+            entry = self._graphs[graph] = GraphConnection(graph, connection)
+            logger.info(f"Opened connection to graph {graph}")
+            return self._use(graph).connection
+
+    def _use(self, graph:str) -> Optional[GraphConnection]:
+        entry = self._graphs.get(graph)
+        if entry is not None:
+            entry.lastUsed = time.time()
+            entry.calls += 1
+        return entry
+
+    def _open(self, graph:str) -> InstrumentedConnection:
+        primary = self.session.connections()[0]
+        if primary.check_exist_graphs(graph) is False:
+            raise ValueError(f"Graph {graph} does not exist on {self.session.getHost()}")
+        connection = self.session.newConnection(graph=graph)
+        shareHttpPool(connection, primary)
+        if self.session.tokenManager.token:
+            applyToken(connection, self.session.tokenManager.token)
+        return connection
+
+    def _makeRoom(self, size:int):
+        """Close the least recently used graphs until at most size are open (maxGraphs 0 = no limit)"""
+        while self.maxGraphs > 0 and self._graphs and len(self._graphs) > max(0, size):
+            self._evict(min(self._graphs.values(), key=lambda entry: entry.lastUsed).graph)
+
+    def _evict(self, graph:str):
+        self._graphs.pop(graph, None)
+        logger.info(f"Closed connection to graph {graph}")
+        for callback in self._callbacks:
+            try:
+                callback(graph)
+            except Exception as error:
+                logger.error(f"Error releasing graph {graph}: {error}")
+
+    def evictIdle(self) -> List[str]:
+        """Close the connections unused for idleSeconds, returns their graphs"""
+        if self.idleSeconds <= 0:
+            return []
+        cutoff = time.time() - self.idleSeconds
+        with self._lock:
+            idle = [graph for graph, entry in self._graphs.items() if entry.lastUsed < cutoff]
+            for graph in idle:
+                self._evict(graph)
+        return idle
+
+    def startWatcher(self):
+        """Check for idle graphs on a daemon thread, a few times per TG_GRAPH_IDLE_SECONDS"""
+        self._watching = True
+        if self.idleSeconds <= 0 or self._watcher is not None:
+            return
+
+        def watch(stopped:threading.Event):
+            while not stopped.wait(max(1.0, min(60.0, self.idleSeconds / 4))):
+                self.evictIdle()
+
+        self._stopWatcher = threading.Event()
+        self._watcher = threading.Thread(target=watch, args=(self._stopWatcher,), name="graph-registry-watcher",
+                                         daemon=True)
+        self._watcher.start()
+
+    def stopWatcher(self):
+        self._stopWatcher.set()
+        self._watcher = None
+
+    def reconfigure(self):
+        """Apply new TG_GRAPH_IDLE_SECONDS / TG_MAX_GRAPHS settings to the open graphs"""
+        self.idleSeconds = tigerGraphTuning('graphIdleSeconds')
+        self.maxGraphs = tigerGraphTuning('maxGraphs')
+        with self._lock:
+            self._makeRoom(self.maxGraphs)
+        if self.idleSeconds <= 0:
+            self.stopWatcher()
+        elif self._watching:
+            self.startWatcher()
+        self.evictIdle()
+
+    def connections(self) -> List[InstrumentedConnection]:
+        with self._lock:
+            return [entry.connection for entry in self._graphs.values()]
+
+    def status(self) -> List[dict]:
+        now = time.time()
+        with self._lock:
+            return [{"graph": entry.graph, "calls": entry.calls, "openSeconds": round(now - entry.opened, 1),
+                     "idleSeconds": round(now - entry.lastUsed, 1)} for entry in self._graphs.values()]
+
+
+def graphTool(func):
+    """
+    Add an optional graph argument to an MCP tool: the call runs against that graph of the
+    TigerGraph server instead of TG_GRAPH.
+    """
+    signature = inspect.signature(func)
+    parameter = inspect.Parameter("graph", inspect.Parameter.KEYWORD_ONLY, default="", annotation=str)
+    parameters = [p for p in signature.parameters.values() if p.kind != inspect.Parameter.VAR_KEYWORD]
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def wrapper(*args, graph:str="", **kwargs):
+            with useGraph(graph):
+                return await func(*args, **kwargs)
+    else:
+        @functools.wraps(func)
+        def wrapper(*args, graph:str="", **kwargs):
+            with useGraph(graph):
+                return func(*args, **kwargs)
+
+    wrapper.__signature__ = signature.replace(parameters=parameters + [parameter])
+    wrapper.__doc__ = (f"{func.__doc__ or ''}\n    graph: Optional name of the graph to use instead of the "
+                       f"server's default graph (TG_GRAPH).")
+    return wrapper
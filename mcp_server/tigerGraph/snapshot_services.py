@@ -0,0 +1,340 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+#
+# snapshot_services.py: This modelue defines the SnapshotServices class for
+# materializing TigerGraph subgraphs into local GraphSnapshot files and
+# running offline analytics over them
+#******************************************************************************
+import re
+import json
+import time
+import datetime
+import threading
+import numpy as np
+
+from pathlib import Path
+from typing import Dict, List, Tuple
+from mcp_server.tigerGraph.session import TigerGraph_Session
+from mcp_server.tigerGraph.graph_snapshot import GraphSnapshot, MANIFEST_FILE
+from mcp_server.mcp_logger import setErrorHandler, logger
+
+SNAPSHOT_DIR = "snapshots"
+WRITE_LOG_FILE = "write_log.jsonl"
+WATERMARK_WRITELOG = "writelog"
+WATERMARK_ATTRIBUTE = "attribute"
+
+
+class SnapshotWriteLog():
+    """
+    Append only JSONL log of the vertices / edges written through this server
+    (upsert_vertex / upsert_edge). Snapshots remember the byte offset they have
+    been synchronized to, and refresh by reading the log from that offset.
+    """
+    def __init__(self, logFile:Path):
+        self.logFile = logFile
+        self.lock = threading.Lock()
+
+    def size(self) -> int:
+        return self.logFile.stat().st_size if self.logFile.exists() else 0
+
+    def append(self, record:dict):
+        record["ts"] = datetime.datetime.now().isoformat(timespec='seconds')
+        with self.lock:
+            with open(self.logFile, 'a', encoding='utf-8') as file:
+                file.write(json.dumps(record) + "\n")
+
+    def read(self, offset:int) -> Tuple[List[dict], int]:
+        """Return (records written after offset, new offset)"""
+        if not self.logFile.exists():
+            return ([], offset)
+        records = []
+        with self.lock:
+            with open(self.logFile, 'rb') as file:
+                file.seek(offset)
+                for line in file:
+                    if line.strip():
+                        records.append(json.loads(line))
+                end = file.tell()
+        return (records, end)
+
+
+class SnapshotServices():
+
+    def __init__(self, session:TigerGraph_Session, outputPath:str):
+        setErrorHandler()
+        self.session = session
+        self.snapshot_path = Path(outputPath) / SNAPSHOT_DIR
+        self.snapshots:Dict[str, GraphSnapshot] = {}
+        self.writeLog = SnapshotWriteLog(self.snapshot_path / WRITE_LOG_FILE)
+
+    def recordVertexWrite(self, vertex_type:str, vertex_id:str):
+        """Called by upsert_vertex so snapshots can be refreshed incrementally"""
+        if self.snapshot_path.exists():
+            self.writeLog.append({"kind": "vertex", "v_type": vertex_type, "v_id": str(vertex_id)})
+
+    def recordEdgeWrite(self, source_type:str, source_id:str, edge_type:str, target_type:str, target_id:str):
+        """Called by upsert_edge so snapshots can be refreshed incrementally"""
+        if self.snapshot_path.exists():
+            self.writeLog.append({"kind": "edge", "e_type": edge_type, "from_type": source_type,
+                                  "from_id": str(source_id), "to_type": target_type, "to_id": str(target_id)})
+
+    def getSnapshotDir(self, snapshot_name:str) -> Path:
+        if not re.match(r'^[A-Za-z0-9_\-]+$', snapshot_name):
+            raise ValueError(f"Invalid snapshot name '{snapshot_name}', use letters, digits, '_' or '-'")
+        return self.snapshot_path / snapshot_name
+
+    def getSnapshot(self, snapshot_name:str) -> GraphSnapshot:
+        """Return a snapshot from memory, memory-mapping it from disk on first use"""
+        snapshot = self.snapshots.get(snapshot_name)
+        if snapshot is None:
+            directory = self.getSnapshotDir(snapshot_name)
+            if not (directory / MANIFEST_FILE).exists():
+                raise LookupError(f"Snapshot '{snapshot_name}' not found in {self.snapshot_path}")
+            snapshot = GraphSnapshot.load(directory)
+            self.snapshots[snapshot_name] = snapshot
+        return snapshot
+
+    def createSnapshot(self, snapshot_name:str, vertex_types:List[str], edge_types:List[str],
+                       watermark_attributes:Dict[str, str]={}) -> str:
+        """
+        Read the selected vertex & edge types from TigerGraph and persist them as a snapshot.
+        watermark_attributes maps a vertex type to a timestamp (or monotonically increasing)
+        attribute used by refreshSnapshot(); all other types are refreshed from the write log.
+        """
+        try:
+            start = time.perf_counter()
+            self.snapshot_path.mkdir(parents=True, exist_ok=True)
+            logOffset = self.writeLog.size()
+            conn = self.session.getConnection()
+            vertices = []
+            for vertexType in vertex_types:
+                for vertex in conn.getVertices(vertexType, withType=True):
+                    vertex.setdefault("v_type", vertexType)
+                    vertices.append(vertex)
+            edges = []
+            for edgeType in edge_types:
+                for edge in conn.getEdgesByType(edgeType):
+                    edge.setdefault("e_type", edgeType)
+                    edges.append(edge)
+            fetched = time.perf_counter()
+
+            snapshot = GraphSnapshot.fromRecords(snapshot_name, vertices, edges)
+            snapshot.watermarks = self._initialWatermarks(vertex_types, edge_types, watermark_attributes,
+                                                          vertices, logOffset)
+            directory = snapshot.save(self.getSnapshotDir(snapshot_name))
+            self.snapshots[snapshot_name] = GraphSnapshot.load(directory)
+
+            summary = snapshot.summary()
+            summary["fetchSeconds"] = round(fetched - start, 3)
+            summary["buildSeconds"] = round(time.perf_counter() - fetched, 3)
+            summary["path"] = str(directory)
+            return json.dumps(summary, indent=4, separators=(',', ':'))
+
+        except Exception as error:
+            logger.error(f"Error in createSnapshot(): {error}")
+            return f"Error creating snapshot {snapshot_name}: {error}"
+
+    def refreshSnapshot(self, snapshot_name:str) -> str:
+        """
+        Incrementally synchronize a snapshot: fetch only the vertices / edges changed since
+        each type's watermark, patch numeric attributes in place and compact the CSR arrays
+        when vertices or edges were added.
+        """
+        try:
+            start = time.perf_counter()
+            directory = self.getSnapshotDir(snapshot_name)
+            if not (directory / MANIFEST_FILE).exists():
+                raise LookupError(f"Snapshot '{snapshot_name}' not found in {self.snapshot_path}")
+            snapshot = GraphSnapshot.load(directory, writable=True)
+            conn = self.session.getConnection()
+
+            logRecords, logOffset = self.writeLog.read(min([w.get("offset", 0) for w in snapshot.watermarks.values()
+                                                            if w.get("mode") == WATERMARK_WRITELOG] or [0]))
+            vertices = []
+            for vertexType, watermark in snapshot.watermarks.items():
+                if vertexType in snapshot.edgeTypes:
+                    continue
+                if watermark.get("mode") == WATERMARK_ATTRIBUTE:
+                    vertices.extend(self._fetchChangedVertices(conn, vertexType, watermark))
+                else:
+                    ids = list(dict.fromkeys(r.get("v_id") for r in logRecords
+                                             if r.get("kind") == "vertex" and r.get("v_type") == vertexType))
+                    if ids:
+                        for vertex in conn.getVerticesById(vertexType, ids):
+                            vertex.setdefault("v_type", vertexType)
+                            vertices.append(vertex)
+                    watermark["offset"] = logOffset
+
+            edges = []
+            for edgeType in snapshot.edgeTypes:
+                watermark = snapshot.watermarks.setdefault(edgeType, {"mode": WATERMARK_WRITELOG, "offset": 0})
+                written = {(r.get("from_type"), r.get("from_id"), r.get("to_type"), r.get("to_id")): r for r in logRecords
+                           if r.get("kind") == "edge" and r.get("e_type") == edgeType}
+                for (fromType, fromId, toType, toId) in written.keys():
+                    for edge in conn.getEdges(fromType, fromId, edgeType, toType, toId):
+                        edge.setdefault("e_type", edgeType)
+                        edges.append(edge)
+                watermark["offset"] = logOffset
+            fetched = time.perf_counter()
+
+            stats = snapshot.applyDelta(vertices, edges)
+            compacted = snapshot.hasPendingChanges()
+            if compacted:
+                snapshot.compact()
+                snapshot.save(directory)
+            else:
+                snapshot.flush()
+                snapshot.saveManifest(directory)
+            self.snapshots[snapshot_name] = GraphSnapshot.load(directory)
+
+            stats.update({
+                "snapshot": snapshot_name,
+                "fetchedVertices": len(vertices),
+                "fetchedEdges": len(edges),
+                "compacted": compacted,
+                "vertices": snapshot.vertexCount,
+                "edges": snapshot.edgeCount,
+                "fetchSeconds": round(fetched - start, 3),
+                "refreshSeconds": round(time.perf_counter() - start, 3),
+            })
+            return json.dumps(stats, indent=4, separators=(',', ':'))
+
+        except Exception as error:
+            logger.error(f"Error in refreshSnapshot(): {error}")
+            return f"Error refreshing snapshot {snapshot_name}: {error}"
+
+    def _initialWatermarks(self, vertex_types:List[str], edge_types:List[str], watermark_attributes:Dict[str, str],
+                           vertices:List[dict], logOffset:int) -> dict:
+        watermarks = {}
+        for vertexType in vertex_types:
+            attribute = watermark_attributes.get(vertexType, "")
+            if attribute:
+                values = {str(v.get("v_id")): v.get("attributes", {}).get(attribute) for v in vertices
+                          if v.get("v_type") == vertexType and v.get("attributes", {}).get(attribute) is not None}
+                latest = max(values.values()) if values else None
+                watermarks[vertexType] = {"mode": WATERMARK_ATTRIBUTE, "attribute": attribute, "value": latest,
+                                          "ids": sorted(vertexId for vertexId, value in values.items() if value == latest)}
+            else:
+                watermarks[vertexType] = {"mode": WATERMARK_WRITELOG, "offset": logOffset}
+        for edgeType in edge_types:
+            watermarks[edgeType] = {"mode": WATERMARK_WRITELOG, "offset": logOffset}
+        return watermarks
+
+    def _fetchChangedVertices(self, conn, vertexType:str, watermark:dict) -> List[dict]:
+        """
+        Fetch the vertices whose watermark attribute is >= the watermark. Rows written later in the
+        same tick as the watermark are picked up, the ones already applied at it are skipped by id.
+        """
+        attribute = watermark.get("attribute")
+        value = watermark.get("value")
+        if value is None:
+            where = ""
+        elif isinstance(value, (int, float)):
+            where = f"{attribute}>={value}"
+        else:
+            where = f'{attribute}>="{value}"'
+        seen = set(watermark.get("ids", []))
+        changed = {}
+        for vertex in conn.getVertices(vertexType, where=where, withType=True):
+            current = vertex.get("attributes", {}).get(attribute)
+            vertexId = str(vertex.get("v_id"))
+            if value is not None and current == value and vertexId in seen:
+                continue
+            vertex.setdefault("v_type", vertexType)
+            changed[vertexId] = vertex
+        for vertexId, vertex in changed.items():
+            current = vertex.get("attributes", {}).get(attribute)
+            if current is None:
+                continue
+            if watermark.get("value") is None or current > watermark.get("value"):
+                watermark["value"] = current
+                seen = set()
+            if current == watermark["value"]:
+                seen.add(vertexId)
+        watermark["ids"] = sorted(seen)
+        return list(changed.values())
+
+    def listSnapshots(self) -> List[str]:
+        status:List[str] = []
+        if self.snapshot_path.exists():
+            for manifest in sorted(self.snapshot_path.glob(f"*/{MANIFEST_FILE}")):
+                try:
+                    with open(manifest, 'r', encoding='utf-8') as file:
+                        info = json.load(file)
+                    status.append(f"{info.get('name'):<25} {info.get('vertexCount'):>10,} vertices "
+                                  f"{info.get('edgeCount'):>12,} edges  {info.get('created')}")
+                except Exception as error:
+                    logger.error(f"Error reading snapshot manifest {manifest}: {error}")
+        return status
+
+    def snapshotDegree(self, snapshot_name:str, vertex_type:str="", top_k:int=10) -> str:
+        try:
+            snapshot = self.getSnapshot(snapshot_name)
+            mask = snapshot.typeMask(vertex_type)
+            outDegree = snapshot.outDegree()
+            inDegree = snapshot.inDegree()
+            selected = np.flatnonzero(mask)
+            ranked = selected[np.argsort(-outDegree[selected], kind='stable')[:top_k]]
+            results = {
+                "snapshot": snapshot_name,
+                "vertexType": vertex_type if vertex_type else "*",
+                "vertices": int(selected.size),
+                "maxOutDegree": int(outDegree[selected].max()) if selected.size else 0,
+                "avgOutDegree": float(outDegree[selected].mean()) if selected.size else 0.0,
+                "top": [self._vertexEntry(snapshot, i, outDegree=int(outDegree[i]), inDegree=int(inDegree[i]))
+                        for i in ranked],
+            }
+            return json.dumps(results, indent=4, separators=(',', ':'))
+
+        except Exception as error:
+            logger.error(f"Error in snapshotDegree(): {error}")
+            return f"Error computing degree on snapshot {snapshot_name}: {error}"
+
+    def snapshotBFS(self, snapshot_name:str, vertex_type:str, vertex_id:str, max_depth:int=3, limit:int=100) -> str:
+        try:
+            snapshot = self.getSnapshot(snapshot_name)
+            source = snapshot.lookup(vertex_type, vertex_id)
+            if source < 0:
+                return f"Vertex {vertex_type}:{vertex_id} not found in snapshot {snapshot_name}"
+
+            distance = snapshot.bfs(source, max_depth)
+            reached = np.flatnonzero(distance >= 0)
+            reached = reached[np.argsort(distance[reached], kind='stable')]
+            levels = np.bincount(distance[reached])
+            results = {
+                "snapshot": snapshot_name,
+                "source": f"{vertex_type}:{vertex_id}",
+                "reached": int(reached.size),
+                "levels": {str(depth): int(count) for depth, count in enumerate(levels)},
+                "vertices": [self._vertexEntry(snapshot, i, distance=int(distance[i])) for i in reached[:limit]],
+            }
+            return json.dumps(results, indent=4, separators=(',', ':'))
+
+        except Exception as error:
+            logger.error(f"Error in snapshotBFS(): {error}")
+            return f"Error running BFS on snapshot {snapshot_name}: {error}"
+
+    def snapshotPageRank(self, snapshot_name:str, vertex_type:str="", top_k:int=10,
+                         damping:float=0.85, max_iter:int=100) -> str:
+        try:
+            snapshot = self.getSnapshot(snapshot_name)
+            ranks, iterations = snapshot.pagerank(damping=damping, max_iter=max_iter)
+            selected = np.flatnonzero(snapshot.typeMask(vertex_type))
+            ranked = selected[np.argsort(-ranks[selected], kind='stable')[:top_k]]
+            results = {
+                "snapshot": snapshot_name,
+                "iterations": iterations,
+                "top": [self._vertexEntry(snapshot, i, score=float(ranks[i])) for i in ranked],
+            }
+            return json.dumps(results, indent=4, separators=(',', ':'))
+
+        except Exception as error:
+            logger.error(f"Error in snapshotPageRank(): {error}")
+            return f"Error running PageRank on snapshot {snapshot_name}: {error}"
+
+    def _vertexEntry(self, snapshot:GraphSnapshot, position:int, **values) -> dict:
+        vertexType, vertexId = snapshot.vertexKey(position)
+        entry = {"v_type": vertexType, "v_id": vertexId}
+        entry.update(values)
+        return entry
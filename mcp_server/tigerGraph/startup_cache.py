@@ -0,0 +1,61 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+#
+# startup_cache.py: This modelue defines the StartupCache class that keeps the
+# results of the session startup probes (graph existence, database version)
+# on disk so server restarts can skip them
+#******************************************************************************
+import os
+import json
+import time
+
+from typing import Optional
+from mcp_server.config import tigerGraphConstants, tigerGraphTuning
+from mcp_server.mcp_logger import setErrorHandler, logger
+
+CACHE_FILE = ".startup_cache.json"
+
+
+class StartupCache():
+    """
+    A small JSON file (<output dir>/.startup_cache.json) holding the probe results of the last
+    startup for one host / graph / user. Entries older than TG_STARTUP_CACHE_TTL seconds, or saved
+    for another host, graph or user, are ignored; a TTL of 0 disables the cache.
+    """
+    def __init__(self, identity:str, cacheFile:Optional[str]=None, ttl:Optional[int]=None):
+        setErrorHandler()
+        self.identity = identity
+        self.ttl = tigerGraphTuning('startupCacheTTL') if ttl is None else ttl
+        self.cacheFile = cacheFile or os.path.join(tigerGraphConstants(output=True), CACHE_FILE)
+
+    def load(self) -> dict:
+        """Cached probe results, empty when missing, stale or for another identity"""
+        if self.ttl <= 0 or not os.path.exists(self.cacheFile):
+            return {}
+        try:
+            with open(self.cacheFile, 'r', encoding='utf-8') as file:
+                content = json.load(file)
+            if content.get("identity") != self.identity or time.time() - content.get("savedAt", 0) > self.ttl:
+                return {}
+            return content.get("probes", {})
+        except Exception as error:
+            logger.error(f"Error reading startup cache {self.cacheFile}: {error}")
+            return {}
+
+    def save(self, probes:dict):
+        if self.ttl <= 0:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cacheFile) or ".", exist_ok=True)
+            temporary = f"{self.cacheFile}.tmp"
+            with open(temporary, 'w', encoding='utf-8') as file:
+                json.dump({"identity": self.identity, "savedAt": time.time(), "probes": probes}, file,
+                          indent=4, separators=(',', ':'))
+            os.replace(temporary, self.cacheFile)
+        except Exception as error:
+            logger.error(f"Error writing startup cache {self.cacheFile}: {error}")
+
+    def clear(self):
+        if os.path.exists(self.cacheFile):
+            os.remove(self.cacheFile)
@@ -13,16 +13,22 @@ from mcp_server.mcp_logger import setErrorHandler, logger
 
 class SystemUtilities:
 
-    def __init__(self,session:TigerGraph_Session):
+    def __init__(self,session:TigerGraph_Session, lazy:bool=False):
         self.session = session
         setErrorHandler()
-        self.version = self.extractVersionNumber()
+        self._version = None if lazy else self.extractVersionNumber()
+
+    @property
+    def version(self) -> float:
+        """Database version, read on first use when the session is lazy"""
+        if self._version is None:
+            self._version = self.extractVersionNumber()
+        return self._version
 
     def extractVersionNumber(self) -> float:
         try:
-            results = self.session.getConnection().getVersion()
-            if (len(results) > 0):
-                versionString = results[0]['version']
+            versionString = self.session.getVersionString()
+            if (len(versionString) > 0):
                 versionNumber = (versionString.split("_"))[1]
                 version = versionNumber.split(".")
                 versionNumber = f"{version[0]}.{version[1]}"
@@ -120,6 +126,15 @@ class SystemUtilities:
             logger.error(f"ERROR in Aborting Jobs: {error}")
 
 
+    def getRunningQueries(self) -> List[dict]:
+        """Queries currently running on the graph (requestid, url, startTime, elapsedTime ms, ...)"""
+        results = self.session.getConnection().getRunningQueries()
+        return results.get("results", []) if isinstance(results, dict) else []
+
+    def abortQuery(self, request_id:str) -> dict:
+        """Abort one running query by its TigerGraph request id"""
+        return self.session.getConnection().abortQuery(request_id=request_id)
+
     def checkGraphExists(self) -> bool:
 
       try:
@@ -0,0 +1,174 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+#
+# token_manager.py: This modelue defines the TokenManager class that tracks
+# the expiry of the TigerGraph API token and refreshes it in the background
+# before it expires
+#******************************************************************************
+import time
+import threading
+
+from typing import TYPE_CHECKING, Callable, List, Optional
+from mcp_server.config import settings, set_Constents, tigerGraphTuning, TG_SYSTEM
+from mcp_server.mcp_logger import setErrorHandler, logger
+
+if TYPE_CHECKING:
+    from mcp_server.tigerGraph.session import TigerGraph_Session
+
+RETRY_MIN = 30
+RETRY_MAX = 3600
+
+
+def tokenExpiration(token, requestedAt:float, lifetime:int) -> float:
+    """
+    Expiry (epoch seconds) of a getToken() result: the unix timestamp returned by TigerGraph 3.x,
+    otherwise (4.x returns a local time string) the request time plus the requested lifetime.
+    """
+    expiration = requestedAt + lifetime
+    if isinstance(token, tuple) and len(token) > 1:
+        try:
+            return min(expiration, float(token[1]))
+        except (TypeError, ValueError):
+            pass
+    return expiration
+
+
+def applyToken(connection, token:str):
+    """Switch a connection to token: the auth header is rebuilt and swapped in as a new object"""
+    connection.apiToken = token
+    connection.authHeader = {"Authorization": "Bearer " + token}
+    refreshHeaders = getattr(connection, "_refresh_auth_headers", None)
+    if callable(refreshHeaders):
+        refreshHeaders()
+
+
+class TokenManager():
+    """
+    Keeps the API token of a session valid. The token expiry is taken from getToken() or
+    TG_TOKEN_EXPIRATION; TG_TOKEN_REFRESH_BEFORE seconds before it a background thread requests a
+    new token (lifetime TG_TOKEN_LIFETIME) for the session secret on a separate connection, then swaps
+    it into every connection of the session and writes it to the .env file. Requests already in
+    flight keep the header they were sent with; nothing waits for a refresh.
+    """
+    def __init__(self, session:'TigerGraph_Session', connections:Optional[Callable[[], List]]=None):
+        setErrorHandler()
+        self.session = session
+        self.connections = connections or session.connections
+        self.lifetime = tigerGraphTuning('tokenLifetime')
+        self.refreshBefore = tigerGraphTuning('tokenRefreshBefore')
+        self.token:str = session._token
+        self.expiration:Optional[float] = self.parseExpiration(settings.tokenExpiration)
+        self.lastRefresh:Optional[float] = None
+        self.refreshes = 0
+        self.failures = 0
+        self.lastError:Optional[str] = None
+        self._refreshLock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread:Optional[threading.Thread] = None
+
+    @staticmethod
+    def parseExpiration(value) -> Optional[float]:
+        try:
+            return float(value) if value not in (None, "") else None
+        except (TypeError, ValueError):
+            return None
+
+    def reconfigure(self):
+        """Apply new TG_TOKEN_LIFETIME / TG_TOKEN_REFRESH_BEFORE settings, rescheduling the next refresh"""
+        self.lifetime = tigerGraphTuning('tokenLifetime')
+        self.refreshBefore = tigerGraphTuning('tokenRefreshBefore')
+        self._wake.set()
+
+    def refreshAt(self) -> float:
+        """When the next refresh is due (now, when the expiry of the token is unknown)"""
+        if self.expiration is None:
+            return time.time()
+        return self.expiration - self.refreshBefore
+
+    def adopt(self, token:str, expiration:Optional[float], persist:bool=False):
+        """Use token (valid until expiration) on every connection of the session"""
+        if token == self.token and expiration == self.expiration:
+            return
+        for connection in self.connections():
+            applyToken(connection, token)
+        self.token = token
+        self.session._token = token
+        self.expiration = expiration
+        if persist:
+            set_Constents('token', token, TG_SYSTEM)
+            set_Constents('tokenExpiration', str(int(expiration)) if expiration else "", TG_SYSTEM)
+        # reschedule the background refresh for the new expiry
+        self._wake.set()
+
+    def refresh(self) -> bool:
+        """Request a new token for the session secret and swap it in; False when the request failed"""
+        secret = self.session.getSecret()
+        if not secret:
+            self.lastError = "no TigerGraph secret to request a token with"
+            return False
+        with self._refreshLock:
+            requestedAt = time.time()
+            try:
+                # a separate connection, so the live ones only ever see the finished token
+                result = self.session.newConnection().getToken(secret, lifetime=self.lifetime)
+                token = result[0] if isinstance(result, tuple) else result
+                self.adopt(token, tokenExpiration(result, requestedAt, self.lifetime), persist=True)
+                self.lastRefresh = time.time()
+                self.refreshes += 1
+                self.lastError = None
+                logger.info(f"TigerGraph API token refreshed, valid until {time.ctime(self.expiration)}")
+                return True
+            except Exception as error:
+                self.failures += 1
+                self.lastError = str(error)
+                logger.error(f"Error refreshing the TigerGraph API token: {error}")
+                return False
+
+    def ensureValid(self):
+        """Refresh now, before the session is used, when the token is known to have expired"""
+        if self.expiration is not None and self.expiration <= time.time() and self.session.getSecret():
+            self.refresh()
+
+    def start(self):
+        """Start the background refresh thread (a session without secret cannot refresh its token)"""
+        if self._thread is not None:
+            return
+        if not self.session.getSecret():
+            logger.warning("No TigerGraph secret configured, the API token will not be refreshed")
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="tigergraph-token", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+        self._thread = None
+
+    def _run(self):
+        retry = RETRY_MIN
+        while not self._stopped.is_set():
+            delay = self.refreshAt() - time.time()
+            if delay > 0:
+                self._wake.wait(delay)
+                self._wake.clear()
+                continue
+            if self.refresh():
+                retry = RETRY_MIN
+                continue
+            # keep the current token and try again, sooner as the expiry gets closer
+            remaining = (self.expiration - time.time()) if self.expiration else RETRY_MAX
+            self._wake.wait(max(RETRY_MIN / 6, min(retry, RETRY_MAX, remaining / 4)))
+            self._wake.clear()
+            retry = min(retry * 2, RETRY_MAX)
+
+    def status(self) -> dict:
+        now = time.time()
+        return {"running": self._thread is not None, "expiration": time.ctime(self.expiration) if self.expiration else None,
+                "expiresInSeconds": round(self.expiration - now) if self.expiration else None,
+                "nextRefreshInSeconds": max(0, round(self.refreshAt() - now)),
+                "lifetimeSeconds": self.lifetime, "refreshBeforeSeconds": self.refreshBefore,
+                "lastRefresh": time.ctime(self.lastRefresh) if self.lastRefresh else None,
+                "refreshes": self.refreshes, "failures": self.failures, "lastError": self.lastError}
@@ -0,0 +1,250 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+#
+# vector_services.py: This modelue defines the VectorServices class for
+# bulk loading VECTOR attributes from memory-mapped NumPy (.npy) files and
+# running batched top-k vector similarity searches
+#******************************************************************************
+import json
+import time
+import itertools
+import numpy as np
+
+from pathlib import Path
+from typing import Dict, Iterator, List
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from mcp_server.config import tigerGraphTuning
+from mcp_server.tigerGraph.session import TigerGraph_Session
+from mcp_server.mcp_logger import setErrorHandler, logger
+
+#
+# Interpreted GSQL query running the TigerGraph 4.2 vectorSearch() function
+#
+VECTOR_SEARCH_QUERY = """INTERPRET QUERY (LIST<FLOAT> query_vector, INT k) FOR GRAPH {graph} {{
+  MapAccum<VERTEX, FLOAT> @@distances;
+  results = vectorSearch({{{vertex_type}.{vector_attribute}}}, query_vector, k, {{distance_map: @@distances}});
+  PRINT results {with_vector};
+  PRINT @@distances AS distances;
+}}"""
+
+
+class VectorServices():
+
+    def __init__(self, session:TigerGraph_Session, outputPath:str):
+        setErrorHandler()
+        self.session = session
+        self.output_path = Path(outputPath)
+
+    def resolvePath(self, fileName:str) -> Path:
+        """Relative file names are resolved against the output directory"""
+        path = Path(fileName)
+        return path if path.is_absolute() else self.output_path / path
+
+    def getVectorDefinition(self, vertex_type:str, vector_attribute:str) -> dict:
+        """Return the embedding attribute definition (Name, Dimension, Metric, ...) from the schema"""
+        schema = self.session.getConnection().getSchema(force=True)
+        for vertexType in schema.get("VertexTypes", []):
+            if vertexType.get("Name") == vertex_type:
+                for vector in vertexType.get("EmbeddingAttributes", []):
+                    if vector.get("Name") == vector_attribute:
+                        return vector
+                raise LookupError(f"Vertex {vertex_type} has no VECTOR attribute {vector_attribute}")
+        raise LookupError(f"Vertex type {vertex_type} not found in graph schema")
+
+    def readIds(self, id_file:Path) -> Iterator[str]:
+        """Stream vertex ids from a .npy array or a text file with one id per line"""
+        if id_file.suffix == ".npy":
+            for vertexId in np.load(id_file, mmap_mode='r'):
+                yield str(vertexId)
+        else:
+            with open(id_file, 'r', encoding='utf-8') as file:
+                for line in file:
+                    if line.strip():
+                        yield line.strip()
+
+    def countIds(self, id_file:Path) -> int:
+        if id_file.suffix == ".npy":
+            return int(np.load(id_file, mmap_mode='r').shape[0])
+        with open(id_file, 'r', encoding='utf-8') as file:
+            return sum(1 for line in file if line.strip())
+
+    def loadVectors(self, vertex_type:str, vector_attribute:str, id_file:str, vector_file:str,
+                    batch_size:int=0, workers:int=0) -> str:
+        """
+        Upsert a VECTOR attribute for many vertices. vector_file is a 2-D .npy matrix that is
+        memory-mapped and read one batch of rows at a time; row i belongs to the i-th id of id_file.
+        """
+        try:
+            start = time.perf_counter()
+            batch_size = batch_size if batch_size > 0 else tigerGraphTuning('vectorBatchSize')
+            workers = workers if workers > 0 else tigerGraphTuning('vectorWorkers')
+            idPath = self.resolvePath(id_file)
+            matrix = np.load(self.resolvePath(vector_file), mmap_mode='r')
+            if matrix.ndim != 2:
+                raise ValueError(f"{vector_file} must be a 2-D matrix, found shape {matrix.shape}")
+
+            definition = self.getVectorDefinition(vertex_type, vector_attribute)
+            dimension = int(definition.get("Dimension", 0))
+            if matrix.shape[1] != dimension:
+                raise ValueError(f"{vector_file} has {matrix.shape[1]} columns but {vertex_type}.{vector_attribute} "
+                                 f"is defined with DIMENSION={dimension}")
+            idCount = self.countIds(idPath)
+            if idCount != matrix.shape[0]:
+                raise ValueError(f"{id_file} has {idCount} ids but {vector_file} has {matrix.shape[0]} rows")
+
+            conn = self.session.getConnection()
+            dtype = np.float64 if str(definition.get("DataType", "FLOAT")).upper() == "DOUBLE" else np.float32
+
+            def upsertBatch(ids:List[str], first:int) -> int:
+                rows = np.asarray(matrix[first:first + len(ids)], dtype=dtype)
+                if not np.isfinite(rows).all():
+                    raise ValueError(f"non finite values in rows {first}..{first + len(ids) - 1}")
+                conn.upsertVertices(vertex_type, [(vertexId, {vector_attribute: vector})
+                                                  for vertexId, vector in zip(ids, rows.tolist())])
+                return len(ids)
+
+            loaded = 0
+            batches = 0
+            errors:List[str] = []
+            ids = self.readIds(idPath)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                pending = set()
+                first = 0
+                while True:
+                    chunk = list(itertools.islice(ids, batch_size))
+                    if len(chunk) == 0:
+                        break
+                    pending.add(executor.submit(upsertBatch, chunk, first))
+                    first += len(chunk)
+                    # bound the number of batches held in memory
+                    if len(pending) >= workers * 2:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        loaded, batches = self._collect(done, loaded, batches, errors)
+                done, _ = wait(pending)
+                loaded, batches = self._collect(done, loaded, batches, errors)
+
+            elapsed = time.perf_counter() - start
+            results = {
+                "vertexType": vertex_type,
+                "vectorAttribute": vector_attribute,
+                "dimension": dimension,
+                "rows": int(matrix.shape[0]),
+                "loaded": loaded,
+                "batches": batches,
+                "errors": errors,
+                "seconds": round(elapsed, 3),
+                "rowsPerSecond": round(loaded / elapsed, 1) if elapsed > 0 else 0,
+            }
+            return json.dumps(results, indent=4, separators=(',', ':'))
+
+        except Exception as error:
+            logger.error(f"Error in loadVectors(): {error}")
+            return f"Error loading vectors into {vertex_type}.{vector_attribute}: {error}"
+
+    def vectorSearch(self, vertex_type:str, vector_attribute:str, query_vectors:List[List[float]], top_k:int=10,
+                     rerank:bool=False, candidate_k:int=0, filters:Dict[str, object]={}, workers:int=0) -> str:
+        """
+        Run one top-k vectorSearch() per query vector concurrently. With rerank (or filters) the
+        server returns candidate_k candidates (default 4 x top_k, at least top_k) including their
+        vectors, which are filtered on the attribute equality filters and re-ranked locally with
+        exact, vectorized NumPy distances. roundTripMs is the client side time of the search call.
+        """
+        try:
+            start = time.perf_counter()
+            workers = workers if workers > 0 else tigerGraphTuning('vectorWorkers')
+            definition = self.getVectorDefinition(vertex_type, vector_attribute)
+            dimension = int(definition.get("Dimension", 0))
+            metric = str(definition.get("Metric", "COSINE")).upper()
+            queries = np.asarray(query_vectors, dtype=np.float64)
+            if queries.ndim == 1:
+                queries = queries.reshape(1, -1)
+            if queries.ndim != 2 or queries.shape[1] != dimension:
+                raise ValueError(f"query vectors must have {dimension} values, found shape {queries.shape}")
+
+            local = rerank or len(filters) > 0
+            k = max(candidate_k if candidate_k > 0 else top_k * 4, top_k) if local else top_k
+            conn = self.session.getConnection()
+            queryText = VECTOR_SEARCH_QUERY.format(graph=conn.graphname, vertex_type=vertex_type,
+                                                   vector_attribute=vector_attribute,
+                                                   with_vector="WITH VECTOR" if local else "")
+
+            def search(index:int) -> dict:
+                searchStart = time.perf_counter()
+                output = conn.runInterpretedQuery(queryText, {"query_vector": queries[index].tolist(), "k": k})
+                roundTripSeconds = time.perf_counter() - searchStart
+                candidates, distances = self._parseSearchOutput(output)
+                if local:
+                    candidates = [c for c in candidates if all(c.get("attributes", {}).get(attr) == value
+                                                               for attr, value in filters.items())]
+                    hits = self.rankCandidates(queries[index], candidates, vector_attribute, metric, top_k)
+                else:
+                    hits = sorted(({"v_id": c.get("v_id"), "distance": distances.get(str(c.get("v_id")))}
+                                   for c in candidates), key=lambda hit: (hit["distance"] is None, hit["distance"]))
+                return {"query": index, "candidates": len(candidates), "results": hits[:top_k],
+                        "roundTripMs": round(roundTripSeconds * 1000, 2),
+                        "latencyMs": round((time.perf_counter() - searchStart) * 1000, 2)}
+
+            results = []
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for index, future in enumerate([executor.submit(search, i) for i in range(queries.shape[0])]):
+                    try:
+                        results.append(future.result())
+                    except Exception as error:
+                        logger.error(f"Error in vector search {index}: {error}")
+                        results.append({"query": index, "error": str(error)})
+
+            latencies = np.asarray([r["latencyMs"] for r in results if "latencyMs" in r])
+            summary = {
+                "vertexType": vertex_type,
+                "vectorAttribute": vector_attribute,
+                "metric": metric,
+                "queries": len(results),
+                "reranked": local,
+                "p50LatencyMs": round(float(np.percentile(latencies, 50)), 2) if latencies.size else None,
+                "maxLatencyMs": round(float(latencies.max()), 2) if latencies.size else None,
+                "seconds": round(time.perf_counter() - start, 3),
+                "results": results,
+            }
+            return json.dumps(summary, indent=4, separators=(',', ':'))
+
+        except Exception as error:
+            logger.error(f"Error in vectorSearch(): {error}")
+            return f"Error searching {vertex_type}.{vector_attribute}: {error}"
+
+    def rankCandidates(self, query:np.ndarray, candidates:List[dict], vector_attribute:str,
+                       metric:str, top_k:int) -> List[dict]:
+        """Exact distances between query and all candidate vectors in one matrix operation"""
+        candidates = [c for c in candidates if c.get("attributes", {}).get(vector_attribute)]
+        if len(candidates) == 0:
+            return []
+        matrix = np.asarray([c["attributes"][vector_attribute] for c in candidates], dtype=np.float64)
+        if metric == "L2":
+            distances = np.linalg.norm(matrix - query, axis=1)
+        elif metric == "IP":
+            distances = -(matrix @ query)
+        else:
+            norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+            distances = 1.0 - (matrix @ query) / np.where(norms == 0, 1.0, norms)
+        order = np.argsort(distances, kind='stable')[:top_k]
+        return [{"v_id": candidates[i].get("v_id"), "distance": float(distances[i])} for i in order]
+
+    def _parseSearchOutput(self, output:list):
+        candidates:List[dict] = []
+        distances:Dict[str, float] = {}
+        for entry in output or []:
+            if "results" in entry:
+                candidates = entry.get("results", [])
+            if "distances" in entry:
+                distances = {str(key): value for key, value in entry.get("distances", {}).items()}
+        return (candidates, distances)
+
+    def _collect(self, done, loaded:int, batches:int, errors:List[str]):
+        for future in done:
+            try:
+                loaded += future.result()
+                batches += 1
+            except Exception as error:
+                logger.error(f"Error upserting vector batch: {error}")
+                errors.append(str(error))
+        return (loaded, batches)
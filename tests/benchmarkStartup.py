@@ -0,0 +1,80 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+# benchmarkStartup.py: This benchmark measures the MCP server time to first
+# response: it spawns `python main.py`, and times the initialize and
+# tools/list replies over stdio
+#
+# Usage: python tests/benchmarkStartup.py [--runs 5] [--eager]
+#******************************************************************************
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+INITIALIZE = {"jsonrpc": "2.0", "id": 1, "method": "initialize",
+              "params": {"protocolVersion": "2024-11-05", "capabilities": {},
+                         "clientInfo": {"name": "benchmarkStartup", "version": "1.0"}}}
+INITIALIZED = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+LIST_TOOLS = {"jsonrpc": "2.0", "id": 2, "method": "tools/list"}
+
+
+def send(process:subprocess.Popen, message:dict):
+    process.stdin.write(json.dumps(message) + "\n")
+    process.stdin.flush()
+
+
+def reply(process:subprocess.Popen, requestId:int) -> dict:
+    """Read stdout until the JSON-RPC reply to requestId (other output is skipped)"""
+    for line in process.stdout:
+        try:
+            message = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(message, dict) and message.get("id") == requestId:
+            return message
+    raise RuntimeError("server exited before replying")
+
+
+def runOnce(lazy:bool) -> dict:
+    environment = dict(os.environ, TG_LAZY_CONNECT="true" if lazy else "false")
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "main.py"], cwd=ROOT, env=environment, text=True,
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        send(process, INITIALIZE)
+        reply(process, 1)
+        initialized = time.perf_counter() - start
+        send(process, INITIALIZED)
+        send(process, LIST_TOOLS)
+        tools = len(reply(process, 2).get("result", {}).get("tools", []))
+        listed = time.perf_counter() - start
+    finally:
+        process.kill()
+        process.wait()
+    return {"initialize": initialized, "tools/list": listed, "tools": tools}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP server time to first response")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--eager", action="store_true", help="connect to TigerGraph before serving (TG_LAZY_CONNECT=false)")
+    args = parser.parse_args()
+
+    runs = [runOnce(lazy=not args.eager) for _ in range(args.runs)]
+    print(f"{'mode':<8}{'reply':<12}{'min':>9}{'median':>9}{'max':>9}")
+    for key in ("initialize", "tools/list"):
+        values = [run[key] for run in runs]
+        print(f"{'eager' if args.eager else 'lazy':<8}{key:<12}{min(values):>8.3f}s{statistics.median(values):>8.3f}s"
+              f"{max(values):>8.3f}s")
+    print(f"tools listed: {runs[-1]['tools']}")
+
+
+if __name__ == '__main__':
+    main()
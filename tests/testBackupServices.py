@@ -0,0 +1,177 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+# testBackupServices.py: This test case performs mock checks against the
+# BackupServices class (NDJSON shard backup and restore)
+#******************************************************************************
+
+import unittest
+import tempfile
+import shutil
+import gzip
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+from mcp_server.tigerGraph.backup_services import BackupServices, MANIFEST_FILE, RESTORE_FILE, schemaChangeFailure
+
+SCHEMA = {
+    "VertexTypes": [
+        {"Name": "Person", "Config": {"PRIMARY_ID_AS_ATTRIBUTE": True},
+         "PrimaryId": {"AttributeName": "pid", "AttributeType": {"Name": "STRING"}},
+         "Attributes": [{"AttributeName": "age", "AttributeType": {"Name": "INT"}}]}
+    ],
+    "EdgeTypes": [
+        {"Name": "knows", "FromVertexTypeName": "Person", "ToVertexTypeName": "Person",
+         "IsDirected": False, "Config": {}, "Attributes": []}
+    ]
+}
+
+PEOPLE = [{"v_id": f"p{i}", "attributes": {"pid": f"p{i}", "age": i}} for i in range(5)]
+KNOWS = [{"e_type": "knows", "from_type": "Person", "from_id": f"p{i}", "to_type": "Person",
+          "to_id": f"p{i + 1}", "attributes": {}} for i in range(4)]
+
+
+def pagedVertices(vertexType, where="", sort="", limit=None, **kwargs):
+    rows = PEOPLE
+    if where:
+        cursor = where.split(">")[1].strip('"')
+        rows = [row for row in rows if row["v_id"] > cursor]
+    return rows[:limit] if limit else rows
+
+
+class TestBackupServices(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.mock_session = MagicMock()
+        self.mock_connection = MagicMock()
+        self.mock_session.getConnection.return_value = self.mock_connection
+        self.mock_connection.graphname = "Social"
+        self.mock_connection.getSchema.return_value = SCHEMA
+        self.mock_connection.getVertices.side_effect = pagedVertices
+        self.mock_connection.getEdgesByType.return_value = KNOWS
+        self.mock_connection.gsql.return_value = "Local schema change succeeded."
+        self.backup = BackupServices(self.mock_session, self.test_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def readShards(self, directory, prefix):
+        rows = []
+        for shard in sorted(Path(directory).glob(f"{prefix}_*.ndjson.gz")):
+            with gzip.open(shard, 'rt', encoding='utf-8') as file:
+                rows.extend(json.loads(line) for line in file if line.strip())
+        return rows
+
+    def test_backup_pages_and_shards(self):
+        result = json.loads(self.backup.backupGraph("nightly", workers=2, page_size=2, shard_rows=3))
+        self.assertTrue(result["complete"])
+        self.assertEqual(result["rows"], 9)
+        directory = Path(self.test_dir) / "backups" / "nightly"
+        self.assertEqual([row["v_id"] for row in self.readShards(directory, "vertex_Person")],
+                         [f"p{i}" for i in range(5)])
+        self.assertEqual(len(self.readShards(directory, "edge_knows")), 4)
+        # 3 pages of at most 2 vertices
+        self.assertEqual(self.mock_connection.getVertices.call_count, 3)
+        manifest = json.loads((directory / MANIFEST_FILE).read_text())
+        self.assertEqual(manifest["schema"], SCHEMA)
+        self.assertEqual(len([s for s in manifest["shards"] if s["type"] == "Person"]), 2)
+
+    def test_backup_resumes_completed_types(self):
+        self.backup.backupGraph("nightly", workers=1, page_size=10, shard_rows=10)
+        self.mock_connection.getVertices.reset_mock()
+        result = json.loads(self.backup.backupGraph("nightly", workers=1, page_size=10, shard_rows=10))
+        self.assertTrue(result["types"]["Person"]["skipped"])
+        self.mock_connection.getVertices.assert_not_called()
+
+    def test_backup_status_lists_backups(self):
+        self.backup.backupGraph("nightly", workers=1)
+        status = self.backup.backupStatus()
+        self.assertEqual(len(status), 1)
+        self.assertIn("types=2/2", status[0])
+
+    def test_restore_schema_job_and_load_order(self):
+        self.backup.backupGraph("nightly", workers=1, shard_rows=2)
+        self.mock_connection.getSchema.return_value = {"VertexTypes": [], "EdgeTypes": []}
+        calls = []
+        self.mock_connection.upsertVertices.side_effect = lambda vt, rows: calls.append(("vertex", len(rows)))
+        self.mock_connection.upsertEdges.side_effect = lambda s, et, t, rows: calls.append(("edge", len(rows)))
+
+        result = json.loads(self.backup.restoreGraph("nightly", workers=2, batch_size=10))
+
+        self.assertTrue(result["complete"])
+        self.assertEqual(result["vertexRows"], 5)
+        self.assertEqual(result["edgeRows"], 4)
+        self.assertEqual([kind for kind, _ in calls], ["vertex"] * 3 + ["edge"] * 2)
+        job = self.mock_connection.gsql.call_args_list[1].args[0]
+        self.assertIn('ADD VERTEX Person (PRIMARY_ID pid STRING, age INT) WITH PRIMARY_ID_AS_ATTRIBUTE="true";', job)
+        self.assertIn("ADD UNDIRECTED EDGE knows (FROM Person, TO Person);", job)
+        # the primary id attribute is not sent as a regular attribute
+        rows = self.mock_connection.upsertVertices.call_args_list[0].args[1]
+        self.assertEqual(rows[0][1], {"age": 0})
+
+    def test_restore_resumes_from_committed_offset(self):
+        self.backup.backupGraph("nightly", workers=1, shard_rows=10)
+        self.mock_connection.upsertEdges.side_effect = [ConnectionError("down"), None]
+        first = json.loads(self.backup.restoreGraph("nightly", workers=1, batch_size=2))
+        self.assertFalse(first["complete"])
+        self.mock_connection.upsertVertices.reset_mock()
+        self.mock_connection.upsertEdges.side_effect = None
+        second = json.loads(self.backup.restoreGraph("nightly", workers=1, batch_size=2))
+        self.assertTrue(second["complete"])
+        self.assertEqual(second["schema"], "skipped")
+        self.assertEqual(second["vertexRows"], 0)
+        self.mock_connection.upsertVertices.assert_not_called()
+        self.assertEqual(second["edgeRows"], 4)
+    def test_backup_resumes_unpaged_types_without_duplicates(self):
+        schema = {"VertexTypes": [dict(SCHEMA["VertexTypes"][0], Config={}, PrimaryId={"AttributeName": "pid"})],
+                  "EdgeTypes": SCHEMA["EdgeTypes"]}
+        self.mock_connection.getSchema.return_value = schema
+        self.mock_connection.getVertices.side_effect = lambda vertexType, **kwargs: PEOPLE
+        commitShard = self.backup._commitShard
+        commits = []
+
+        def interrupted(directory, progress, state, shard, cursor):
+            commits.append(shard["file"])
+            if len(commits) == 2:
+                raise ConnectionError("disk gone")
+            commitShard(directory, progress, state, shard, cursor)
+        self.backup._commitShard = interrupted
+        first = json.loads(self.backup.backupGraph("nightly", workers=1, shard_rows=2))
+        self.assertFalse(first["complete"])
+        self.backup._commitShard = commitShard
+        # RESTPP returns the rows in another order on the next run
+        self.mock_connection.getVertices.side_effect = lambda vertexType, **kwargs: list(reversed(PEOPLE))
+        self.mock_connection.getEdgesByType.return_value = list(reversed(KNOWS))
+        second = json.loads(self.backup.backupGraph("nightly", workers=1, shard_rows=2))
+        self.assertTrue(second["complete"])
+        directory = Path(self.test_dir) / "backups" / "nightly"
+        self.assertEqual(sorted(row["v_id"] for row in self.readShards(directory, "vertex_Person")),
+                         [f"p{i}" for i in range(5)])
+        self.assertEqual(sorted(row["from_id"] for row in self.readShards(directory, "edge_knows")),
+                         [f"p{i}" for i in range(4)])
+
+    def test_failed_schema_change_is_retried(self):
+        self.backup.backupGraph("nightly", workers=1)
+        self.mock_connection.getSchema.return_value = {"VertexTypes": [], "EdgeTypes": []}
+        self.mock_connection.gsql.side_effect = ["", "Semantic Check Fails: type Person conflicts", ""]
+        result = self.backup.restoreGraph("nightly", workers=1)
+        self.assertIn("Semantic Check Fails", result)
+        self.mock_connection.upsertVertices.assert_not_called()
+        stateFile = Path(self.test_dir) / "backups" / "nightly" / RESTORE_FILE
+        self.assertFalse(stateFile.exists() and json.loads(stateFile.read_text()).get("schemaApplied", False))
+        # the next run applies the schema again
+        self.mock_connection.gsql.side_effect = None
+        second = json.loads(self.backup.restoreGraph("nightly", workers=1))
+        self.assertEqual(second["schema"], "2 schema statements applied")
+        self.assertTrue(second["complete"])
+
+    def test_schema_change_failure_text(self):
+        self.assertIsNone(schemaChangeFailure("Successfully created schema change jobs: [j].\n"
+                                              "Local schema change succeeded."))
+        self.assertIn("does not exist", schemaChangeFailure("Vertex type Person does not exist"))
+        self.assertIn("no schema change success", schemaChangeFailure(""))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+# testBatchQueryRun.py: This is a mocked up version to run against the
+# batch_run_query service (BatchQueryServices class)
+#******************************************************************************
+
+import unittest
+import tempfile
+import shutil
+import json
+import csv
+from pathlib import Path
+from unittest.mock import MagicMock
+from mcp_server.tigerGraph.batch_services import BatchQueryServices
+
+
+def fakeQuery(query_name, params, timeout=None, runAsync=False):
+    if params.get("id") == "bad":
+        raise Exception("Query timeout exceeded")
+    if params.get("id") == "broken":
+        raise Exception("Runtime Error: invalid vertex")
+    # detached: the request id carries the parameter, fakeResult() returns its results
+    return f"r-{params.get('id')}"
+
+
+def fakeResult(requestId):
+    return [{"result": requestId[2:]}]
+
+
+class TestBatchQueryRun(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.mock_session = MagicMock()
+        self.mock_connection = MagicMock()
+        self.mock_session.getConnection.return_value = self.mock_connection
+        self.mock_connection.runInstalledQuery.side_effect = fakeQuery
+        self.mock_connection.checkQueryStatus.side_effect = lambda requestId: [{"requestid": requestId, "status": "success"}]
+        self.mock_connection.getQueryResult.side_effect = fakeResult
+        self.batch = BatchQueryServices(self.mock_session, self.test_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_batch_json_output_with_failures(self):
+        params = [{"id": str(i)} for i in range(10)] + [{"id": "bad"}, {"id": "broken"}]
+        summary = json.loads(self.batch.batchRunQuery("getFriends", param_list=params, max_workers=3, timeout=5))
+        self.assertEqual(summary["rows"], 12)
+        self.assertEqual(summary["succeeded"], 10)
+        self.assertEqual(summary["timedOut"], 1)
+        self.assertEqual(summary["failed"], 1)
+        rows = json.loads((Path(self.test_dir) / "getFriends_batch.json").read_text())
+        self.assertEqual(sorted(row["row"] for row in rows), list(range(12)))
+        ok = [row for row in rows if row["status"] == "ok"]
+        self.assertTrue(all(row["results"][0]["result"] == row["params"]["id"] for row in ok))
+        self.mock_connection.runInstalledQuery.assert_any_call("getFriends", {"id": "3"}, timeout=5000, runAsync=True)
+
+    def test_batch_csv_param_file(self):
+        (Path(self.test_dir) / "params.csv").write_text("id,limit\na,1\nb,\n")
+        summary = json.loads(self.batch.batchRunQuery("getFriends", param_file="params.csv", outputFormat="CSV"))
+        self.assertEqual(summary["rows"], 2)
+        with open(Path(self.test_dir) / "getFriends_batch.csv", newline='') as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual(sorted(json.loads(row["params"])["id"] for row in rows), ["a", "b"])
+        # empty CSV cells are not sent as parameters
+        self.mock_connection.runInstalledQuery.assert_any_call("getFriends", {"id": "b"}, timeout=60000, runAsync=True)
+
+    def test_batch_rows_can_be_aborted_by_call_id(self):
+        inFlight = []
+        def status(requestId):
+            inFlight.extend((call.callId, call.requestId) for call in self.batch.registry.calls())
+            return [{"requestid": requestId, "status": "aborted" if requestId == "r-2" else "success"}]
+        self.mock_connection.checkQueryStatus.side_effect = status
+        summary = json.loads(self.batch.batchRunQuery("getFriends", param_list=[{"id": "1"}, {"id": "2"}],
+                                                      max_workers=1, timeout=5))
+        self.assertEqual((summary["succeeded"], summary["failed"]), (1, 1))
+        # every registered row knows its TigerGraph request id, which abortRunning_Query aborts
+        self.assertEqual({requestId for _, requestId in inFlight}, {"r-1", "r-2"})
+        self.assertTrue(all(self.batch.registry.isCallId(callId) for callId, _ in inFlight))
+        self.assertEqual(self.batch.registry.calls(), [])
+
+if __name__ == '__main__':
+    unittest.main()
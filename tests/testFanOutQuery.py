@@ -0,0 +1,78 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+# testFanOutQuery.py: This is a mocked up version to run against the
+# fan_out_query service (BatchQueryServices.fanOutQuery, one query on
+# several graphs merged into one file)
+#******************************************************************************
+
+import csv
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+from mcp_server.tigerGraph.batch_services import BatchQueryServices, outputRows
+from mcp_server.tigerGraph.session_registry import currentGraph
+
+
+class TestFanOutQuery(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.test_dir)
+        self.connections = {}
+        for graph in ("Main", "Sales", "Hr"):
+            connection = self.connections[graph] = MagicMock(name=graph)
+            connection.runInstalledQuery.return_value = f"{graph}-request"
+            connection.checkQueryStatus.return_value = [{"requestid": f"{graph}-request", "status": "success"}]
+            connection.getQueryResult.side_effect = self.fakeQuery(graph)
+        self.connections["Hr"].runInstalledQuery.side_effect = Exception("REST-10016 query not installed")
+        session = MagicMock()
+        session.getConnection.side_effect = lambda: self.connections[currentGraph.get() or "Main"]
+        session.currentGraphName.side_effect = lambda: currentGraph.get() or "Main"
+        self.batch = BatchQueryServices(session, self.test_dir)
+
+    def fakeQuery(self, graph:str):
+        def query(requestId):
+            return [{"Customers": [{"v_id": f"{graph}-1"}, {"v_id": f"{graph}-2"}]}, {"total": 2}]
+        return query
+
+    def test_output_rows(self):
+        rows = list(outputRows([{"People": [{"v_id": "1"}, {"v_id": "2"}]}, {"count": 2}, "text"]))
+        self.assertEqual(rows, [("People", {"v_id": "1"}), ("People", {"v_id": "2"}), ("count", 2), ("", "text")])
+
+    def test_fan_out_json_tags_rows_with_graph(self):
+        summary = json.loads(self.batch.fanOutQuery("topCustomers", ["Main", "Sales", "Hr", "Sales"], {"k": 2},
+                                                    timeout=5))
+        self.assertEqual(summary["graphs"], 3)
+        self.assertEqual((summary["succeeded"], summary["failed"]), (2, 1))
+        self.assertEqual(summary["perGraph"]["Sales"]["rows"], 3)
+        self.assertIn("REST-10016", summary["perGraph"]["Hr"]["error"])
+        self.assertEqual(list(summary["perGraph"]), ["Main", "Sales", "Hr"])
+        rows = json.loads((Path(self.test_dir) / "topCustomers_fanout.json").read_text())
+        self.assertEqual(len(rows), 7)
+        sales = [row["value"]["v_id"] for row in rows if row["graph"] == "Sales" and row["output"] == "Customers"]
+        self.assertEqual(sorted(sales), ["Sales-1", "Sales-2"])
+        self.assertEqual([row["status"] for row in rows if row["graph"] == "Hr"], ["error"])
+        for graph in ("Main", "Sales"):
+            self.connections[graph].runInstalledQuery.assert_called_once_with("topCustomers", {"k": 2}, timeout=5000,
+                                                                          runAsync=True)
+            self.connections[graph].getQueryResult.assert_called_once_with(f"{graph}-request")
+
+    def test_fan_out_csv(self):
+        summary = json.loads(self.batch.fanOutQuery("topCustomers", ["Main", "Sales"], outputFormat="CSV"))
+        self.assertEqual(summary["rows"], 6)
+        with open(Path(self.test_dir) / "topCustomers_fanout.csv", newline='') as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual({row["graph"] for row in rows}, {"Main", "Sales"})
+        customers = [json.loads(row["value"])["v_id"] for row in rows if row["output"] == "Customers"]
+        self.assertEqual(sorted(customers), ["Main-1", "Main-2", "Sales-1", "Sales-2"])
+
+    def test_no_graphs(self):
+        self.assertIn("at least one graph", self.batch.fanOutQuery("topCustomers", [" ", ""]))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
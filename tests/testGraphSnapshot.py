@@ -0,0 +1,133 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+# testGraphSnapshot.py: This test case performs checks on the GraphSnapshot
+# CSR structure and its offline analytics
+#******************************************************************************
+
+import unittest
+import tempfile
+import shutil
+import numpy as np
+from unittest.mock import MagicMock
+from mcp_server.tigerGraph.graph_snapshot import GraphSnapshot
+from mcp_server.tigerGraph.snapshot_services import SnapshotServices, WATERMARK_ATTRIBUTE
+
+
+def vertex(vType, vId, **attributes):
+    return {"v_type": vType, "v_id": vId, "attributes": attributes}
+
+def edge(eType, fromId, toId, directed=True, **attributes):
+    return {"e_type": eType, "directed": directed, "from_type": "Person", "from_id": fromId,
+            "to_type": "Person", "to_id": toId, "attributes": attributes}
+
+
+class TestGraphSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        vertices = [vertex("Person", "a", age=30, name="Ann"),
+                    vertex("Person", "b", age=40),
+                    vertex("Person", "c"),
+                    vertex("Person", "d")]
+        edges = [edge("follows", "a", "b", weight=1.5),
+                 edge("follows", "b", "c"),
+                 edge("knows", "c", "d", directed=False)]
+        self.snapshot = GraphSnapshot.fromRecords("people", vertices, edges)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_csr_layout(self):
+        self.assertEqual(self.snapshot.vertexCount, 4)
+        # the undirected edge is stored in both directions
+        self.assertEqual(self.snapshot.edgeCount, 4)
+        self.assertEqual(list(self.snapshot.offsets), [0, 1, 2, 3, 4])
+        self.assertEqual(list(self.snapshot.outDegree()), [1, 1, 1, 1])
+        self.assertEqual(list(self.snapshot.inDegree()), [0, 1, 2, 1])
+
+    def test_numeric_attributes_only(self):
+        self.assertIn("Person.age", self.snapshot.vertexAttributes)
+        self.assertNotIn("Person.name", self.snapshot.vertexAttributes)
+        ages = self.snapshot.vertexAttributes["Person.age"]
+        self.assertEqual(ages[0], 30.0)
+        self.assertTrue(np.isnan(ages[2]))
+        self.assertEqual(self.snapshot.edgeAttributes["follows.weight"][0], 1.5)
+
+    def test_bfs_distances(self):
+        source = self.snapshot.lookup("Person", "a")
+        self.assertEqual(list(self.snapshot.bfs(source)), [0, 1, 2, 3])
+        self.assertEqual(list(self.snapshot.bfs(source, max_depth=1)), [0, 1, -1, -1])
+        self.assertEqual(self.snapshot.lookup("Person", "zz"), -1)
+
+    def test_pagerank_sums_to_one(self):
+        ranks, iterations = self.snapshot.pagerank()
+        self.assertAlmostEqual(float(ranks.sum()), 1.0, places=6)
+        self.assertGreater(iterations, 0)
+        self.assertEqual(int(np.argmin(ranks)), self.snapshot.lookup("Person", "a"))
+
+    def test_save_and_memory_mapped_load(self):
+        self.snapshot.save(self.test_dir)
+        loaded = GraphSnapshot.load(self.test_dir)
+        self.assertIsInstance(loaded.targets, np.memmap)
+        self.assertEqual(loaded.summary()["edges"], 4)
+        self.assertEqual(list(loaded.bfs(loaded.lookup("Person", "b"))), [-1, 0, 1, 2])
+
+    def test_attribute_delta_patched_in_place(self):
+        self.snapshot.save(self.test_dir)
+        writable = GraphSnapshot.load(self.test_dir, writable=True)
+        stats = writable.applyDelta([vertex("Person", "b", age=41)], [])
+        self.assertEqual(stats["updatedVertices"], 1)
+        self.assertFalse(writable.hasPendingChanges())
+        writable.flush()
+        reloaded = GraphSnapshot.load(self.test_dir)
+        self.assertEqual(reloaded.vertexAttributes["Person.age"][reloaded.lookup("Person", "b")], 41.0)
+
+    def test_structural_delta_compaction(self):
+        stats = self.snapshot.applyDelta([vertex("Person", "e", age=22)],
+                                         [edge("follows", "d", "e", weight=2.0),
+                                          edge("follows", "a", "b", weight=3.0)])
+        self.assertEqual(stats["newVertices"], 1)
+        self.assertEqual(stats["newEdges"], 1)
+        self.assertEqual(stats["updatedEdges"], 1)
+        self.assertTrue(self.snapshot.hasPendingChanges())
+        self.snapshot.compact()
+        self.assertEqual(self.snapshot.vertexCount, 5)
+        self.assertEqual(self.snapshot.edgeCount, 5)
+        e = self.snapshot.lookup("Person", "e")
+        self.assertEqual(self.snapshot.vertexAttributes["Person.age"][e], 22.0)
+        self.assertEqual(list(self.snapshot.bfs(self.snapshot.lookup("Person", "a"))), [0, 1, 2, 3, 4])
+        weights = self.snapshot.edgeAttributes["follows.weight"]
+        self.assertEqual(weights[self.snapshot.offsets[0]], 3.0)
+        # d keeps its undirected knows edge first, the new follows edge is appended after it
+        self.assertEqual(weights[self.snapshot.offsets[self.snapshot.lookup("Person", "d")] + 1], 2.0)
+    def test_delta_with_new_type_keeps_existing_vertices(self):
+        # the first delta row is of a type the snapshot has not seen yet
+        stats = self.snapshot.applyDelta([vertex("Company", "z"), vertex("Person", "a", age=5)], [])
+        self.assertEqual((stats["updatedVertices"], stats["newVertices"]), (1, 1))
+        self.snapshot.compact()
+        self.assertEqual(self.snapshot.vertexIds.tolist(), ["a", "b", "c", "d", "z"])
+        self.assertEqual(self.snapshot.vertexAttributes["Person.age"][self.snapshot.lookup("Person", "a")], 5.0)
+        self.assertEqual(self.snapshot.lookup("Company", "z"), 4)
+
+    def test_watermark_catches_rows_written_in_the_same_tick(self):
+        services = SnapshotServices(MagicMock(), self.test_dir)
+        watermarks = services._initialWatermarks(["Person"], [], {"Person": "updated"},
+                                                 [vertex("Person", "a", updated=10), vertex("Person", "b", updated=20)], 0)
+        watermark = watermarks["Person"]
+        self.assertEqual((watermark["mode"], watermark["value"], watermark["ids"]), (WATERMARK_ATTRIBUTE, 20, ["b"]))
+        conn = MagicMock()
+        # c was written in the same tick as b, after the snapshot read b
+        conn.getVertices.return_value = [vertex("Person", "b", updated=20), vertex("Person", "c", updated=20)]
+        changed = services._fetchChangedVertices(conn, "Person", watermark)
+        self.assertEqual(conn.getVertices.call_args.kwargs["where"], "updated>=20")
+        self.assertEqual([v["v_id"] for v in changed], ["c"])
+        self.assertEqual(watermark["ids"], ["b", "c"])
+        conn.getVertices.return_value = [vertex("Person", "b", updated=20), vertex("Person", "c", updated=20),
+                                         vertex("Person", "a", updated=25)]
+        changed = services._fetchChangedVertices(conn, "Person", watermark)
+        self.assertEqual([v["v_id"] for v in changed], ["a"])
+        self.assertEqual((watermark["value"], watermark["ids"]), (25, ["a"]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+# testHostRouter.py: This test case performs checks on the HostRouter class
+# (least outstanding requests routing, sticky GSQL, health checks, host stats)
+#******************************************************************************
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+from requests.exceptions import ReadTimeout
+from mcp_server.tigerGraph.mcp_Server import TigerGraph_MCP_Server
+from mcp_server.tigerGraph.session import TigerGraph_Session
+from mcp_server.tigerGraph.startup_cache import StartupCache
+from mcp_server.tigerGraph.host_router import HostRouter, parseHosts
+from mcp_server.tigerGraph.instrumented_connection import InstrumentedConnection
+from mcp_server.tigerGraph.resilience import Resilience
+
+TUNING = {"retryAttempts": 1, "retryBaseDelay": 0.0, "retryMaxDelay": 0.0, "breakerFailures": 1,
+          "breakerResetSeconds": 30, "hostCheckInterval": 0}
+
+
+class TestHostRouter(unittest.TestCase):
+
+    def setUp(self):
+        for target in ("mcp_server.tigerGraph.resilience.tigerGraphTuning",
+                       "mcp_server.tigerGraph.host_router.tigerGraphTuning"):
+            patcher = patch(target, side_effect=TUNING.get)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.backends = {}
+
+        def newConnection(host, resilience):
+            backend = self.backends[host] = MagicMock(name=host)
+            backend.graphname = "Graph"
+            backend.ping.return_value = {"error": False}
+            backend.runInstalledQuery.return_value = [{"host": host}]
+            return InstrumentedConnection(backend, resilience=resilience)
+        self.router = HostRouter(["http://node1", "http://node2", "http://node3"], newConnection, Resilience())
+
+    def test_parse_hosts(self):
+        self.assertEqual(parseHosts("http://node1", " http://node2/, http://node1,,http://node3"),
+                         ["http://node1", "http://node2", "http://node3"])
+        self.assertEqual(parseHosts("http://node1", ""), ["http://node1"])
+
+    def test_least_outstanding_requests(self):
+        started = threading.Barrier(3)
+        release = threading.Event()
+
+        def slowQuery(*args, **kwargs):
+            started.wait(5)
+            release.wait(5)
+            return []
+        for backend in self.backends.values():
+            backend.runInstalledQuery.side_effect = slowQuery
+        # two queries in flight, on two different hosts
+        threads = [threading.Thread(target=self.router.runInstalledQuery, args=("q",)) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        started.wait(5)
+        busy = {entry.host for entry in self.router.entries if entry.outstanding}
+        self.assertEqual(len(busy), 2)
+        # the next one goes to the idle host
+        self.assertNotIn(self.router.choose().host, busy)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+    def test_gsql_sticks_to_primary(self):
+        self.backends["http://node1"].gsql.return_value = "ok"
+        for _ in range(3):
+            self.assertEqual(self.router.gsql("ls"), "ok")
+        self.assertEqual(self.backends["http://node1"].gsql.call_count, 3)
+        self.backends["http://node2"].gsql.assert_not_called()
+        self.backends["http://node1"].graphname = "Primary"
+        self.assertEqual(self.router.graphname, "Primary")
+
+    def test_unhealthy_host_out_of_rotation(self):
+        self.backends["http://node2"].ping.side_effect = ConnectionError("connection refused")
+        self.backends["http://node3"].ping.return_value = {"error": True, "message": "restarting"}
+        self.router.checkHealth()
+        for _ in range(4):
+            self.assertEqual(self.router.runInstalledQuery("q"), [{"host": "http://node1"}])
+        status = {entry["host"]: entry for entry in self.router.status()}
+        self.assertFalse(status["http://node2"]["healthy"])
+        self.assertEqual(status["http://node3"]["lastCheckError"], "restarting")
+        self.assertEqual(status["http://node1"]["calls"], 4)
+        self.assertIn("p95", status["http://node1"]["latencySeconds"])
+        # back in rotation after the next successful check
+        self.backends["http://node2"].ping.side_effect = None
+        self.router.checkHealth()
+        self.assertTrue(self.router.entries[1].healthy)
+
+    def test_open_breaker_skips_host(self):
+        self.backends["http://node1"].runInstalledQuery.side_effect = ReadTimeout("timed out")
+        # the other hosts are busy, so the first query goes to node1
+        self.router.entries[1].outstanding = self.router.entries[2].outstanding = 1
+        with self.assertRaises(ReadTimeout):
+            self.router.runInstalledQuery("q")
+        self.router.entries[1].outstanding = self.router.entries[2].outstanding = 0
+        self.assertEqual(self.router.entries[0].errors, 1)
+        # node1's RESTPP breaker opened after one failure
+        self.assertFalse(self.router.entries[0].available())
+        hosts = {self.router.runInstalledQuery("q")[0]["host"] for _ in range(4)}
+        self.assertNotIn("http://node1", hosts)
+
+    def test_session_routes_over_tg_hosts(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        cacheFile = os.path.join(directory.name, ".startup_cache.json")
+        created = []
+
+        def connection(**kwargs):
+            backend = MagicMock(name=kwargs["host"])
+            backend.ping.return_value = {"error": False}
+            backend.getVersion.return_value = [{"version": "release_4.2.0_05-01-2025"}]
+            created.append(kwargs["host"])
+            return backend
+        tuning = lambda key: "http://node2, http://node3" if key == "hosts" else 0
+        for target, value in (("pyTigerGraph.TigerGraphConnection", connection),
+                              ("mcp_server.tigerGraph.session.tigerGraphTuning", tuning),
+                              ("mcp_server.tigerGraph.session.StartupCache",
+                               lambda identity: StartupCache(identity, cacheFile, ttl=0))):
+            patcher = patch(target, side_effect=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        session = TigerGraph_Session(lazy=True)
+        self.addCleanup(session.tokenManager.stop)
+        session.secretsExists = MagicMock()
+        self.assertIsInstance(session.getConnection(), HostRouter)
+        self.assertEqual(created[1:], ["http://node2", "http://node3"])
+        self.assertEqual(len(session.connections()), 3)
+        self.assertEqual(len(session.resiliences()), 3)
+        # a refreshed token reaches every node
+        session.tokenManager.adopt("new-token", None)
+        self.assertEqual([connection.apiToken for connection in session.connections()], ["new-token"] * 3)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,88 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+# testLatencyTracker.py: This test case performs checks on the QueryLatencyTracker
+# class (latency percentiles, learned timeouts, slow call warnings)
+#******************************************************************************
+
+import json
+import unittest
+from unittest.mock import MagicMock
+from mcp_server.tigerGraph.latency_tracker import QueryLatencyTracker, callStatus
+from mcp_server.tigerGraph.query_registry import RunningQueryRegistry
+from mcp_server.tigerGraph.services import TigerGraphServices
+
+
+class TestLatencyTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.tracker = QueryLatencyTracker()
+        self.tracker.minSamples = 20
+        self.tracker.factor = 3.0
+        self.tracker.minTimeout = 5
+        self.tracker.maxTimeout = 1800
+
+    def test_default_timeout_until_enough_history(self):
+        self.assertEqual(self.tracker.defaultTimeout("fastQuery"), 60)
+        for _ in range(19):
+            self.tracker.record("fastQuery", 0.1)
+        self.assertEqual(self.tracker.defaultTimeout("fastQuery"), 60)
+        self.tracker.record("fastQuery", 0.1)
+        # p99 x 3 = 0.3s, clamped to the 5 second minimum
+        self.assertEqual(self.tracker.defaultTimeout("fastQuery"), 5)
+
+    def test_heavy_query_gets_longer_timeout(self):
+        for seconds in range(100, 130):
+            self.tracker.record("heavyQuery", float(seconds))
+        self.assertEqual(self.tracker.defaultTimeout("heavyQuery"), 387)
+        for _ in range(30):
+            self.tracker.record("hugeQuery", 1000.0)
+        self.assertEqual(self.tracker.defaultTimeout("hugeQuery"), 1800)
+
+    def test_errors_do_not_lower_the_timeout(self):
+        for _ in range(20):
+            self.tracker.record("q", 10.0)
+        for _ in range(50):
+            self.tracker.record("q", 0.01, "error")
+        self.assertEqual(self.tracker.defaultTimeout("q"), 30)
+        self.assertEqual(self.tracker.statistics("q")["q"]["errors"], 50)
+
+    def test_slow_call_warnings_and_statistics(self):
+        for _ in range(20):
+            self.assertIsNone(self.tracker.record("q", 1.0))
+        self.assertIn("above its p99", self.tracker.record("q", 5.0, "timeout"))
+        for _ in range(9):
+            self.tracker.record("q", 3.0)
+        self.assertIn("trending slow", self.tracker.record("q", 1.0))
+        stats = self.tracker.statistics()["q"]
+        self.assertEqual(stats["samples"], 31)
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertEqual(stats["p50Seconds"], 1.0)
+        self.assertTrue(stats["trendingSlow"])
+        self.assertEqual(callStatus(Exception("Query timed out")), "timeout")
+        self.assertEqual(callStatus(Exception("bad vertex")), "error")
+
+    def test_run_query_returns_the_warning(self):
+        services = TigerGraphServices.__new__(TigerGraphServices)
+        services.latencyTracker = self.tracker
+        services.queryRegistry = RunningQueryRegistry()
+        services.querySignatures = MagicMock()
+        services.querySignatures.validate.side_effect = lambda name, params: params
+        connection = MagicMock()
+        connection.runInstalledQuery.return_value = "req-1"
+        connection.checkQueryStatus.return_value = [{"status": "success"}]
+        connection.getQueryResult.return_value = [{"count": 1}]
+        services.getConnection = MagicMock(return_value=connection)
+        services.isResultSetEmpty = MagicMock(return_value=False)
+        output = services.run_query("q", {}, timeout=10)
+        self.assertEqual(json.loads(output), [{"count": 1}])
+        for _ in range(20):
+            self.tracker.record("r", 0.000001)
+        output = services.run_query("r", {}, timeout=10)
+        results, warning = output.split("\n# Warning: ")
+        self.assertEqual(json.loads(results), [{"count": 1}])
+        self.assertIn("above its p99", warning)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,114 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+# testLazyConnect.py: This test case performs checks on the lazy connect mode
+# (deferred session validation, version lookup and superuser role check)
+#******************************************************************************
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+from mcp_server.tigerGraph.mcp_Server import TigerGraph_MCP_Server
+from mcp_server.tigerGraph.session import TigerGraph_Session
+from mcp_server.tigerGraph.system_services import SystemUtilities
+from mcp_server.tigerGraph.startup_cache import StartupCache
+
+
+def mockConnection() -> MagicMock:
+    connection = MagicMock()
+    connection.ping.return_value = {"error": False}
+    connection.check_exist_graphs.return_value = True
+    connection.getVersion.return_value = [{"version": "release_4.2.0_05-01-2025"}]
+    return connection
+
+
+class TestLazyConnect(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = mockConnection()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        cacheFile = os.path.join(directory.name, ".startup_cache.json")
+        for target, value in (("pyTigerGraph.TigerGraphConnection", lambda **kwargs: self.connection),
+                              ("mcp_server.tigerGraph.session.StartupCache",
+                               lambda identity: StartupCache(identity, cacheFile, ttl=0))):
+            patcher = patch(target, side_effect=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_lazy_session_connects_once_on_first_use(self):
+        session = TigerGraph_Session(lazy=True)
+        session.secretsExists = MagicMock()
+        self.connection.ping.assert_not_called()
+        self.assertFalse(session.connected)
+        threads = [threading.Thread(target=session.getConnection) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.connection.ping.assert_called_once()
+        session.secretsExists.assert_called_once()
+        self.assertTrue(session.connected)
+        self.assertIsNotNone(session.connectSeconds)
+
+    def test_failed_connect_is_retried(self):
+        self.connection.ping.side_effect = [Exception("connection refused"), {"error": False}]
+        session = TigerGraph_Session(lazy=True)
+        session.secretsExists = MagicMock()
+        session.getConnection()
+        self.assertFalse(session.connected)
+        session.getConnection()
+        self.assertTrue(session.connected)
+
+    def test_lazy_version(self):
+        session = TigerGraph_Session(lazy=True)
+        session.secretsExists = MagicMock()
+        utilities = SystemUtilities(session, lazy=True)
+        self.connection.getVersion.assert_not_called()
+        self.assertEqual(utilities.version, 4.2)
+        self.assertEqual(utilities.version, 4.2)
+        self.connection.getVersion.assert_called_once()
+
+    def lazyServer(self) -> TigerGraph_MCP_Server:
+        with patch("mcp_server.tigerGraph.services.tigerGraphTuning", return_value=True), \
+             patch.object(TigerGraph_MCP_Server, "warmUp"):
+            server = TigerGraph_MCP_Server()
+        self.addCleanup(server.services.metadataCache.stopWatcher)
+        self.addCleanup(server.services.metricsSampler.stop)
+        return server
+
+    def toolNames(self, server:TigerGraph_MCP_Server) -> set:
+        return {tool.name for tool in server.mcp._tool_manager.list_tools()}
+
+    def test_admin_tools_listed_after_role_check(self):
+        server = self.lazyServer()
+        self.connection.gsql.return_value = f"Role superuser granted to: {server.services.session.username}"
+        self.connection.ping.assert_not_called()
+        # the role is not known before the session connects, so no admin tool is listed yet
+        self.assertNotIn("displayRunning_Queries", self.toolNames(server))
+        server.warmUp(sleep=lambda seconds: None)
+        self.connection.ping.assert_called_once()
+        self.assertIn("displayRunning_Queries", self.toolNames(server))
+        server.warmUp(sleep=lambda seconds: None)
+        self.assertTrue(server.adminTools)
+
+    def test_admin_tools_hidden_without_role(self):
+        self.connection.gsql.return_value = "no grants"
+        server = self.lazyServer()
+        server.warmUp(sleep=lambda seconds: None)
+        self.assertTrue(server.services.session.connected)
+        self.assertNotIn("displayRunning_Queries", self.toolNames(server))
+
+    def test_warm_up_retries_failed_connect(self):
+        self.connection.ping.side_effect = [Exception("connection refused"), {"error": False}]
+        server = self.lazyServer()
+        self.connection.gsql.return_value = f"Role superuser granted to: {server.services.session.username}"
+        sleeps = []
+        server.warmUp(sleep=sleeps.append)
+        self.assertEqual(sleeps, [5])
+        self.assertIn("displayRunning_Queries", self.toolNames(server))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
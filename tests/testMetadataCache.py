@@ -0,0 +1,97 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+# testMetadataCache.py: This test case performs mock checks against the
+# MetadataCache class (TTL, content hashes, invalidation, change detection)
+#******************************************************************************
+
+import time
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+from mcp_server.tigerGraph.metadata_cache import MetadataCache, INSTALLED_QUERIES, SHOW_QUERY
+
+
+class TestMetadataCache(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_session = MagicMock()
+        self.mock_connection = MagicMock()
+        self.mock_session.getConnection.return_value = self.mock_connection
+        self.mock_connection.getInstalledQueries.return_value = {"GET /query/g/q1": {}}
+        self.mock_connection.showQuery.return_value = "CREATE QUERY q1() FOR GRAPH g { PRINT 1; }"
+        self.mock_connection.getUDF.return_value = ("ExprFunctions", "ExprUtil")
+        self.cache = MetadataCache(self.mock_session, ttl=300)
+
+    def test_answers_from_memory_within_ttl(self):
+        for _ in range(3):
+            self.assertEqual(self.cache.showQuery("q1")[0], self.mock_connection.showQuery.return_value)
+            self.cache.getUDF()
+        self.assertEqual(self.mock_connection.showQuery.call_count, 1)
+        self.assertEqual(self.mock_connection.getUDF.call_count, 1)
+        self.cache.showQuery("q1", refresh=True)
+        self.assertEqual(self.mock_connection.showQuery.call_count, 2)
+        entry = [e for e in self.cache.status() if e["kind"] == SHOW_QUERY][0]
+        self.assertEqual((entry["hits"], entry["refreshes"], entry["stale"]), (2, 1, False))
+
+    def test_expired_entry_keeps_hash_when_unchanged(self):
+        self.cache.ttl = 0
+        _, first = self.cache.showQuery("q1")
+        generation = self.cache.generation
+        _, second = self.cache.showQuery("q1")
+        self.assertEqual(first, second)
+        self.assertEqual(self.cache.generation, generation)
+        self.mock_connection.showQuery.return_value = "CREATE QUERY q1(INT x) FOR GRAPH g { PRINT x; }"
+        _, third = self.cache.showQuery("q1")
+        self.assertNotEqual(first, third)
+        self.assertGreater(self.cache.generation, generation)
+        self.assertTrue(self.cache.status()[0]["stale"])
+
+    def test_invalidate(self):
+        self.cache.installedQueries()
+        self.cache.showQuery("q1")
+        self.cache.invalidate(INSTALLED_QUERIES)
+        self.assertEqual(len(self.cache.status()), 1)
+        self.cache.invalidate()
+        self.assertEqual(self.cache.status(), [])
+        self.cache.showQuery("q1")
+        self.cache.invalidate(SHOW_QUERY, "q1")
+        self.assertEqual(self.cache.status(), [])
+
+    def test_check_for_changes_drops_query_text(self):
+        self.cache.installedQueries()
+        self.cache.showQuery("q1")
+        self.assertFalse(self.cache.checkForChanges())
+        self.mock_connection.getInstalledQueries.return_value = {"GET /query/g/q1": {}, "GET /query/g/q2": {}}
+        self.assertTrue(self.cache.checkForChanges())
+        self.assertEqual([e["kind"] for e in self.cache.status()], ["installedQueries"])
+
+    def test_watcher_runs_periodic_check(self):
+        self.cache.startWatcher(interval=0.05)
+        time.sleep(0.2)
+        self.cache.stopWatcher()
+        self.assertGreaterEqual(self.mock_connection.getInstalledQueries.call_count, 2)
+
+    def test_restarted_watcher_does_not_leak(self):
+        checking, release = threading.Event(), threading.Event()
+
+        def slowInstalledQueries():
+            checking.set()
+            release.wait(5)
+            return {"GET /query/g/q1": {}}
+        self.mock_connection.getInstalledQueries.side_effect = slowInstalledQueries
+        self.cache.startWatcher(interval=0.01)
+        old = self.cache._watcher
+        self.assertTrue(checking.wait(5))
+        # reconfigured while the old watcher is inside checkForChanges()
+        tuning = {"metadataTTL": 300, "metadataCheckInterval": 0.01}
+        with patch("mcp_server.tigerGraph.metadata_cache.tigerGraphTuning", side_effect=tuning.get):
+            self.cache.reconfigure()
+        self.addCleanup(self.cache.stopWatcher)
+        release.set()
+        old.join(2)
+        self.assertFalse(old.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
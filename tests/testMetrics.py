@@ -0,0 +1,93 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+# testMetrics.py: This test case performs checks on the metrics registry
+# (HDR histograms, Prometheus output, tool and backend call instrumentation)
+#******************************************************************************
+
+import json
+import socket
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+from mcp_server.mcp_metrics import Histogram, MetricsRegistry, metrics, instrumentTool, payloadSize, startMetricsServer
+from mcp_server.tigerGraph.instrumented_connection import InstrumentedConnection
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+
+    def test_histogram_precision(self):
+        histogram = Histogram()
+        for value in range(1, 100001):
+            histogram.record(value)
+        for quantile, expected in ((0.5, 50000), (0.9, 90000), (0.99, 99000)):
+            self.assertLess(abs(histogram.percentile(quantile) - expected) / expected, 0.07)
+        self.assertEqual((histogram.min, histogram.max, histogram.count), (1, 100000, 100000))
+        for value in (0, 15, 16, 17, 1000, 123456789):
+            index = Histogram.bucketIndex(value)
+            self.assertGreaterEqual(Histogram.bucketValue(index), value)
+            self.assertTrue(index == 0 or Histogram.bucketValue(index - 1) < value)
+
+    def test_prometheus_text(self):
+        registry = MetricsRegistry()
+        registry.inc("calls_total", {"tool": "run_query", "status": "ok"}, help="calls")
+        registry.observeSeconds("latency_seconds", 0.25, {"tool": 'a"b'})
+        text = registry.prometheusText()
+        self.assertIn("# TYPE calls_total counter", text)
+        self.assertIn('calls_total{status="ok",tool="run_query"} 1', text)
+        self.assertIn('latency_seconds{tool="a\\"b",quantile="0.5"} 0.25', text)
+        self.assertIn('latency_seconds_count{tool="a\\"b"} 1', text)
+
+    def test_instrument_sync_and_async_tools(self):
+        def get_schema(graph:str="g"):
+            return "x" * 100
+
+        async def run_query(query_name:str):
+            raise ValueError("boom")
+
+        wrapped = instrumentTool(get_schema)
+        self.assertEqual(wrapped.__name__, "get_schema")
+        self.assertEqual(wrapped(), "x" * 100)
+        with self.assertRaises(ValueError):
+            asyncio.run(instrumentTool(run_query)("q"))
+        snapshot = metrics.snapshot()
+        calls = {(c["labels"]["tool"], c["labels"]["status"]): c["value"] for c in snapshot["counters"]["mcp_tool_calls_total"]}
+        self.assertEqual(calls, {("get_schema", "ok"): 1, ("run_query", "error"): 1})
+        self.assertEqual(snapshot["histograms"]["mcp_tool_response_bytes"][0]["max"], 100)
+
+    def test_instrumented_connection(self):
+        connection = MagicMock()
+        connection.graphname = "Social"
+        connection.gsql.return_value = "ok"
+        connection.getVertices.side_effect = Exception("REST-30000")
+        proxy = InstrumentedConnection(connection)
+        self.assertEqual(proxy.graphname, "Social")
+        proxy.apiToken = "token"
+        self.assertEqual(connection.apiToken, "token")
+        self.assertEqual(proxy.gsql("ls"), "ok")
+        with self.assertRaises(Exception):
+            proxy.getVertices("Person")
+        calls = {(c["labels"]["method"], c["labels"]["api"], c["labels"]["status"])
+                 for c in metrics.snapshot()["counters"]["tigergraph_backend_calls_total"]}
+        self.assertEqual(calls, {("gsql", "GSQL", "ok"), ("getVertices", "RESTPP", "error")})
+        self.assertIs(proxy.unwrap(), connection)
+
+    def test_metrics_port_in_use(self):
+        self.assertIsNone(startMetricsServer(0))
+        with socket.socket() as busy:
+            busy.bind(("127.0.0.1", 0))
+            busy.listen()
+            with self.assertLogs("mcp_server.mcp_logger", level="ERROR"):
+                self.assertIsNone(startMetricsServer(busy.getsockname()[1]))
+
+    def test_payload_size_estimate(self):
+        rows = [{"v_id": str(i), "attributes": {"name": f"person{i:05d}", "age": 30}} for i in range(10000)]
+        exact = len(json.dumps(rows, separators=(',', ':')))
+        self.assertLess(abs(payloadSize(rows) - exact) / exact, 0.1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
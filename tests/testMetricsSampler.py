@@ -0,0 +1,141 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+# testMetricsSampler.py: This test case performs checks on the MetricsSampler
+# class (ring buffer history of the system metrics, window statistics,
+# sparkline trends and disk growth forecasts)
+#******************************************************************************
+
+import time
+import unittest
+import numpy as np
+from unittest.mock import MagicMock, patch
+from mcp_server.tigerGraph.metrics_sampler import (MetricsSampler, RingBuffer, sparkline, fitSlopes, CPU_MEMORY,
+                                                   DISKSPACE, SPARK_CHARACTERS)
+
+ALERTS = {"diskFullAlertHours": 72, "diskGrowthAlertPercent": 10}
+
+
+class TestMetricsSampler(unittest.TestCase):
+
+    def setUp(self):
+        self.cpu = [10.0]
+        self.connection = MagicMock()
+        self.connection.getSystemMetrics.side_effect = self.fakeMetrics
+        self.session = MagicMock()
+        self.session.getConnection.return_value = self.connection
+        self.sampler = MetricsSampler(self.session, interval=0, capacity=5)
+
+    def fakeMetrics(self, latest=None, what=None):
+        if what == CPU_MEMORY:
+            return {"CPUMemoryMetrics": [
+                {"HostID": "m1", "ServiceDescriptor": {"ServiceName": "GPE", "Partition": 1, "Replica": 1},
+                 "CPU": {"CPUUsage": self.cpu[0]}, "Memory": {"MemoryUsageMB": 2048}},
+                {"HostID": "m1", "ServiceDescriptor": {"ServiceName": "RESTPP", "Partition": 1, "Replica": 1},
+                 "CPU": {}, "Memory": {"MemoryUsageMB": 512}}]}
+        return {"DiskMetrics": [{"HostID": "m1", "Disk": {"PathName": "gstore", "SizeMB": 100, "FreeSizeMB": 900}}]}
+
+    def test_ring_buffer_wraps_around(self):
+        buffer = RingBuffer(3)
+        for second in range(5):
+            buffer.append(float(second), second * 10.0)
+        times, values = buffer.ordered()
+        self.assertEqual(times.tolist(), [2.0, 3.0, 4.0])
+        self.assertEqual(values.tolist(), [20.0, 30.0, 40.0])
+        self.assertEqual(buffer.window(3.0)[1].tolist(), [30.0, 40.0])
+        self.assertEqual(buffer.resized(2).ordered()[1].tolist(), [30.0, 40.0])
+        self.assertEqual(buffer.resized(10).ordered()[1].tolist(), [20.0, 30.0, 40.0])
+
+    def test_sparkline(self):
+        self.assertEqual(sparkline(np.array([])), "")
+        self.assertEqual(sparkline(np.array([5.0, 5.0])), SPARK_CHARACTERS[0] * 2)
+        line = sparkline(np.arange(100, dtype=float), width=10)
+        self.assertEqual(len(line), 10)
+        self.assertEqual((line[0], line[-1]), (SPARK_CHARACTERS[0], SPARK_CHARACTERS[-1]))
+
+    def test_sample_records_every_metric(self):
+        self.assertTrue(self.sampler.sample())
+        self.connection.getSystemMetrics.assert_any_call(latest=1, what=CPU_MEMORY)
+        self.connection.getSystemMetrics.assert_any_call(latest=1, what=DISKSPACE)
+        self.assertEqual(sorted(self.sampler.history(CPU_MEMORY, "cpu")), ["GPE_1#1@m1", "RESTPP_1#1@m1"])
+        self.assertEqual(self.sampler.history(CPU_MEMORY, "cpu", "restpp")["RESTPP_1#1@m1"][1].tolist(), [0.0])
+        self.assertEqual(self.sampler.history(DISKSPACE, "freeMB")["gstore@m1"][1].tolist(), [900.0])
+        self.connection.getSystemMetrics.side_effect = ConnectionError("server down")
+        self.assertFalse(self.sampler.sample())
+        self.assertEqual((self.sampler.status()["samples"], self.sampler.status()["errors"]), (1, 1))
+
+    def test_summarize_window(self):
+        now = time.time()
+        for minute, cpu in enumerate([90.0, 10.0, 20.0, 30.0, 40.0, 50.0]):
+            self.cpu[0] = cpu
+            self.sampler.sample(now - (5 - minute) * 60)
+        # capacity 5: the 90% sample was overwritten
+        summary = self.sampler.summarize(CPU_MEMORY, "cpu", 3.5 * 60, "GPE")[0]
+        self.assertEqual(summary["samples"], 4)
+        self.assertEqual((summary["min"], summary["max"], summary["last"]), (20.0, 50.0, 50.0))
+        self.assertAlmostEqual(summary["avg"], 35.0)
+        self.assertEqual(summary["spanSeconds"], 180.0)
+        self.assertEqual(len(summary["sparkline"]), 4)
+
+    def test_display_trend(self):
+        self.assertIn("No samples yet", "\n".join(self.sampler.displayTrend("CPU", CPU_MEMORY, [("CPU %", "cpu")])))
+        self.sampler.sample()
+        lines = self.sampler.displayTrend("CPU and Memory", CPU_MEMORY, [("CPU %", "cpu"), ("Memory MB", "memoryMB")],
+                                          window_minutes=5, component="GPE")
+        rows = [line for line in lines if line.startswith("GPE")]
+        self.assertEqual(len(rows), 2)
+        self.assertIn("2,048.00", rows[1])
+        self.assertIn("No samples in the last 5 minutes for 'nothing'",
+                      self.sampler.displayTrend("CPU", CPU_MEMORY, [("CPU %", "cpu")], 5, "nothing")[-1])
+
+    def test_reconfigure_keeps_recent_samples(self):
+        now = time.time()
+        for second in range(4):
+            self.sampler.sample(now + second)
+        tuning = {"metricsSampleInterval": 0, "metricsHistory": 2}
+        with patch("mcp_server.tigerGraph.metrics_sampler.tigerGraphTuning", side_effect=tuning.get):
+            self.sampler.start()
+            self.sampler.reconfigure()
+        self.assertEqual(self.sampler.capacity, 2)
+        self.assertEqual(self.sampler.history(DISKSPACE, "sizeMB")["gstore@m1"][0].tolist(), [now + 2, now + 3])
+        self.assertFalse(self.sampler.status()["running"])
+
+    def test_fit_slopes_of_all_series(self):
+        hours = np.arange(5) * 3600.0
+        slopes = fitSlopes({"a": (hours, 100 + 2.0 * np.arange(5)), "b": (hours[:3], np.array([9.0, 6.0, 3.0])),
+                            "c": (hours[:1], np.array([1.0]))})
+        self.assertAlmostEqual(slopes["a"][0], 2.0)
+        self.assertAlmostEqual(slopes["a"][1], 1.0)
+        self.assertAlmostEqual(slopes["b"][0], -3.0)
+        self.assertEqual(slopes["c"], (0.0, 0.0))
+        self.assertEqual(fitSlopes({}), {})
+
+    def test_forecast_disks(self):
+        now = time.time()
+        for hour in range(5):
+            self.sampler.record(DISKSPACE, "gstore", "sizeMB", now - (4 - hour) * 3600, 1000 + 10 * hour)
+            self.sampler.record(DISKSPACE, "gstore", "freeMB", now - (4 - hour) * 3600, 500 - 10 * hour)
+            self.sampler.record(DISKSPACE, "log", "sizeMB", now - (4 - hour) * 3600, 50)
+            self.sampler.record(DISKSPACE, "log", "freeMB", now - (4 - hour) * 3600, 500)
+        self.sampler.samples = 5
+        with patch("mcp_server.tigerGraph.metrics_sampler.tigerGraphTuning", side_effect=ALERTS.get):
+            forecasts = {forecast["path"]: forecast for forecast in self.sampler.forecastDisks(300)}
+            lines = self.sampler.displayDiskForecast(300)
+        gstore = forecasts["gstore"]
+        self.assertAlmostEqual(gstore["growthMBPerHour"], 10.0)
+        self.assertAlmostEqual(gstore["freeShrinkMBPerHour"], 10.0)
+        # 460 MB free left, shrinking 10 MB per hour
+        self.assertAlmostEqual(gstore["hoursToFull"], 46.0)
+        self.assertAlmostEqual(gstore["growthPercentPerDay"], 10 * 24 / 1040 * 100)
+        self.assertEqual(gstore["alerts"], ["full soon", "fast growth"])
+        self.assertIsNone(forecasts["log"]["hoursToFull"])
+        self.assertEqual(forecasts["log"]["alerts"], [])
+        rows = [line for line in lines if line.startswith(("gstore", "log"))]
+        self.assertTrue(rows[0].startswith("gstore"))
+        self.assertIn("46.0 hours", rows[0])
+        self.assertIn("never", rows[1])
+        self.assertIn("1 of 2 paths flagged", lines[-1])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
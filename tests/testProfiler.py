@@ -0,0 +1,83 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+# testProfiler.py: This test case performs checks on the opt-in tool profiler
+# (cProfile / tracemalloc report, per-call and TG_PROFILE_TOOLS activation)
+#******************************************************************************
+
+import os
+import tempfile
+import unittest
+import tracemalloc
+import contextvars
+from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
+from mcp_server.mcp_profiler import profileTool, profilingEnabled, runProfiled, profiledWorker
+
+
+def export_rows(rows:int=20000, profile:bool=False):
+    data = [{"v_id": str(i), "name": f"person{i}"} for i in range(rows)]
+    return f"exported {len(data)} rows"
+
+
+def export_in_workers(rows:int=2000, workers:int=4):
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, profiledWorker(export_rows), rows)
+                   for _ in range(workers)]
+        return [future.result() for future in futures]
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_report_contents(self):
+        result, reportFile = runProfiled("export_rows", export_rows, 20000, outputDir=self.directory.name)
+        self.assertEqual(result, "exported 20000 rows")
+        self.assertTrue(os.path.basename(reportFile).startswith("profile_export_rows_"))
+        with open(reportFile, 'r', encoding='utf-8') as file:
+            report = file.read()
+        self.assertIn("functions by cumulative time", report)
+        self.assertIn("export_rows", report)
+        self.assertIn("allocation sites", report)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_worker_threads_are_profiled(self):
+        result, reportFile = runProfiled("batch", export_in_workers, outputDir=self.directory.name)
+        self.assertEqual(result, ["exported 2000 rows"] * 4)
+        with open(reportFile, 'r', encoding='utf-8') as file:
+            report = file.read()
+        self.assertIn("(export_rows)", report)
+
+    def test_report_names_are_unique(self):
+        reports = {runProfiled("export_rows", export_rows, 10, outputDir=self.directory.name)[1] for _ in range(3)}
+        self.assertEqual(len(reports), 3)
+        self.assertEqual(len(os.listdir(self.directory.name)), 3)
+
+    def test_activation(self):
+        with patch("mcp_server.mcp_profiler.tigerGraphTuning", side_effect=lambda key: {"profileTools": "run_query, get_schema", "profileTop": 10}[key]):
+            self.assertTrue(profilingEnabled("get_schema"))
+            self.assertFalse(profilingEnabled("show_query"))
+            self.assertTrue(profilingEnabled("show_query", requested=True))
+        with patch("mcp_server.mcp_profiler.tigerGraphTuning", side_effect=lambda key: {"profileTools": "*", "profileTop": 10}[key]):
+            self.assertTrue(profilingEnabled("show_query"))
+
+    def test_tool_wrapper(self):
+        wrapped = profileTool(export_rows)
+        self.assertEqual(wrapped.__name__, "export_rows")
+        settings = {"profileTools": "", "profileTop": 10}
+        with patch("mcp_server.mcp_profiler.tigerGraphTuning", side_effect=settings.get), \
+             patch("mcp_server.mcp_profiler.tigerGraphConstants", return_value=self.directory.name):
+            self.assertEqual(wrapped(rows=10), "exported 10 rows")
+            self.assertEqual(os.listdir(self.directory.name), [])
+            result = wrapped(rows=10, profile=True)
+        self.assertTrue(result.startswith("exported 10 rows\n# Profile written to profile_export_rows_"))
+        self.assertEqual(len(os.listdir(self.directory.name)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
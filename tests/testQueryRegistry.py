@@ -0,0 +1,80 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+# testQueryRegistry.py: This test case performs checks on the RunningQueryRegistry
+# class (tracking run_query calls, detached runs and their server request ids)
+#******************************************************************************
+
+import unittest
+from unittest.mock import MagicMock
+from mcp_server.tigerGraph.query_registry import RunningQueryRegistry, runDetached, DetachedQueryError
+
+
+class TestQueryRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = RunningQueryRegistry()
+
+    def test_start_and_finish(self):
+        first = self.registry.start("run_query", "q1", {"id": "1"})
+        second = self.registry.start("batch_run_query", "q1", {"id": "2"}, callId="mcp-custom")
+        self.assertNotEqual(first.callId, second.callId)
+        self.assertEqual([call.callId for call in self.registry.calls()], [first.callId, "mcp-custom"])
+        self.registry.finish(first.callId)
+        self.assertIsNone(self.registry.get(first.callId))
+        self.assertEqual(self.registry.get("mcp-custom").asDict()["tool"], "batch_run_query")
+
+    def test_match_by_exact_request_id(self):
+        ours = self.registry.start("run_query", "slowQuery", {"id": "ours"})
+        ours.requestId = "r-ours"
+        pending = self.registry.start("batch_run_query", "slowQuery", {"id": "pending"})
+        running = [
+            {"requestid": "r-ours", "url": "/query/Social/slowQuery?id=ours", "elapsedTime": 200},
+            {"requestid": "r-foreign", "url": "/query/Social/slowQuery?id=other", "elapsedTime": 200},
+        ]
+        matches = self.registry.match(running)
+        # another client's request of the same query is never taken for ours
+        self.assertEqual(matches, {"r-ours": ours})
+        self.assertIsNone(pending.requestId)
+        self.assertTrue(self.registry.isCallId(ours.callId))
+        self.assertFalse(self.registry.isCallId("16842754.RESTPP_1_1.1700000000000.N"))
+
+    def test_run_detached(self):
+        connection = MagicMock()
+        connection.runInstalledQuery.return_value = "r-1"
+        connection.checkQueryStatus.side_effect = [[], [{"requestid": "r-1", "status": "running"}],
+                                                   [{"requestid": "r-1", "status": "success"}]]
+        connection.getQueryResult.return_value = [{"total": 3}]
+        call = self.registry.start("run_query", "q", {"k": 1})
+        sleeps = []
+        self.assertEqual(runDetached(connection, call, 10, sleep=sleeps.append), [{"total": 3}])
+        connection.runInstalledQuery.assert_called_once_with("q", {"k": 1}, timeout=10000, runAsync=True)
+        connection.getQueryResult.assert_called_once_with("r-1")
+        self.assertEqual(call.requestId, "r-1")
+        self.assertEqual(sleeps, [0.01, 0.015])
+
+    def test_run_detached_poll_interval_is_capped(self):
+        connection = MagicMock()
+        connection.runInstalledQuery.return_value = "r-3"
+        connection.checkQueryStatus.side_effect = [[{"requestid": "r-3", "status": "running"}]] * 12 + \
+                                                  [[{"requestid": "r-3", "status": "success"}]]
+        sleeps = []
+        runDetached(connection, self.registry.start("run_query", "q", {}), 10, sleep=sleeps.append)
+        self.assertEqual(len(sleeps), 12)
+        self.assertEqual(sleeps[-3:], [0.25, 0.25, 0.25])
+        self.assertLess(sum(sleeps), 2.0)
+
+    def test_run_detached_aborted(self):
+        connection = MagicMock()
+        connection.runInstalledQuery.return_value = "r-2"
+        connection.checkQueryStatus.return_value = [{"requestid": "r-2", "status": "aborted"}]
+        call = self.registry.start("run_query", "q", {})
+        # cancelled before the request id was known: aborted as soon as it is
+        call.cancelled = True
+        with self.assertRaises(DetachedQueryError):
+            runDetached(connection, call, 10, sleep=lambda seconds: None)
+        connection.abortQuery.assert_called_once_with("r-2")
+        connection.getQueryResult.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
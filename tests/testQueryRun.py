@@ -23,6 +23,9 @@ class TestRunQuery(unittest.TestCase):
         self.instance.getConnection = Mock(return_value=self.mock_connection)
         self.instance.isResultSetEmpty = Mock()
         self.instance.json_to_csv = Mock()
+        # run_query runs detached: runInstalledQuery returns the request id, the results are read once it succeeded
+        self.mock_connection.runInstalledQuery.return_value = "req-1"
+        self.mock_connection.checkQueryStatus.return_value = [{"requestid": "req-1", "status": "success"}]
         
         # Sample test data
         self.sample_results = {
@@ -38,7 +41,7 @@ class TestRunQuery(unittest.TestCase):
     def test_run_query_with_terminal_format_in_params(self):
         """Test run_query returns formatted JSON when params contain format='terminal'."""
         # Arrange
-        self.mock_connection.runInstalledQuery.return_value = self.sample_results
+        self.mock_connection.getQueryResult.return_value = self.sample_results
         self.instance.isResultSetEmpty.return_value = False
 
         
@@ -51,7 +54,7 @@ class TestRunQuery(unittest.TestCase):
         
         # Assert
         self.mock_connection.runInstalledQuery.assert_called_once_with(
-            self.query_name, self.params, timeout=60000
+            self.query_name, self.params, timeout=60000, runAsync=True
         )
         expected_json = json.dumps(self.sample_results, indent=4, separators=(',', ':'))
         # Verify it's valid JSON
@@ -62,7 +65,7 @@ class TestRunQuery(unittest.TestCase):
     def test_run_query_with_csv_output_format(self, mock_print, mock_file):
         """Test run_query writes CSV file when outputFormat is 'csv'."""
         # Arrange
-        self.mock_connection.runInstalledQuery.return_value = self.sample_results
+        self.mock_connection.getQueryResult.return_value = self.sample_results
         self.instance.isResultSetEmpty.return_value = False
         expected_output_path = f"{OUTPUT_PATH}/{self.query_name}.csv"  # Replace OUTPUT_PATH with actual constant
         
@@ -85,7 +88,7 @@ class TestRunQuery(unittest.TestCase):
     def test_run_query_with_json_output_format(self, mock_print, mock_file):
         """Test run_query writes JSON file when outputFormat is 'json'."""
         # Arrange
-        self.mock_connection.runInstalledQuery.return_value = self.sample_results
+        self.mock_connection.getQueryResult.return_value = self.sample_results
         self.instance.isResultSetEmpty.return_value = False
         expected_output_path = f"{OUTPUT_PATH}/{self.query_name}.json"  # Replace OUTPUT_PATH with actual constant
         
@@ -109,7 +112,7 @@ class TestRunQuery(unittest.TestCase):
         """Test run_query behavior when results are empty."""
 
         # Arrange
-        self.mock_connection.runInstalledQuery.return_value = {}
+        self.mock_connection.getQueryResult.return_value = {}
         self.instance.isResultSetEmpty.return_value = True
         self.params= {}        
         # Act
@@ -128,7 +131,7 @@ class TestRunQuery(unittest.TestCase):
     def test_run_query_with_custom_timeout(self):
         """Test run_query passes correct timeout to runInstalledQuery."""
         # Arrange
-        self.mock_connection.runInstalledQuery.return_value = self.sample_results
+        self.mock_connection.getQueryResult.return_value = self.sample_results
         self.instance.isResultSetEmpty.return_value = False
         custom_timeout = 120
         
@@ -141,13 +144,13 @@ class TestRunQuery(unittest.TestCase):
         
         # Assert
         self.mock_connection.runInstalledQuery.assert_called_once_with(
-            self.query_name, self.params, timeout=custom_timeout * 1000
+            self.query_name, self.params, timeout=custom_timeout * 1000, runAsync=True
         )
     
     def test_run_query_with_default_parameters(self):
         """Test run_query works with minimal parameters using defaults."""
         # Arrange
-        self.mock_connection.runInstalledQuery.return_value = ''
+        self.mock_connection.getQueryResult.return_value = ''
         self.instance.isResultSetEmpty.return_value = True
         self.params = {}
         # Act
@@ -155,14 +158,15 @@ class TestRunQuery(unittest.TestCase):
         
         # Assert
         self.mock_connection.runInstalledQuery.assert_called_once_with(
-            self.query_name, {}, timeout=60000
+            self.query_name, {}, timeout=60000, runAsync=True
         )
+        self.mock_connection.getQueryResult.assert_called_once_with("req-1")
         self.assertEqual(result,'')  # No output format specified, so no return value
     
     def test_run_query_sets_empty_results_attribute(self):
         """Test run_query correctly sets the emptyResults attribute."""
         # Arrange
-        self.mock_connection.runInstalledQuery.return_value = self.sample_results
+        self.mock_connection.getQueryResult.return_value = self.sample_results
         self.instance.isResultSetEmpty.return_value = False
         self.params = {}
         # Act
@@ -177,7 +181,7 @@ class TestRunQuery(unittest.TestCase):
     def test_run_query_with_invalid_output_format(self):
         """Test run_query behavior with unrecognized outputFormat."""
         # Arrange
-        self.mock_connection.runInstalledQuery.return_value = self.sample_results
+        self.mock_connection.getQueryResult.return_value = self.sample_results
         self.instance.isResultSetEmpty.return_value = False
         
         # Act
@@ -0,0 +1,91 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+# testQuerySignatures.py: This test case performs mock checks against the
+# QuerySignatureCache class (signature parsing, parameter validation / coercion)
+#******************************************************************************
+
+import unittest
+from unittest.mock import MagicMock
+from mcp_server.tigerGraph.query_signatures import QuerySignature, QuerySignatureCache, QueryParameterError
+
+QUERY_TEXT = """CREATE QUERY findFriends(VERTEX<Person> p, INT depth = 2, SET<STRING> tags, DOUBLE minScore,
+    BOOL active = TRUE, DATETIME since, LIST<VERTEX<Person>> others, VERTEX anyone = "x, y") FOR GRAPH Social {
+  PRINT p;
+}"""
+
+INSTALLED = {
+    "GET /query/Social/findFriends": {"parameters": {}},
+    "GET /query/Social/topPeople": {"parameters": {}},
+}
+
+
+class TestQuerySignatures(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_session = MagicMock()
+        self.mock_connection = MagicMock()
+        self.mock_session.getConnection.return_value = self.mock_connection
+        self.mock_connection.showQuery.return_value = QUERY_TEXT
+        self.mock_connection.getInstalledQueries.return_value = INSTALLED
+        self.cache = QuerySignatureCache(self.mock_session)
+
+    def test_parse_signature(self):
+        signature = QuerySignature.parse("findFriends", QUERY_TEXT)
+        self.assertEqual(list(signature.parameters.keys()),
+                         ["p", "depth", "tags", "minScore", "active", "since", "others", "anyone"])
+        self.assertEqual(signature.parameters["tags"].collection, "SET")
+        self.assertEqual(signature.parameters["others"].elementType, "VERTEX<PERSON>")
+        self.assertEqual(signature.parameters["anyone"].default, "x, y")
+        self.assertTrue(signature.parameters["p"].required)
+        self.assertFalse(signature.parameters["depth"].required)
+        self.assertIsNone(QuerySignature.parse("findFriends", MagicMock()))
+
+    def test_validate_coerces_parameters(self):
+        params = self.cache.validate("findFriends", {"p": 7, "depth": "3", "tags": "a", "minScore": "0.5",
+                                                     "active": "false", "since": "2024-01-02",
+                                                     "others": ["1", 2]})
+        self.assertEqual(params, {"p": "7", "depth": 3, "tags": ["a"], "minScore": 0.5, "active": False,
+                                  "since": "2024-01-02 00:00:00", "others": ["1", "2"]})
+
+    def test_validate_rejects_bad_parameters(self):
+        with self.assertRaises(QueryParameterError) as context:
+            self.cache.validate("findFriends", {"p": "1", "dept": 3, "minScore": "high"})
+        message = str(context.exception)
+        self.assertIn("did you mean 'depth'", message)
+        self.assertIn("minScore", message)
+        with self.assertRaises(QueryParameterError) as context:
+            self.cache.validate("findFriends", {"depth": 1})
+        self.assertIn("missing required parameter 'p'", str(context.exception))
+        with self.assertRaises(QueryParameterError) as context:
+            self.cache.validate("findFriend", {})
+        self.assertIn("not installed", str(context.exception))
+        self.mock_connection.runInstalledQuery.assert_not_called()
+
+    def test_query_installed_elsewhere_is_found(self):
+        self.cache.validate("topPeople", {})
+        self.mock_connection.getInstalledQueries.return_value = dict(INSTALLED, **{
+            "GET /query/Social/newQuery": {"parameters": {}}})
+        # not in the cached list: the list is read again once before rejecting
+        self.cache.validate("newQuery", {})
+        self.assertEqual(self.mock_connection.getInstalledQueries.call_count, 2)
+
+    def test_signatures_are_cached_until_install(self):
+        for _ in range(5):
+            self.cache.validate("findFriends", {"p": "1"})
+        self.assertEqual(self.cache.metadata.status()[0]["hits"], 4)
+        self.assertEqual(self.mock_connection.showQuery.call_count, 1)
+        self.assertEqual(self.mock_connection.getInstalledQueries.call_count, 1)
+        self.cache.invalidate("findFriends")
+        self.cache.validate("findFriends", {"p": "1"})
+        self.assertEqual(self.mock_connection.showQuery.call_count, 2)
+
+    def test_unknown_signature_passes_through(self):
+        self.mock_connection.showQuery.side_effect = Exception("connection refused")
+        self.mock_connection.getInstalledQueries.return_value = {}
+        params = {"anything": "goes"}
+        self.assertIs(self.cache.validate("adhoc", params), params)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
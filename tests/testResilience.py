@@ -0,0 +1,111 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+# testResilience.py: This test case performs checks on the backend retry policy
+# and circuit breakers (idempotency-aware retries, fail fast, half-open trial)
+#******************************************************************************
+
+import unittest
+from unittest.mock import MagicMock, patch
+from requests import Response
+from requests.exceptions import ConnectionError, ConnectTimeout, HTTPError, ReadTimeout
+from mcp_server.tigerGraph.instrumented_connection import InstrumentedConnection
+from mcp_server.tigerGraph.resilience import (Resilience, CircuitBreaker, CircuitOpenError, isTransient,
+                                              notSent, isReadMethod, CLOSED, OPEN, HALF_OPEN)
+
+TUNING = {"retryAttempts": 3, "retryBaseDelay": 0.5, "retryMaxDelay": 8.0, "breakerFailures": 3,
+          "breakerResetSeconds": 30}
+
+
+def httpError(status:int) -> HTTPError:
+    response = Response()
+    response.status_code = status
+    return HTTPError(f"{status} Server Error", response=response)
+
+
+class TestResilience(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch("mcp_server.tigerGraph.resilience.tigerGraphTuning", side_effect=TUNING.get)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.delays = []
+        self.resilience = Resilience(sleep=self.delays.append)
+        self.connection = MagicMock()
+        self.proxy = InstrumentedConnection(self.connection, resilience=self.resilience)
+
+    def test_error_classification(self):
+        self.assertTrue(isTransient(ReadTimeout("read timed out")))
+        self.assertTrue(isTransient(httpError(503)))
+        self.assertFalse(isTransient(httpError(400)))
+        self.assertFalse(isTransient(Exception("REST-10016 query failed")))
+        wrapped = RuntimeError("Connection error")
+        wrapped.__cause__ = ConnectionError("reset by peer")
+        self.assertTrue(isTransient(wrapped))
+        self.assertTrue(notSent(ConnectTimeout("connect timed out")))
+        self.assertTrue(notSent(ConnectionError("Failed to establish a new connection: [Errno 111] Connection refused")))
+        self.assertFalse(notSent(ReadTimeout("read timed out")))
+        self.assertTrue(isReadMethod("getVertices"))
+        self.assertFalse(isReadMethod("upsertVertex"))
+        self.assertFalse(isReadMethod("gsql"))
+
+    def test_read_retried_with_jittered_backoff(self):
+        self.connection.getVertices.side_effect = [ReadTimeout("timed out"), httpError(502), [{"v_id": "1"}]]
+        self.assertEqual(self.proxy.getVertices("Person"), [{"v_id": "1"}])
+        self.assertEqual(self.connection.getVertices.call_count, 3)
+        self.assertEqual(len(self.delays), 2)
+        self.assertTrue(0 <= self.delays[0] <= 0.5 and 0 <= self.delays[1] <= 1.0)
+        self.assertEqual(self.resilience.breaker("RESTPP").state, CLOSED)
+
+    def test_schema_change_not_retried_after_send(self):
+        self.connection.gsql.side_effect = ReadTimeout("timed out")
+        with self.assertRaises(ReadTimeout):
+            self.proxy.gsql("CREATE VERTEX Person (PRIMARY_ID id STRING)")
+        self.connection.gsql.assert_called_once()
+        self.assertEqual(self.delays, [])
+
+    def test_write_retried_when_never_sent(self):
+        self.connection.upsertVertex.side_effect = [ConnectTimeout("connect timed out"), 1]
+        self.assertEqual(self.proxy.upsertVertex("Person", "1", {}), 1)
+        self.assertEqual(self.connection.upsertVertex.call_count, 2)
+
+    def test_query_errors_not_retried(self):
+        self.connection.getVertices.side_effect = Exception("REST-30000 vertex type Person not found")
+        with self.assertRaises(Exception):
+            self.proxy.getVertices("Person")
+        self.connection.getVertices.assert_called_once()
+        self.assertEqual(self.resilience.breaker("RESTPP").failures, 0)
+
+    def test_breaker_opens_and_fails_fast(self):
+        self.connection.getVertices.side_effect = ConnectTimeout("connect timed out")
+        with self.assertRaises(ConnectTimeout):
+            self.proxy.getVertices("Person")
+        # three failed attempts opened the breaker: the next calls are rejected without a request
+        breaker = self.resilience.breaker("RESTPP")
+        self.assertEqual(breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.proxy.getEdges("Person", "1")
+        self.connection.getEdges.assert_not_called()
+        self.assertEqual(breaker.rejected, 1)
+        # GSQL has its own breaker
+        self.connection.gsql.return_value = "ok"
+        self.assertEqual(self.proxy.gsql("ls"), "ok")
+
+    def test_half_open_trial(self):
+        breaker = CircuitBreaker("RESTPP", failureThreshold=1, resetSeconds=0)
+        breaker.recordFailure(ConnectTimeout("down"))
+        self.assertEqual(breaker.state, OPEN)
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.state, HALF_OPEN)
+        # only one trial call at a time
+        self.assertFalse(breaker.allow())
+        breaker.recordFailure(ConnectTimeout("still down"))
+        self.assertEqual(breaker.state, OPEN)
+        self.assertTrue(breaker.allow())
+        breaker.recordSuccess()
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(breaker.status()["trips"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
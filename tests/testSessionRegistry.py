@@ -0,0 +1,168 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+# testSessionRegistry.py: This test case performs checks on the multi-graph
+# SessionRegistry (lazy per-graph connections, idle / LRU eviction, graph tool
+# argument, per-graph metadata)
+#******************************************************************************
+
+import os
+import time
+import anyio
+import threading
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from mcp.server.fastmcp import FastMCP
+from mcp_server.tigerGraph.mcp_Server import TigerGraph_MCP_Server
+from mcp_server.tigerGraph.session import TigerGraph_Session
+from mcp_server.tigerGraph.startup_cache import StartupCache
+from mcp_server.tigerGraph.metadata_cache import MetadataCache
+from mcp_server.tigerGraph.instrumented_connection import InstrumentedConnection
+from mcp_server.tigerGraph.session_registry import SessionRegistry, currentGraph, useGraph, graphTool
+from mcp_server.mcp_metrics import instrumentTool
+from mcp_server.mcp_tracing import traceTool
+from mcp_server.mcp_profiler import profileTool
+
+
+class TestSessionRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.primary = InstrumentedConnection(MagicMock(name="primary"))
+        self.primary.unwrap().check_exist_graphs.side_effect = lambda graph: graph != "missing"
+        self.session = MagicMock()
+        self.session.connections.return_value = [self.primary]
+        self.session.tokenManager.token = "session-token"
+        self.session.newConnection.side_effect = lambda graph: InstrumentedConnection(MagicMock(name=graph))
+        self.registry = SessionRegistry(self.session, idleSeconds=60, maxGraphs=2)
+
+    def test_connection_opened_once_per_graph(self):
+        connection = self.registry.connection("Sales")
+        self.assertIs(self.registry.connection("Sales"), connection)
+        self.session.newConnection.assert_called_once_with(graph="Sales")
+        # shares the per-thread HTTP sessions of the primary connection, and the session token
+        self.assertIs(connection.unwrap()._local, self.primary.unwrap()._local)
+        self.assertEqual(connection.apiToken, "session-token")
+        self.assertEqual(self.registry.status()[0]["calls"], 2)
+        with self.assertRaises(ValueError):
+            self.registry.connection("missing")
+
+    def test_idle_and_least_recently_used_eviction(self):
+        evicted = []
+        self.registry.onEvict(evicted.append)
+        self.registry.connection("Sales")
+        self.registry.connection("Hr")
+        self.registry.connection("Sales")
+        # a third graph closes the least recently used one
+        self.registry.connection("Ops")
+        self.assertEqual(evicted, ["Hr"])
+        self.registry._graphs["Ops"].lastUsed = time.time() - 61
+        self.assertEqual(self.registry.evictIdle(), ["Ops"])
+        self.assertEqual([entry["graph"] for entry in self.registry.status()], ["Sales"])
+
+    def test_slow_graph_does_not_block_open_graphs(self):
+        self.registry.connection("Sales")
+        started, release = threading.Event(), threading.Event()
+
+        def exists(graph):
+            if graph == "Slow":
+                started.set()
+                release.wait(5)
+            return True
+        self.primary.unwrap().check_exist_graphs.side_effect = exists
+        opener = threading.Thread(target=self.registry.connection, args=("Slow",))
+        opener.start()
+        self.assertTrue(started.wait(5))
+        # served while Slow is still being checked on the server
+        start = time.time()
+        self.registry.connection("Sales")
+        self.assertEqual(self.registry.evictIdle(), [])
+        self.assertLess(time.time() - start, 1)
+        release.set()
+        opener.join(5)
+        self.assertEqual(sorted(entry["graph"] for entry in self.registry.status()), ["Sales", "Slow"])
+
+    def test_reconfigure(self):
+        for graph in ("Sales", "Hr"):
+            self.registry.connection(graph)
+        tuning = {"graphIdleSeconds": 30, "maxGraphs": 1}
+        with patch("mcp_server.tigerGraph.session_registry.tigerGraphTuning", side_effect=tuning.get):
+            self.registry.reconfigure()
+        self.assertEqual((self.registry.idleSeconds, self.registry.maxGraphs), (30, 1))
+        self.assertEqual([entry["graph"] for entry in self.registry.status()], ["Hr"])
+
+    def test_graph_tool_argument(self):
+        seen = []
+
+        def get_vertex(vertex_type:str, vertex_id:str):
+            """TigerGraph MCP tool: Get a vertex"""
+            seen.append(currentGraph.get())
+            return f"{vertex_type}:{vertex_id}"
+
+        async def run_query(query_name:str):
+            """TigerGraph MCP tool: Run a query"""
+            seen.append(await anyio.to_thread.run_sync(currentGraph.get))
+            return query_name
+
+        mcp = FastMCP("test")
+        for tool in (get_vertex, run_query):
+            mcp.tool()(instrumentTool(traceTool(profileTool(graphTool(tool)))))
+
+        async def scenario():
+            tools = {tool.name: tool for tool in await mcp.list_tools()}
+            self.assertIn("graph", tools["get_vertex"].inputSchema["properties"])
+            self.assertNotIn("graph", tools["get_vertex"].inputSchema.get("required", []))
+            await mcp.call_tool("get_vertex", {"vertex_type": "Person", "vertex_id": "1", "graph": "Sales"})
+            await mcp.call_tool("get_vertex", {"vertex_type": "Person", "vertex_id": "1"})
+            await mcp.call_tool("run_query", {"query_name": "q", "graph": "Hr"})
+        anyio.run(scenario)
+        self.assertEqual(seen, ["Sales", None, "Hr"])
+        self.assertIsNone(currentGraph.get())
+
+    def test_metadata_cached_per_graph(self):
+        connections = {None: MagicMock(), "Sales": MagicMock()}
+        connections[None].showQuery.return_value = "CREATE QUERY q() FOR GRAPH Main { PRINT 1; }"
+        connections["Sales"].showQuery.return_value = "CREATE QUERY q() FOR GRAPH Sales { PRINT 2; }"
+        self.session.getConnection.side_effect = lambda: connections[currentGraph.get()]
+        self.session.currentGraphName.side_effect = lambda: currentGraph.get() or "Main"
+        cache = MetadataCache(self.session, ttl=300)
+        self.assertIn("Main", cache.showQuery("q")[0])
+        with useGraph("Sales"):
+            self.assertIn("Sales", cache.showQuery("q")[0])
+            self.assertIn("Sales", cache.showQuery("q")[0])
+        self.assertEqual(connections["Sales"].showQuery.call_count, 1)
+        cache.invalidate(graph="Sales")
+        self.assertEqual([entry["graph"] for entry in cache.status()], ["Main"])
+
+    def test_session_routes_graph_calls(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        cacheFile = os.path.join(directory.name, ".startup_cache.json")
+
+        def connection(**kwargs):
+            backend = MagicMock(name=kwargs["graphname"])
+            backend.graphname = kwargs["graphname"]
+            backend.ping.return_value = {"error": False}
+            backend.getVersion.return_value = [{"version": "release_4.2.0_05-01-2025"}]
+            return backend
+        for target, value in (("pyTigerGraph.TigerGraphConnection", connection),
+                              ("mcp_server.tigerGraph.session.StartupCache",
+                               lambda identity: StartupCache(identity, cacheFile, ttl=0))):
+            patcher = patch(target, side_effect=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        session = TigerGraph_Session(lazy=True)
+        self.addCleanup(session.registry.stopWatcher)
+        self.addCleanup(session.tokenManager.stop)
+        session.secretsExists = MagicMock()
+        default = session.getConnection()
+        with useGraph("Sales"):
+            self.assertEqual(session.getConnection().graphname, "Sales")
+            self.assertEqual(session.currentGraphName(), "Sales")
+        with useGraph(session.graphName):
+            self.assertIs(session.getConnection(), default)
+        self.assertEqual(len(session.connections()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,83 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+# testSettings.py: This test case performs checks on the Settings object
+# (typed values, environment precedence, reload callbacks, .env file watch)
+#******************************************************************************
+
+import os
+import time
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+from mcp_server.config import Settings
+from mcp_server.tigerGraph.latency_tracker import QueryLatencyTracker
+
+
+class TestSettings(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.envFile = os.path.join(directory.name, ".env")
+        self.writeEnv("TG_GRAPH=Social\nTG_QUERY_WORKERS=4\nTG_TIMEOUT_FACTOR=2.5\nTG_LAZY_CONNECT=true\n")
+
+    def writeEnv(self, content:str):
+        with open(self.envFile, 'w', encoding='utf-8') as file:
+            file.write(content)
+
+    def test_typed_values(self):
+        with patch.dict(os.environ, {"TG_QUERY_WORKERS": "", "TG_TIMEOUT_FACTOR": "", "TG_PASSWORD": "secret"}):
+            settings = Settings(self.envFile)
+        self.assertEqual((settings.graph, settings.queryWorkers, settings.timeoutFactor, settings.lazyConnect),
+                         ("Social", 4, 2.5, True))
+        self.assertEqual(settings.backupWorkers, 4)
+        self.assertEqual(settings.host, "http://localhost")
+        self.assertEqual(settings.asDict()["password"], "****")
+        with self.assertRaises(LookupError):
+            settings.get("noSuchSetting")
+
+    def test_environment_takes_precedence(self):
+        with patch.dict(os.environ, {"TG_QUERY_WORKERS": "16"}):
+            settings = Settings(self.envFile)
+        self.assertEqual(settings.queryWorkers, 16)
+        self.assertEqual(settings.env("TG_GRAPH"), "Social")
+
+    def test_reload_notifies_changes(self):
+        settings = Settings(self.envFile)
+        settings.load()
+        changes = []
+        settings.onChange(changes.append)
+        self.assertEqual(settings.reload(), {})
+        self.writeEnv("TG_GRAPH=Social\nTG_QUERY_WORKERS=12\nTG_TIMEOUT_FACTOR=2.5\nTG_LAZY_CONNECT=true\n")
+        self.assertEqual(settings.reload(), {"queryWorkers": (4, 12)})
+        self.assertEqual(changes, [{"queryWorkers": (4, 12)}])
+        self.assertEqual(settings.queryWorkers, 12)
+
+    def test_watcher_reloads_modified_file(self):
+        settings = Settings(self.envFile)
+        reloaded = threading.Event()
+        settings.onChange(lambda changes: reloaded.set())
+        settings.startWatcher(interval=0.05)
+        self.addCleanup(settings.stopWatcher)
+        self.writeEnv("TG_GRAPH=Social\nTG_QUERY_WORKERS=4\nTG_TIMEOUT_FACTOR=4.0\n")
+        modified = time.time() + 10
+        os.utime(self.envFile, (modified, modified))
+        self.assertTrue(reloaded.wait(5))
+        self.assertEqual((settings.timeoutFactor, settings.lazyConnect), (4.0, False))
+
+    def test_latency_tracker_reconfigure(self):
+        tuning = {"latencyWindow": 10, "latencyMinSamples": 2, "timeoutFactor": 3.0, "timeoutMin": 1, "timeoutMax": 100}
+        with patch("mcp_server.tigerGraph.latency_tracker.tigerGraphTuning", side_effect=tuning.get):
+            tracker = QueryLatencyTracker()
+            for seconds in range(1, 11):
+                tracker.record("q", float(seconds))
+            tuning.update(latencyWindow=3, timeoutFactor=2.0)
+            tracker.reconfigure()
+        self.assertEqual(tracker.statistics("q")["q"]["samples"], 3)
+        self.assertEqual(tracker.defaultTimeout("q"), 20)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,97 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+# testStartupCache.py: This test case performs checks on the session startup
+# probes (concurrent execution, on-disk startup cache, timing breakdown)
+#******************************************************************************
+
+import os
+import json
+import time
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+from mcp_server.tigerGraph.session import TigerGraph_Session
+from mcp_server.tigerGraph.startup_cache import StartupCache
+
+
+class TestStartupCache(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cacheFile = os.path.join(directory.name, ".startup_cache.json")
+
+    def mockConnection(self, barrier:threading.Barrier=None) -> MagicMock:
+        def probe(result):
+            def call(*args, **kwargs):
+                if barrier is not None:
+                    barrier.wait()
+                return result
+            return call
+        connection = MagicMock()
+        connection.ping.return_value = {"error": False}
+        connection.check_exist_graphs.side_effect = probe(True)
+        connection.getVersion.side_effect = probe([{"version": "release_4.2.1_05-01-2025"}])
+        connection.gsql.side_effect = probe("Role superuser granted to: tigergraph")
+        return connection
+
+    def newSession(self, connection:MagicMock, ttl:int=3600) -> TigerGraph_Session:
+        with patch("pyTigerGraph.TigerGraphConnection", return_value=connection), \
+             patch("mcp_server.tigerGraph.session.USER", "tigergraph"), \
+             patch("mcp_server.tigerGraph.session.StartupCache",
+                   side_effect=lambda identity: StartupCache(identity, self.cacheFile, ttl=ttl)), \
+             patch.object(TigerGraph_Session, "secretsExists"):
+            return TigerGraph_Session()
+
+    def test_probes_run_concurrently(self):
+        # the graph, version and role probes can only pass the barrier together
+        connection = self.mockConnection(threading.Barrier(3, timeout=5))
+        session = self.newSession(connection, ttl=0)
+        self.assertTrue(session.connected)
+        self.assertEqual(session.probes, {"graphExists": True, "version": "release_4.2.1_05-01-2025",
+                                          "roles": {"superuser": True}})
+        self.assertEqual(set(session.startupTimings), {"ping", "graph", "secrets", "version", "roles"})
+        self.assertFalse(os.path.exists(self.cacheFile))
+
+    def test_restart_reuses_cached_probes(self):
+        self.newSession(self.mockConnection())
+        with open(self.cacheFile, 'r', encoding='utf-8') as file:
+            probes = json.load(file)["probes"]
+        self.assertEqual(probes["version"], "release_4.2.1_05-01-2025")
+        # role membership grants the admin tools and is never cached on disk
+        self.assertNotIn("roles", probes)
+        connection = self.mockConnection()
+        session = self.newSession(connection)
+        connection.ping.assert_called_once()
+        for probe in (connection.check_exist_graphs, connection.getVersion):
+            probe.assert_not_called()
+        connection.gsql.assert_called_once_with("SHOW GRANTS OF ROLE superuser")
+        with patch("mcp_server.tigerGraph.session.tigerGraphTuning", return_value=60):
+            self.assertTrue(session.hasRole("superuser"))
+        self.assertEqual(connection.gsql.call_count, 1)
+        self.assertEqual(session.getVersionString(), "release_4.2.1_05-01-2025")
+        self.assertEqual(session.startupStatus()["steps"].keys(), {"ping", "roles"})
+
+    def test_revoked_role_is_rechecked(self):
+        connection = self.mockConnection()
+        session = self.newSession(connection, ttl=0)
+        connection.gsql.side_effect = None
+        connection.gsql.return_value = "Role superuser granted to: someone_else"
+        with patch("mcp_server.tigerGraph.session.tigerGraphTuning", return_value=60):
+            self.assertTrue(session.hasRole("superuser"))
+        with patch("mcp_server.tigerGraph.session.tigerGraphTuning", return_value=0):
+            self.assertFalse(session.hasRole("superuser"))
+
+    def test_stale_or_foreign_cache_is_ignored(self):
+        cache = StartupCache("host|graph|user", self.cacheFile, ttl=60)
+        cache.save({"version": "release_4.2.1"})
+        self.assertEqual(cache.load(), {"version": "release_4.2.1"})
+        self.assertEqual(StartupCache("host|other|user", self.cacheFile, ttl=60).load(), {})
+        with patch("mcp_server.tigerGraph.startup_cache.time.time", return_value=time.time() + 61):
+            self.assertEqual(cache.load(), {})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,107 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+# testTokenManager.py: This test case performs checks on the TokenManager class
+# (expiry tracking, background refresh, token swap into every connection)
+#******************************************************************************
+
+import time
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+from mcp_server.tigerGraph.token_manager import TokenManager, tokenExpiration, applyToken
+
+
+def tuning(key:str):
+    return {"tokenLifetime": 3600, "tokenRefreshBefore": 600}[key]
+
+
+class TestTokenManager(unittest.TestCase):
+
+    def setUp(self):
+        for target, value in (("tigerGraphTuning", tuning), ("set_Constents", None)):
+            patcher = patch(f"mcp_server.tigerGraph.token_manager.{target}", side_effect=value)
+            self.addCleanup(patcher.stop)
+            setattr(self, target, patcher.start())
+        self.session = MagicMock()
+        self.session._token = "old-token"
+        self.session.getSecret.return_value = "secret"
+        self.pooled = [MagicMock(), MagicMock()]
+        self.tokenConnection = MagicMock()
+        self.session.newConnection.return_value = self.tokenConnection
+
+    def newManager(self, expiration:float=None) -> TokenManager:
+        manager = TokenManager(self.session, connections=lambda: self.pooled)
+        manager.expiration = expiration
+        self.addCleanup(manager.stop)
+        return manager
+
+    def test_token_expiration(self):
+        self.assertEqual(tokenExpiration(("t", "1700000000", "2023-11-14 22:13:20"), 1699990000, 3600), 1699993600)
+        self.assertEqual(tokenExpiration(("t", "1700000000", "2023-11-14 22:13:20"), 1699999000, 3600), 1700000000)
+        self.assertEqual(tokenExpiration(("t", "2025-06-01 12:00:00"), 100, 3600), 3700)
+        self.assertEqual(tokenExpiration("t", 100, 3600), 3700)
+
+    def test_reconfigure_reschedules_refresh(self):
+        manager = self.newManager(expiration=10000.0)
+        self.assertEqual(manager.refreshAt(), 9400.0)
+        self.tigerGraphTuning.side_effect = {"tokenLifetime": 7200, "tokenRefreshBefore": 1800}.get
+        manager.reconfigure()
+        self.assertEqual((manager.lifetime, manager.refreshAt()), (7200, 8200.0))
+
+    def test_apply_token(self):
+        connection = MagicMock()
+        applyToken(connection, "new-token")
+        self.assertEqual(connection.apiToken, "new-token")
+        self.assertEqual(connection.authHeader, {"Authorization": "Bearer new-token"})
+        connection._refresh_auth_headers.assert_called_once()
+
+    def test_refresh_swaps_token_everywhere(self):
+        self.tokenConnection.getToken.return_value = ("new-token", str(time.time() + 3600), "")
+        manager = self.newManager(expiration=time.time() + 60)
+        self.assertTrue(manager.refresh())
+        self.tokenConnection.getToken.assert_called_once_with("secret", lifetime=3600)
+        for connection in self.pooled:
+            self.assertEqual(connection.apiToken, "new-token")
+        self.assertEqual(self.session._token, "new-token")
+        self.assertGreater(manager.expiration, time.time() + 3000)
+        self.assertEqual([call.args[0] for call in self.set_Constents.call_args_list], ["token", "tokenExpiration"])
+        self.assertEqual(manager.status()["refreshes"], 1)
+
+    def test_failed_refresh_keeps_token(self):
+        self.tokenConnection.getToken.side_effect = Exception("REST-10002 secret not found")
+        manager = self.newManager(expiration=time.time() + 60)
+        self.assertFalse(manager.refresh())
+        self.assertEqual(manager.token, "old-token")
+        self.assertEqual(manager.status()["failures"], 1)
+        self.assertIn("REST-10002", manager.status()["lastError"])
+
+    def test_background_refresh_before_expiry(self):
+        refreshed = threading.Event()
+
+        def getToken(secret, lifetime):
+            refreshed.set()
+            return ("new-token", str(time.time() + lifetime), "")
+        self.tokenConnection.getToken.side_effect = getToken
+        # expires in 10 minutes, inside the 600 seconds refresh window: refreshed at once
+        manager = self.newManager(expiration=time.time() + 599)
+        manager.start()
+        self.assertTrue(refreshed.wait(5))
+        for _ in range(50):
+            if manager.token == "new-token":
+                break
+            time.sleep(0.05)
+        self.assertEqual(self.pooled[0].apiToken, "new-token")
+        self.assertGreater(manager.status()["nextRefreshInSeconds"], 2900)
+
+    def test_no_secret_no_refresh(self):
+        self.session.getSecret.return_value = ""
+        manager = self.newManager(expiration=time.time() - 1)
+        manager.ensureValid()
+        manager.start()
+        self.tokenConnection.getToken.assert_not_called()
+        self.assertFalse(manager.status()["running"])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,79 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+# testTracing.py: This test case performs checks on the tracer (sampling,
+# parent / child span ids, errors, JSONL trace file)
+#******************************************************************************
+
+import os
+import json
+import asyncio
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from mcp_server.mcp_tracing import Tracer, tracer, traceTool, NOOP_SPAN
+from mcp_server.tigerGraph.instrumented_connection import InstrumentedConnection
+
+
+class TestTracing(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.traceFile = os.path.join(self.directory.name, "traces.jsonl")
+
+    def tearDown(self):
+        tracer.configure(sampleRate=0.0, traceFile=self.traceFile)
+        self.directory.cleanup()
+
+    def readSpans(self) -> list:
+        if not os.path.exists(self.traceFile):
+            return []
+        with open(self.traceFile, 'r', encoding='utf-8') as file:
+            return [json.loads(line) for line in file]
+
+    def test_sampling_off(self):
+        local = Tracer()
+        local.configure(sampleRate=0.0, traceFile=self.traceFile)
+        with local.span("tool.get_schema") as span:
+            self.assertIs(span, NOOP_SPAN)
+            with local.span("backend.getSchema") as child:
+                self.assertIs(child, NOOP_SPAN)
+        self.assertEqual(self.readSpans(), [])
+
+    def test_parent_child_spans(self):
+        local = Tracer()
+        local.configure(sampleRate=1.0, traceFile=self.traceFile)
+        with local.span("tool.run_query", arguments=["query_name"]):
+            with local.span("export.json", query="q") as child:
+                child.set("rows", 3)
+        child, root = self.readSpans()
+        self.assertEqual(child["traceId"], root["traceId"])
+        self.assertEqual(child["parentId"], root["spanId"])
+        self.assertIsNone(root["parentId"])
+        self.assertEqual(child["attributes"], {"query": "q", "rows": 3})
+        self.assertGreaterEqual(root["durationMs"], child["durationMs"])
+
+    def test_errors_and_tool_wrapper(self):
+        tracer.configure(sampleRate=1.0, traceFile=self.traceFile)
+        connection = MagicMock()
+        connection.runInstalledQuery.side_effect = Exception("REST-10016")
+        proxy = InstrumentedConnection(connection)
+
+        @traceTool
+        async def run_query(query_name:str):
+            return proxy.runInstalledQuery(query_name)
+
+        self.assertEqual(run_query.__name__, "run_query")
+        with self.assertRaises(Exception):
+            asyncio.run(run_query(query_name="q"))
+        backend, tool = self.readSpans()
+        self.assertEqual(tool["name"], "tool.run_query")
+        self.assertEqual(tool["attributes"], {"arguments": ["query_name"]})
+        self.assertEqual((backend["name"], backend["parentId"]), ("backend.runInstalledQuery", tool["spanId"]))
+        self.assertEqual(backend["attributes"]["api"], "RESTPP")
+        self.assertIn("REST-10016", backend["error"])
+        self.assertIn("REST-10016", tool["error"])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
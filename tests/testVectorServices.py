@@ -0,0 +1,94 @@
+#******************************************************************************
+# Copyright (c) 2025, Custom Discoveries LLC. (www.customdiscoveries.com)
+# All rights reserved.
+# testVectorServices.py: This test case performs mock checks against the
+# VectorServices class (bulk vector loading and vector search)
+#******************************************************************************
+
+import unittest
+import tempfile
+import shutil
+import json
+import numpy as np
+from pathlib import Path
+from unittest.mock import MagicMock
+from mcp_server.tigerGraph.vector_services import VectorServices
+
+SCHEMA = {"VertexTypes": [{"Name": "Doc", "EmbeddingAttributes": [
+    {"Name": "emb", "Dimension": 3, "Metric": "COSINE", "IndexType": "HNSW", "DataType": "FLOAT"}]}]}
+
+
+class TestVectorServices(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.mock_session = MagicMock()
+        self.mock_connection = MagicMock()
+        self.mock_session.getConnection.return_value = self.mock_connection
+        self.mock_connection.getSchema.return_value = SCHEMA
+        np.save(Path(self.test_dir) / "emb.npy", np.arange(15, dtype=np.float32).reshape(5, 3))
+        (Path(self.test_dir) / "ids.txt").write_text("\n".join(f"d{i}" for i in range(5)) + "\n")
+        self.vectors = VectorServices(self.mock_session, self.test_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_load_vectors_in_batches(self):
+        result = json.loads(self.vectors.loadVectors("Doc", "emb", "ids.txt", "emb.npy", batch_size=2, workers=1))
+        self.assertEqual(result["loaded"], 5)
+        self.assertEqual(result["batches"], 3)
+        calls = self.mock_connection.upsertVertices.call_args_list
+        self.assertEqual(calls[0].args, ("Doc", [("d0", {"emb": [0.0, 1.0, 2.0]}), ("d1", {"emb": [3.0, 4.0, 5.0]})]))
+        self.assertEqual(calls[2].args[1], [("d4", {"emb": [12.0, 13.0, 14.0]})])
+
+    def test_dimension_mismatch_is_rejected(self):
+        np.save(Path(self.test_dir) / "wide.npy", np.zeros((5, 4)))
+        result = self.vectors.loadVectors("Doc", "emb", "ids.txt", "wide.npy")
+        self.assertIn("DIMENSION=3", result)
+        self.mock_connection.upsertVertices.assert_not_called()
+
+    def test_id_count_mismatch_is_rejected(self):
+        (Path(self.test_dir) / "short.txt").write_text("d0\nd1\n")
+        result = self.vectors.loadVectors("Doc", "emb", "short.txt", "emb.npy")
+        self.assertIn("2 ids", result)
+
+    def test_vector_search_server_ranking(self):
+        self.mock_connection.graphname = "Docs"
+        self.mock_connection.runInterpretedQuery.return_value = [
+            {"results": [{"v_id": "d2", "attributes": {}}, {"v_id": "d1", "attributes": {}}]},
+            {"distances": {"d1": 0.1, "d2": 0.3}}]
+        result = json.loads(self.vectors.vectorSearch("Doc", "emb", [[1, 0, 0], [0, 1, 0]], top_k=2, workers=2))
+        self.assertEqual(result["queries"], 2)
+        self.assertEqual([hit["v_id"] for hit in result["results"][0]["results"]], ["d1", "d2"])
+        queryText, params = self.mock_connection.runInterpretedQuery.call_args.args
+        self.assertIn("vectorSearch({Doc.emb}, query_vector, k", queryText)
+        self.assertEqual(params["k"], 2)
+
+    def test_vector_search_local_filter_and_rerank(self):
+        self.mock_connection.graphname = "Docs"
+        self.mock_connection.runInterpretedQuery.return_value = [{"results": [
+            {"v_id": "far", "attributes": {"lang": "en", "emb": [0.0, 1.0, 0.0]}},
+            {"v_id": "near", "attributes": {"lang": "en", "emb": [1.0, 0.1, 0.0]}},
+            {"v_id": "other", "attributes": {"lang": "fr", "emb": [1.0, 0.0, 0.0]}}]}]
+        result = json.loads(self.vectors.vectorSearch("Doc", "emb", [[1, 0, 0]], top_k=2,
+                                                      rerank=True, filters={"lang": "en"}))
+        hits = result["results"][0]["results"]
+        self.assertEqual([hit["v_id"] for hit in hits], ["near", "far"])
+        self.assertAlmostEqual(hits[1]["distance"], 1.0)
+        self.assertEqual(self.mock_connection.runInterpretedQuery.call_args.args[1]["k"], 8)
+        self.assertIn("roundTripMs", result["results"][0])
+
+    def test_vector_search_candidate_k(self):
+        self.mock_connection.graphname = "Docs"
+        self.mock_connection.runInterpretedQuery.return_value = [{"results": []}]
+        self.vectors.vectorSearch("Doc", "emb", [[1, 0, 0]], top_k=5, rerank=True, candidate_k=6)
+        self.assertEqual(self.mock_connection.runInterpretedQuery.call_args.args[1]["k"], 6)
+        self.vectors.vectorSearch("Doc", "emb", [[1, 0, 0]], top_k=5, rerank=True, candidate_k=3)
+        self.assertEqual(self.mock_connection.runInterpretedQuery.call_args.args[1]["k"], 5)
+
+    def test_vector_search_rejects_wrong_dimension(self):
+        result = self.vectors.vectorSearch("Doc", "emb", [[1, 0]])
+        self.assertIn("3 values", result)
+
+if __name__ == '__main__':
+    unittest.main()